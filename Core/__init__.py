@@ -0,0 +1,28 @@
+"""
+Core modules for QuakeAceh application
+
+This package contains the computation modules shared by the pages:
+- model_registry.py: Process-wide MLP model and scaler registry
+- geodesy.py: Vectorized epicentral distance kernel (ECEF unit vectors)
+- spatial_index.py: Lat/lon grid index with bounding-box radius queries
+- gmpe.py: Boore-Atkinson 2008 ground-motion model (PGA and SA spectrum)
+- gmpe_models.py: GMPE registry (BA08, Zhao 2006, Youngs 1997) and logic-tree mean
+- seismicity.py: Gutenberg-Richter b-value (least squares, MLE, bootstrap CI)
+- psha.py: Probabilistic seismic hazard curves and design PGA
+- uncertainty.py: Monte Carlo epsilon sampling (PGA percentiles, exceedance)
+- features.py: Vectorized MLP feature transformer (soil one-hot, IQR flags)
+- mlp_engine.py: Pure-NumPy MLP inference with fused StandardScalers
+- sites.py: Multi-site batch estimation (event x site x soil class)
+- scenarios.py: Compact event x soil-scenario result (float32 arrays, long form on demand)
+- hazard_grid.py: Tiled PGA raster (max/percentile per grid cell) and PNG overlay
+- columns.py: Catalog column aliases and mapping
+- validation.py: Single-pass column conversion, validation report and column stats
+- dtypes.py: Bounds-checked compact dtypes for catalog columns (int16/float32)
+- ingest.py: Chunked upload ingest with incremental validation report
+- catalog_cache.py: Content-addressed, memory-mapped catalog cache
+- result_cache.py: In-process LRU cache of estimation results
+- session_memory.py: Per-session memory budget with LRU spill to disk
+- aggregation.py: Stratified downsampling and 2D density binning for plots
+- export.py: On-demand chunked CSV, write-only Excel and Parquet export
+- batch.py: Headless batch CLI (python -m Core.batch)
+"""
@@ -0,0 +1,62 @@
+import numpy as np
+
+
+# Ambang jumlah titik: di atas WEBGL_THRESHOLD pakai Scattergl, di atas
+# DENSITY_THRESHOLD data diagregasi di server (grid 2D) atau di-sampel
+WEBGL_THRESHOLD = 5000
+DENSITY_THRESHOLD = 50000
+
+# Batas payload ke browser
+MAX_SAMPLE_POINTS = 20000
+DENSITY_BINS = 200
+
+
+def stratified_sample(groups, max_points=MAX_SAMPLE_POINTS, seed=0):
+    """
+    Indeks sampel acak terstratifikasi (proporsional per grup, minimal satu
+    titik per grup). Jika data <= max_points seluruh indeks dikembalikan.
+    """
+    groups = np.asarray(groups)
+    n = groups.shape[0]
+    if n <= max_points:
+        return np.arange(n)
+
+    rng = np.random.default_rng(seed)
+    labels, inverse, counts = np.unique(groups, return_inverse=True, return_counts=True)
+    quota = np.maximum(np.floor(counts * max_points / n).astype(np.int64), 1)
+
+    # Urutan acak lalu ambil `quota` pertama tiap grup (satu kali argsort stabil)
+    order = rng.permutation(n)
+    order = order[np.argsort(inverse[order], kind='stable')]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    rank = np.arange(n) - np.repeat(starts, counts)
+    keep = rank < np.repeat(quota, counts)
+    return np.sort(order[keep])
+
+
+def density_grid(x, y, bins=DENSITY_BINS, log_x=False, log_y=False):
+    """
+    Histogram 2D (jumlah titik per sel) untuk plot densitas.
+    Mengembalikan (pusat bin x, pusat bin y, counts berbentuk (n_y, n_x)).
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    valid = np.isfinite(x) & np.isfinite(y)
+    if log_x:
+        valid &= x > 0
+    if log_y:
+        valid &= y > 0
+    x, y = x[valid], y[valid]
+    if log_x:
+        x = np.log10(x)
+    if log_y:
+        y = np.log10(y)
+
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins)
+    x_centers = (x_edges[:-1] + x_edges[1:]) / 2
+    y_centers = (y_edges[:-1] + y_edges[1:]) / 2
+    if log_x:
+        x_centers = 10.0 ** x_centers
+    if log_y:
+        y_centers = 10.0 ** y_centers
+    return x_centers, y_centers, counts.T
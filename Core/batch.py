@@ -0,0 +1,248 @@
+"""
+Estimasi PGA headless (tanpa Streamlit) untuk job terjadwal.
+
+Contoh:
+    python -m Core.batch katalog.csv --sites lokasi.csv --output hasil.parquet
+    python -m Core.batch katalog.csv --lat 5.5483 --lon 95.3238 --vs30 sni --output hasil.csv
+
+Katalog CSV, Parquet dan Excel .xlsx/.xlsm dibaca per chunk (out-of-core). Excel
+.xls lama dimuat penuh ke memori, sehingga ukurannya dibatasi RAM.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from Core.columns import ESSENTIAL_KEYS, map_columns
+from Core.features import FEATURE_SOURCES, OUTLIER_FEATURES, FeatureTransformer
+from Core.ingest import STREAMING_EXCEL, ExcelStream
+from Core.sites import HYBRID_KEYS, SiteSummary, estimate_pairs, find_pairs, prepare_sites
+
+
+# Jumlah baris katalog per chunk
+DEFAULT_CHUNK_ROWS = 200000
+
+
+def _extension(path):
+    return os.path.splitext(path)[1].lower()
+
+
+def read_header(path):
+    """Membaca nama kolom katalog tanpa memuat isinya"""
+    ext = _extension(path)
+    if ext == '.parquet':
+        import pyarrow.parquet as pq
+        return list(pq.read_schema(path).names)
+    if ext in STREAMING_EXCEL:
+        stream = ExcelStream(path, preview_rows=0)
+        stream.close()
+        return stream.columns
+    if ext == '.xls':
+        return list(pd.read_excel(path, nrows=0).columns)
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def iter_catalog(path, usecols, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Membaca katalog per chunk, hanya kolom yang dibutuhkan"""
+    ext = _extension(path)
+    if ext == '.parquet':
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=usecols):
+            yield batch.to_pandas()
+    elif ext in STREAMING_EXCEL:
+        # Streaming openpyxl read-only; chunk disalin oleh clean_chunk sebelum chunk berikutnya
+        yield from ExcelStream(path, chunk_rows=chunk_rows, preview_rows=0, usecols=usecols)
+    elif ext == '.xls':
+        # .xls tidak didukung openpyxl: dimuat penuh (tidak out-of-core)
+        df = pd.read_excel(path, usecols=usecols)
+        for start in range(0, len(df), chunk_rows):
+            yield df.iloc[start:start + chunk_rows]
+    else:
+        yield from pd.read_csv(path, usecols=usecols, chunksize=chunk_rows)
+
+
+def clean_chunk(chunk, mapped_columns):
+    """Konversi kolom ke numerik; baris dengan nilai kosong/bukan angka dibuang"""
+    chunk = chunk.copy()
+    for col in mapped_columns.values():
+        chunk[col] = pd.to_numeric(chunk[col], errors='coerce')
+    valid = chunk[list(mapped_columns.values())].notna().all(axis=1)
+    return chunk[valid].reset_index(drop=True), int((~valid).sum())
+
+
+class ResultWriter:
+    """Menulis detail hasil estimasi ke CSV/Parquet secara bertahap per chunk"""
+
+    def __init__(self, path, fmt=None):
+        self.path = path
+        self.format = fmt or ('parquet' if _extension(path) == '.parquet' else 'csv')
+        self.rows = 0
+        self._writer = None
+        self._schema = None
+        self._header_written = False
+
+    def write(self, detail):
+        if detail.empty:
+            return
+        if self.format == 'parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            if self._writer is None:
+                table = pa.Table.from_pandas(detail, preserve_index=False)
+                self._schema = table.schema
+                self._writer = pq.ParquetWriter(self.path, self._schema)
+            else:
+                table = pa.Table.from_pandas(detail, schema=self._schema, preserve_index=False)
+            self._writer.write_table(table)
+        else:
+            detail.to_csv(self.path, mode='a' if self._header_written else 'w',
+                          header=not self._header_written, index=False)
+            self._header_written = True
+        self.rows += len(detail)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def collect_site_bounds(path, usecols, mapped_columns, sites, chunk_rows, max_distance_km):
+    """
+    Pass pertama: mengumpulkan nilai fitur outlier untuk event kandidat tiap
+    lokasi, lalu menghitung batas IQR per lokasi (sama dengan mode non-chunk).
+    """
+    values = [{name: [] for name in OUTLIER_FEATURES} for _ in range(len(sites))]
+    for chunk in iter_catalog(path, usecols, chunk_rows):
+        chunk, _ = clean_chunk(chunk, mapped_columns)
+        ev_idx, site_idx, _ = find_pairs(chunk, mapped_columns, sites, max_distance_km=max_distance_km)
+        bounds = np.searchsorted(site_idx, np.arange(len(sites) + 1))
+        for name in OUTLIER_FEATURES:
+            col = chunk[mapped_columns[FEATURE_SOURCES[name]]].to_numpy(dtype=np.float64)[ev_idx]
+            for site in range(len(sites)):
+                lo, hi = bounds[site], bounds[site + 1]
+                if lo < hi:
+                    values[site][name].append(col[lo:hi])
+
+    transformer = FeatureTransformer(mapped_columns)
+    site_bounds = []
+    for site_values in values:
+        if not site_values[OUTLIER_FEATURES[0]]:
+            site_bounds.append(None)
+            continue
+        merged = {name: np.concatenate(parts) for name, parts in site_values.items()}
+        site_bounds.append(transformer.fit_values(merged).bounds_)
+    return site_bounds
+
+
+def run(catalog, sites, output, vs30_mode='auto', summary_path=None, use_mlp=True,
+        chunk_rows=DEFAULT_CHUNK_ROWS, max_distance_km=200.0, fmt=None, log=print):
+    """Menjalankan pipeline BA08 + MLP per chunk dan menulis hasil ke file"""
+    mapped_columns = map_columns(read_header(catalog))
+    missing = [k for k in ESSENTIAL_KEYS + ['depth'] if k not in mapped_columns]
+    if missing:
+        raise ValueError(f"Kolom katalog tidak lengkap: {', '.join(missing)}")
+
+    if vs30_mode == 'sni':
+        mapped_columns.pop('vs30', None)
+    elif vs30_mode == 'data' and 'vs30' not in mapped_columns:
+        raise ValueError("Mode VS30 'data' membutuhkan kolom VS30 pada katalog.")
+
+    models = None
+    if use_mlp and all(k in mapped_columns for k in HYBRID_KEYS):
+        from Core.model_registry import get_models
+        models = get_models()
+    elif use_mlp:
+        log("Kolom hybrid tidak lengkap, hanya GMPE yang dijalankan.")
+
+    usecols = list(dict.fromkeys(mapped_columns.values()))
+    start_time = time.perf_counter()
+
+    site_bounds = None
+    if models is not None:
+        site_bounds = collect_site_bounds(catalog, usecols, mapped_columns, sites, chunk_rows, max_distance_km)
+
+    writer = ResultWriter(output, fmt)
+    summary = SiteSummary(sites)
+    n_rows, n_dropped = 0, 0
+    try:
+        for chunk in iter_catalog(catalog, usecols, chunk_rows):
+            chunk, dropped = clean_chunk(chunk, mapped_columns)
+            n_rows += len(chunk)
+            n_dropped += dropped
+            detail = estimate_pairs(chunk, mapped_columns, sites, models,
+                                    max_distance_km=max_distance_km, site_bounds=site_bounds)
+            writer.write(detail)
+            summary.update(detail)
+    finally:
+        writer.close()
+
+    if summary_path:
+        summary.result().to_csv(summary_path, index=False)
+
+    elapsed = time.perf_counter() - start_time
+    stats = {
+        'rows': n_rows,
+        'dropped': n_dropped,
+        'output_rows': writer.rows,
+        'seconds': elapsed,
+        'rows_per_sec': n_rows / elapsed if elapsed > 0 else float('inf')
+    }
+    log(f"{n_rows} baris katalog ({n_dropped} dibuang), {writer.rows} baris hasil, "
+        f"{elapsed:.2f} s ({stats['rows_per_sec']:.0f} baris/detik)")
+    return stats
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Estimasi PGA (BA08 + MLP) tanpa Streamlit.")
+    parser.add_argument('catalog', help="File katalog gempa (CSV, Parquet atau Excel .xlsx; "
+                                        ".xls dimuat penuh ke memori)")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--sites', help="Tabel lokasi target (kolom nama, latitude, longitude)")
+    target.add_argument('--lat', type=float, help="Latitude satu lokasi target")
+    parser.add_argument('--lon', type=float, help="Longitude satu lokasi target (dipakai bersama --lat)")
+    parser.add_argument('--name', default="Lokasi 1", help="Nama satu lokasi target")
+    parser.add_argument('--vs30', choices=['auto', 'data', 'sni'], default='auto',
+                        help="auto: kolom VS30 jika ada; data: wajib kolom VS30; sni: seluruh kelas SNI 1726:2019")
+    parser.add_argument('--output', required=True, help="File hasil detail (.csv atau .parquet)")
+    parser.add_argument('--format', choices=['csv', 'parquet'], help="Paksa format output")
+    parser.add_argument('--summary', help="File CSV ringkasan per lokasi x tanah")
+    parser.add_argument('--chunksize', type=int, default=DEFAULT_CHUNK_ROWS, help="Baris katalog per chunk")
+    parser.add_argument('--radius', type=float, default=200.0, help="Jarak maksimum event-lokasi (km)")
+    parser.add_argument('--no-mlp', action='store_true', help="Hanya hitung GMPE")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.sites:
+        ext = _extension(args.sites)
+        try:
+            df_sites = pd.read_excel(args.sites) if ext in ('.xlsx', '.xls') else pd.read_csv(args.sites)
+        except OSError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        sites = prepare_sites(df_sites)
+    else:
+        if args.lon is None:
+            parser.error("--lon wajib diisi bersama --lat")
+        sites = prepare_sites(pd.DataFrame({'name': [args.name], 'latitude': [args.lat], 'longitude': [args.lon]}))
+
+    if sites.empty:
+        parser.error("Tidak ada lokasi target dengan koordinat valid.")
+
+    try:
+        run(args.catalog, sites, args.output, vs30_mode=args.vs30, summary_path=args.summary,
+            use_mlp=not args.no_mlp, chunk_rows=args.chunksize, max_distance_km=args.radius,
+            fmt=args.format)
+    except (ValueError, OSError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
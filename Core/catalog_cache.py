@@ -0,0 +1,208 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+# Direktori cache katalog (bisa diganti lewat environment variable)
+CACHE_DIR = os.environ.get(
+    'QUAKEACEH_CACHE_DIR',
+    os.path.join(tempfile.gettempdir(), 'quakeaceh_catalogs')
+)
+
+# Batas total ukuran cache katalog di disk (MB, bisa diganti lewat environment variable);
+# entri yang paling lama tidak dipakai (mtime direktori) dihapus lebih dulu
+CACHE_MAX_BYTES = int(float(os.environ.get('QUAKEACEH_CATALOG_MB', 2048)) * 1024 * 1024)
+
+META_FILE = 'meta.json'
+PREVIEW_FILE = 'preview.csv'
+PREVIEW_ROWS = 10
+
+
+def content_key(data):
+    """Hash isi file upload (content-addressed key)"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class CatalogHandle:
+    """
+    Handle ringan ke katalog di cache: kolom numerik hasil mapping disimpan
+    sebagai file .npy dan dibuka dengan memory-map (read-only), sehingga
+    semua sesi yang memakai file yang sama berbagi satu salinan fisik di RAM.
+    """
+
+    def __init__(self, key, path, meta):
+        self.key = key
+        self.path = path
+        self.mapped_columns = meta['mapped_columns']
+        self.columns = meta['columns']
+        self.n_rows = meta['n_rows']
+        self.file_name = meta.get('file_name')
+        self.column_stats = meta.get('column_stats')
+        self._frame = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self.n_rows
+
+    def touch(self):
+        """Memperbarui mtime direktori entri (penanda pemakaian untuk eviction LRU)"""
+        try:
+            os.utime(self.path)
+        except OSError:
+            pass
+
+    def _column_path(self, index):
+        return os.path.join(self.path, f'col_{index}.npy')
+
+    def array(self, col):
+        """Array memory-mapped (read-only) untuk satu kolom"""
+        return np.load(self._column_path(self.columns.index(col)), mmap_mode='r')
+
+    def frame(self):
+        """
+        DataFrame tanpa salinan di atas array memory-mapped (dipakai bersama
+        antar sesi). Bersifat read-only: lakukan .copy() sebelum mengubah data.
+        """
+        self.touch()
+        if self._frame is None:
+            with self._lock:
+                if self._frame is None:
+                    self._frame = pd.DataFrame({col: self.array(col) for col in self.columns}, copy=False)
+        return self._frame
+
+    def preview(self):
+        """Beberapa baris pertama file asli (seluruh kolom) untuk ditampilkan"""
+        return pd.read_csv(os.path.join(self.path, PREVIEW_FILE))
+
+
+class CatalogCache:
+    """
+    Cache katalog content-addressed yang dipakai bersama semua sesi dalam proses.
+    Total ukuran di disk dibatasi max_bytes dengan eviction LRU berdasarkan mtime
+    direktori entri. Handle yang sudah dibuka tetap valid setelah entrinya dihapus
+    (kolom sudah di-memory-map), hanya sesi baru yang perlu mengunggah ulang.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._handles = {}
+        self._lock = threading.Lock()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def get(self, key):
+        """Handle katalog jika sudah ada di cache, None jika belum"""
+        with self._lock:
+            handle = self._handles.get(key)
+            if handle is None:
+                path = self._entry_path(key)
+                meta_path = os.path.join(path, META_FILE)
+                if not os.path.exists(meta_path):
+                    return None
+                with open(meta_path) as f:
+                    handle = CatalogHandle(key, path, json.load(f))
+                # Kolom langsung di-memory-map agar handle tidak bergantung pada file setelah eviction
+                handle.frame()
+                self._handles[key] = handle
+        handle.touch()
+        return handle
+
+    def _entries(self):
+        """(mtime, ukuran byte, key) setiap entri lengkap di direktori cache"""
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return []
+        entries = []
+        for name in names:
+            # Direktori sementara (key.xxx) adalah penulisan yang belum selesai
+            path = self._entry_path(name)
+            if '.' in name or not os.path.exists(os.path.join(path, META_FILE)):
+                continue
+            try:
+                size = sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+                entries.append((os.stat(path).st_mtime, size, name))
+            except OSError:
+                # Sudah dihapus oleh proses lain
+                continue
+        return entries
+
+    def stats(self):
+        """Jumlah entri dan total ukuran cache di disk"""
+        entries = self._entries()
+        return {'entries': len(entries), 'bytes': sum(size for _, size, _ in entries)}
+
+    def evict(self, keep=None):
+        """
+        Menghapus entri yang paling lama tidak dipakai hingga total ukuran
+        <= max_bytes. Entri `keep` (baru ditulis) tidak pernah dihapus.
+        """
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in entries:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            with self._lock:
+                self._handles.pop(key, None)
+            shutil.rmtree(self._entry_path(key), ignore_errors=True)
+            total -= size
+        return total
+
+    def put(self, key, df, mapped_columns, file_name=None, preview=None, column_stats=None):
+        """
+        Menyimpan kolom numerik hasil mapping ke cache (.npy per kolom).
+        `preview` (N baris pertama file, seluruh kolom) dan statistik kolom dari
+        laporan validasi disimpan bersama metadata.
+        Penulisan dilakukan ke direktori sementara lalu di-rename (atomik),
+        setelah itu entri lama di-evict bila cache melebihi max_bytes.
+        """
+        existing = self.get(key)
+        if existing is not None:
+            return existing
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        columns = list(dict.fromkeys(mapped_columns.values()))
+        tmp_path = tempfile.mkdtemp(prefix=f'{key}.', dir=self.cache_dir)
+        try:
+            for i, col in enumerate(columns):
+                np.save(os.path.join(tmp_path, f'col_{i}.npy'), np.ascontiguousarray(df[col].to_numpy()))
+            preview = df.head(PREVIEW_ROWS) if preview is None else preview
+            preview.to_csv(os.path.join(tmp_path, PREVIEW_FILE), index=False)
+            meta = {
+                'mapped_columns': mapped_columns,
+                'columns': columns,
+                'n_rows': int(len(df)),
+                'file_name': file_name,
+                'column_stats': column_stats
+            }
+            with open(os.path.join(tmp_path, META_FILE), 'w') as f:
+                json.dump(meta, f)
+            try:
+                os.replace(tmp_path, self._entry_path(key))
+            except OSError:
+                # Proses/sesi lain sudah menulis entri yang sama
+                shutil.rmtree(tmp_path, ignore_errors=True)
+        except Exception:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            raise
+        handle = self.get(key)
+        self.evict(keep=key)
+        return handle
+
+
+_cache = CatalogCache()
+
+
+def get_cache():
+    """Cache katalog global (satu per proses)"""
+    return _cache
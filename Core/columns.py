@@ -0,0 +1,28 @@
+# Mendefinisikan variasi nama yang mungkin diinput user
+COLUMN_ALIASES = {
+    'magnitude': ['magnitude', 'mag', 'm', 'mw', 'mag_mw'],
+    'vs30': ['vs30', 'v_s30', 's-wave_velocity'],
+    'depth': ['depth', 'kedalaman', 'd', 'dep'],
+    'latitude': ['latitude', 'lat', 'lintang', 'y'],
+    'longitude': ['longitude', 'lon', 'long', 'bujur', 'x'],
+    'nst': ['nst', 'number_of_stations', 'stn_count'],
+    'magnst': ['magnst', 'mag_nst'],
+    'gap': ['gap', 'azimuthal_gap'],
+    'rms': ['rms', 'root_mean_square'],
+    'deptherror': ['deptherror', 'depth_error', 'err_depth']
+}
+
+ESSENTIAL_KEYS = ['magnitude', 'latitude', 'longitude']
+
+
+def map_columns(columns, aliases=None):
+    """Mencocokkan nama kolom dataset dengan key standar (case-insensitive)"""
+    aliases = aliases or COLUMN_ALIASES
+    actual_columns = {str(col).lower(): col for col in columns}
+    mapped_columns = {}
+    for key, names in aliases.items():
+        for alias in names:
+            if alias in actual_columns:
+                mapped_columns[key] = actual_columns[alias]
+                break
+    return mapped_columns
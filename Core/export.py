@@ -0,0 +1,96 @@
+from io import BytesIO
+
+from Core.result_cache import ResultCache
+
+
+# Jumlah baris per chunk saat menulis file export
+EXPORT_CHUNK_ROWS = 50000
+
+# Batas baris satu sheet Excel (termasuk header)
+EXCEL_MAX_ROWS = 1048575
+
+# Batas memori cache hasil export (byte)
+EXPORT_CACHE_BYTES = 256 * 1024 * 1024
+
+EXPORT_FORMATS = {
+    'csv': ('csv', "text/csv"),
+    'xlsx': ('xlsx', "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    'parquet': ('parquet', "application/vnd.apache.parquet")
+}
+
+
+def _chunks(df, chunk_rows):
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def write_csv(df, out, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Menulis CSV (UTF-8) per chunk ke file biner"""
+    out.write(','.join(map(str, df.columns)).encode('utf-8') + b'\n')
+    for chunk in _chunks(df, chunk_rows):
+        out.write(chunk.to_csv(index=False, header=False).encode('utf-8'))
+    return out
+
+
+def write_excel(df, out, sheet_name='Hasil Estimasi PGA', chunk_rows=EXPORT_CHUNK_ROWS):
+    """Menulis Excel dengan workbook write-only openpyxl (memori konstan per baris)"""
+    from openpyxl import Workbook
+
+    if len(df) > EXCEL_MAX_ROWS:
+        raise ValueError(f"Excel maksimum {EXCEL_MAX_ROWS:,} baris; gunakan CSV atau Parquet.")
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_name)
+    ws.append([str(col) for col in df.columns])
+    for chunk in _chunks(df, chunk_rows):
+        values = chunk.astype(object).where(chunk.notna(), None).to_numpy()
+        for row in values.tolist():
+            ws.append(row)
+    wb.save(out)
+    return out
+
+
+def write_parquet(df, out, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Menulis Parquet per row group"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in _chunks(df, chunk_rows):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(out, table.schema)
+            writer.write_table(table)
+        if writer is None:
+            pq.write_table(pa.Table.from_pandas(df, preserve_index=False), out)
+    finally:
+        if writer is not None:
+            writer.close()
+    return out
+
+
+WRITERS = {'csv': write_csv, 'xlsx': write_excel, 'parquet': write_parquet}
+
+
+def export_bytes(df, fmt):
+    """Isi file export (bytes) untuk format csv/xlsx/parquet"""
+    out = BytesIO()
+    WRITERS[fmt](df, out)
+    return out.getvalue()
+
+
+_export_cache = ResultCache(max_bytes=EXPORT_CACHE_BYTES)
+
+
+def cached_export(key, df, fmt):
+    """
+    Export dengan cache per (key, format): klik berulang tidak membuat ulang file.
+    `df` boleh berupa fungsi yang menghasilkan DataFrame (dipanggil hanya jika belum di-cache).
+    """
+    cache_key = (key, fmt)
+    data = _export_cache.get(cache_key)
+    if data is None:
+        data = export_bytes(df() if callable(df) else df, fmt)
+        _export_cache.put(cache_key, data)
+    return data
@@ -0,0 +1,131 @@
+import numpy as np
+
+from Core.dtypes import float64_values
+from Core.model_registry import MLP_FEATURES_ORDER
+
+
+# Label kelas situs sesuai urutan one-hot Soil_SA s/d Soil_SE
+SOIL_LABELS = ['SA', 'SB', 'SC', 'SD', 'SE']
+
+
+def classify_vs30_codes(vs30):
+    """
+    Versi vektor classify_vs30: mengembalikan indeks kelas (0=SA ... 4=SE)
+    untuk setiap nilai VS30 (SNI 1726:2019).
+    """
+    vs30 = np.asarray(vs30, dtype=np.float64)
+    codes = np.full(vs30.shape, 4, dtype=np.int8)
+    codes[(vs30 >= 180) & (vs30 < 360)] = 3
+    codes[(vs30 >= 360) & (vs30 < 760)] = 2
+    codes[vs30 >= 760] = 1
+    codes[vs30 >= 1300] = 0
+    return codes
+
+
+# Sumber kolom fitur MLP: nama fitur -> key mapped_columns
+FEATURE_SOURCES = {
+    'latitude': 'latitude',
+    'longitude': 'longitude',
+    'depth': 'depth',
+    'nst': 'nst',
+    'gap': 'gap',
+    'rms': 'rms',
+    'magNst': 'magnst',
+    'depthError': 'deptherror'
+}
+
+NUMERIC_FEATURES = ['latitude', 'longitude', 'depth', 'nst', 'gap', 'rms', 'magNst']
+MISSING_FLAG_FEATURES = ['gap', 'rms', 'magNst', 'depthError', 'nst']
+OUTLIER_FEATURES = ['gap', 'rms', 'magNst', 'depth', 'depthError']
+
+
+def iqr_bounds(values):
+    """Batas outlier IQR (Q1 - 1.5*IQR, Q3 + 1.5*IQR)"""
+    q1, q3 = np.quantile(values, [0.25, 0.75])
+    iqr = q3 - q1
+    return q1 - 1.5 * iqr, q3 + 1.5 * iqr
+
+
+class FeatureTransformer:
+    """
+    Menyusun matriks fitur MLP (urutan MLP_FEATURES_ORDER) langsung dari
+    kolom hasil mapping, tanpa rename kolom dan tanpa loop per baris.
+    """
+
+    def __init__(self, mapped_columns, features_order=None):
+        self.features_order = list(features_order or MLP_FEATURES_ORDER)
+        self.columns = {name: mapped_columns[key] for name, key in FEATURE_SOURCES.items()}
+        self.index = {name: i for i, name in enumerate(self.features_order)}
+        self.soil_start = self.index['Soil_SA']
+        self.bounds_ = None
+
+    def _values(self, df, rows=None):
+        values = {}
+        for name, col in self.columns.items():
+            values[name] = float64_values(df, col, rows)
+        return values
+
+    def fit(self, df, rows=None):
+        """Menghitung batas outlier IQR dari data yang akan diprediksi"""
+        return self.fit_values(self._values(df, rows))
+
+    def fit_values(self, values):
+        """Menghitung batas outlier IQR dari dict array {nama fitur: nilai}"""
+        self.bounds_ = {name: iqr_bounds(values[name]) for name in OUTLIER_FEATURES}
+        return self
+
+    def set_soil(self, X, soil_codes):
+        """Mengisi one-hot Soil_SA..Soil_SE (in-place) dari kode kelas tanah"""
+        soil = X[:, self.soil_start:self.soil_start + len(SOIL_LABELS)]
+        soil[:] = 0.0
+        soil[np.arange(X.shape[0]), soil_codes] = 1.0
+        return X
+
+    def transform(self, df, vs30=None, rows=None, out=None):
+        """
+        Mengisi matriks fitur (n, 22) ke array `out` (dialokasikan jika None).
+        Kolom tanah diisi dari `vs30` (skalar atau array) jika diberikan.
+        """
+        if self.bounds_ is None:
+            raise ValueError("FeatureTransformer belum di-fit.")
+
+        values = self._values(df, rows)
+        n_rows = len(next(iter(values.values())))
+        if out is None:
+            out = np.empty((n_rows, len(self.features_order)), dtype=np.float64)
+
+        for name in NUMERIC_FEATURES:
+            out[:, self.index[name]] = values[name]
+
+        # Data sudah lolos validasi (tanpa nilai kosong) sehingga flag missing selalu 0
+        for name in MISSING_FLAG_FEATURES:
+            out[:, self.index[f'flag_missing_{name}']] = 0.0
+
+        for name in OUTLIER_FEATURES:
+            lower, upper = self.bounds_[name]
+            col = values[name]
+            out[:, self.index[f'flag_outlier_{name}']] = (col < lower) | (col > upper)
+
+        if vs30 is None:
+            out[:, self.soil_start:self.soil_start + len(SOIL_LABELS)] = 0.0
+        else:
+            codes = classify_vs30_codes(np.broadcast_to(np.asarray(vs30, dtype=np.float64), (n_rows,)))
+            self.set_soil(out, codes)
+        return out
+
+    def fit_transform(self, df, vs30=None, rows=None, out=None):
+        return self.fit(df, rows).transform(df, vs30, rows, out)
+
+
+def predict_soil_scenarios(engine, transformer, base, soil_codes):
+    """
+    Prediksi PGA MLP (n, n_skenario) dalam satu panggilan engine: baris fitur
+    dasar (n, 22) diulang per skenario lalu one-hot tanah diisi sekaligus dari
+    kode kelas tanah (n, n_skenario).
+    """
+    n_rows, n_soil = soil_codes.shape
+    X = np.repeat(base[:, None, :], n_soil, axis=1).reshape(-1, base.shape[1])
+    transformer.set_soil(X, soil_codes.reshape(-1))
+
+    pga = engine.predict(X)
+    return np.maximum(pga, 0.0001).reshape(n_rows, n_soil)
@@ -0,0 +1,92 @@
+import numpy as np
+
+
+# Radius bumi (km), sama dengan rumus haversine sebelumnya
+EARTH_RADIUS_KM = 6371.0
+
+# Batas memori sementara per blok (byte) saat menghitung matriks jarak
+DEFAULT_BLOCK_BYTES = 64 * 1024 * 1024
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """Menghitung jarak episentral (km) antara dua koordinat"""
+    R = EARTH_RADIUS_KM
+    lat1, lon1, lat2, lon2 = map(np.radians, [lat1, lon1, lat2, lon2])
+    dlat, dlon = lat2 - lat1, lon2 - lon1
+    a = np.sin(dlat / 2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2)**2
+    return 2 * R * np.arcsin(np.sqrt(a))
+
+
+def unit_vectors(lat, lon):
+    """Konversi lat/lon (derajat) ke vektor satuan ECEF (n, 3) pada bola"""
+    lat = np.radians(np.asarray(lat, dtype=np.float64))
+    lon = np.radians(np.asarray(lon, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+
+def chord_to_km(dot, out):
+    """
+    Mengubah hasil dot-product vektor satuan menjadi jarak busur (km) secara in-place.
+    d = 2R * arcsin(sqrt((1 - dot) / 2)), identik dengan haversine.
+    """
+    np.subtract(1.0, dot, out=out)
+    np.multiply(out, 0.5, out=out)
+    np.clip(out, 0.0, 1.0, out=out)
+    np.sqrt(out, out=out)
+    np.arcsin(out, out=out)
+    np.multiply(out, 2.0 * EARTH_RADIUS_KM, out=out)
+    return out
+
+
+class EventVectors:
+    """
+    Vektor satuan episenter yang dihitung sekali per dataset.
+    Jarak ke satu atau banyak target dihitung dengan satu operasi dot-product batch.
+    """
+
+    def __init__(self, lat, lon):
+        self.vectors = unit_vectors(lat, lon)
+
+    def __len__(self):
+        return self.vectors.shape[0]
+
+    def take(self, positions):
+        """Subset vektor berdasarkan posisi baris (tanpa menghitung ulang trigonometri)"""
+        subset = EventVectors.__new__(EventVectors)
+        subset.vectors = self.vectors[positions]
+        return subset
+
+    def distance_to(self, target_lat, target_lon, rows=None):
+        """Jarak (km) event (seluruhnya atau `rows` saja) ke satu titik target, array 1D"""
+        target = unit_vectors([target_lat], [target_lon])[0]
+        vectors = self.vectors if rows is None else self.vectors[rows]
+        dot = vectors @ target
+        return chord_to_km(dot, dot)
+
+    def iter_distance_blocks(self, target_lat, target_lon, block_bytes=DEFAULT_BLOCK_BYTES, dtype=np.float64):
+        """
+        Menghasilkan blok (start, stop, jarak) berukuran events x targets
+        sehingga memori sementara tidak melebihi block_bytes.
+        """
+        targets = unit_vectors(np.atleast_1d(target_lat), np.atleast_1d(target_lon))
+        n_events, n_targets = len(self), targets.shape[0]
+        rows = max(1, int(block_bytes // (8 * max(n_targets, 1))))
+        targets_t = targets.T.copy()
+        for start in range(0, n_events, rows):
+            stop = min(start + rows, n_events)
+            block = self.vectors[start:stop] @ targets_t
+            chord_to_km(block, block)
+            yield start, stop, block.astype(dtype, copy=False)
+
+    def distance_matrix(self, target_lat, target_lon, out=None, dtype=np.float64, block_bytes=DEFAULT_BLOCK_BYTES):
+        """
+        Matriks jarak events x targets (km). `out` boleh berupa array
+        atau np.memmap yang sudah dialokasikan untuk hasil berukuran besar.
+        """
+        n_targets = np.atleast_1d(target_lat).shape[0]
+        if out is None:
+            out = np.empty((len(self), n_targets), dtype=dtype)
+        for start, stop, block in self.iter_distance_blocks(target_lat, target_lon, block_bytes):
+            out[start:stop] = block
+        return out
@@ -0,0 +1,99 @@
+import numpy as np
+
+
+# Nilai VS30 representatif per kelas situs SNI 1726:2019 (m/s)
+TANAH_MAPPING = {
+    'SA': 1300, 'SB': 760, 'SC': 520, 'SD': 250, 'SE': 180
+}
+
+# Rentang VS30 valid model Boore-Atkinson 2008 (m/s)
+VS30_MIN, VS30_MAX = 180, 1300
+
+# Tabel koefisien Boore-Atkinson (2008) untuk mekanisme tidak ditentukan (e1),
+# suku jarak (c1-c3, h) dan suku situs linear (blin). Periode 0 = PGA.
+BA08_PERIODS = np.array([0.0, 0.01, 0.02, 0.03, 0.05, 0.075, 0.1, 0.15, 0.2, 0.25, 0.3,
+                         0.4, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 4.0, 5.0, 7.5, 10.0])
+BA08_COEFFS = {
+    'e1': np.array([-0.53804, -0.52883, -0.52192, -0.45285, -0.28476, 0.00767, 0.20109, 0.46128,
+                    0.57180, 0.51884, 0.43825, 0.39220, 0.18957, -0.21338, -0.46896, -0.86271,
+                    -1.22652, -1.82979, -2.24656, -1.28408, -1.43145, -2.15446]),
+    'e5': np.array([0.28805, 0.28897, 0.25144, 0.17976, 0.06369, 0.01170, 0.04697, 0.17990,
+                    0.52729, 0.60880, 0.64472, 0.78610, 0.76837, 0.75179, 0.67880, 0.70689,
+                    0.77989, 0.77966, 1.24961, 0.14271, 0.52407, 0.40387]),
+    'e6': np.array([-0.10164, -0.10019, -0.11006, -0.12858, -0.15752, -0.17051, -0.15948, -0.14539,
+                    -0.12964, -0.13843, -0.15694, -0.07843, -0.09054, -0.14053, -0.18257, -0.25950,
+                    -0.29657, -0.45384, -0.35874, -0.39006, -0.37578, -0.48492]),
+    'e7': np.array([0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.00102, 0.08607, 0.10601, 0.02262,
+                    0.0, 0.10302, 0.05393, 0.19082, 0.29888, 0.67466, 0.79508, 0.0, 0.0, 0.0]),
+    'Mh': np.array([6.75] * 19 + [8.5] * 3),
+    'c1': np.array([-0.66050, -0.66220, -0.66600, -0.69010, -0.71700, -0.72050, -0.70810, -0.69610,
+                    -0.58300, -0.57260, -0.55430, -0.64430, -0.69140, -0.74080, -0.81830, -0.83030,
+                    -0.82850, -0.78440, -0.68540, -0.50960, -0.37240, -0.09824]),
+    'c2': np.array([0.11970, 0.12000, 0.12280, 0.12830, 0.13170, 0.12370, 0.11170, 0.09884,
+                    0.04273, 0.02977, 0.01955, 0.04394, 0.06080, 0.07518, 0.10270, 0.09793,
+                    0.09432, 0.07282, 0.03758, -0.02391, -0.06568, -0.13800]),
+    'c3': np.array([-0.01151, -0.01151, -0.01151, -0.01151, -0.01151, -0.01151, -0.01151, -0.01113,
+                    -0.00952, -0.00837, -0.00750, -0.00626, -0.00540, -0.00409, -0.00334, -0.00255,
+                    -0.00217, -0.00191, -0.00191, -0.00191, -0.00191, -0.00191]),
+    'h': np.array([1.35, 1.35, 1.35, 1.35, 1.35, 1.55, 1.68, 1.86, 1.98, 2.07, 2.14,
+                   2.24, 2.32, 2.46, 2.54, 2.66, 2.73, 2.83, 2.89, 2.93, 3.00, 3.04]),
+    'blin': np.array([-0.360, -0.360, -0.340, -0.330, -0.290, -0.230, -0.250, -0.280, -0.310, -0.390,
+                      -0.440, -0.500, -0.600, -0.690, -0.700, -0.720, -0.730, -0.740, -0.750, -0.750,
+                      -0.692, -0.650]),
+    # Deviasi standar total ln(Y), mekanisme tidak ditentukan (sigma_TU)
+    'sigma': np.array([0.566, 0.569, 0.569, 0.578, 0.589, 0.606, 0.608, 0.592, 0.596, 0.592, 0.608,
+                       0.603, 0.615, 0.649, 0.654, 0.684, 0.702, 0.700, 0.702, 0.730, 0.781, 0.735])
+}
+BA08_MREF, BA08_RREF, BA08_VREF = 4.5, 1.0, 760.0
+
+# Deviasi standar total ln(PGA) BA08 (mekanisme tidak ditentukan, sigma_TU)
+BA08_SIGMA = BA08_COEFFS['sigma'][0]
+
+
+def ba08_coefficients(periods=None):
+    """Subset tabel koefisien untuk periode tertentu (None = seluruh tabel)"""
+    if periods is None:
+        return BA08_COEFFS
+    idx = [int(np.flatnonzero(np.isclose(BA08_PERIODS, p))[0]) for p in np.atleast_1d(periods)]
+    return {name: values[idx] for name, values in BA08_COEFFS.items()}
+
+
+def ba08_ln(M, RJB, VS30, c):
+    """
+    ln(Y) BA08 dengan koefisien `c` (skalar per periode atau array periode).
+    Koefisien array disiarkan pada sumbu terakhir, sehingga seluruh periode
+    dihitung dalam satu ekspresi tanpa jalur kode per periode.
+    """
+    # Komponen Magnitudo
+    dM = M - c['Mh']
+    FM = np.where(dM <= 0,
+                  c['e1'] + c['e5']*dM + c['e6']*dM**2,
+                  c['e1'] + c['e7']*dM)
+
+    # Komponen Jarak
+    R_eff = np.sqrt(RJB**2 + c['h']**2)
+    FD = (c['c1'] + c['c2']*(M-BA08_MREF)) * np.log(R_eff/BA08_RREF) + c['c3']*(R_eff-BA08_RREF)
+
+    # Komponen Situs
+    FS = c['blin'] * np.log(VS30/BA08_VREF)
+
+    return FM + FD + FS
+
+
+_PGA_COEFFS = {name: values[0] for name, values in BA08_COEFFS.items()}
+
+
+def BA08(M, RJB, VS30=760):
+    """Estimasi PGA menggunakan model Boore-Atkinson (2008)"""
+    return np.exp(ba08_ln(M, RJB, VS30, _PGA_COEFFS))
+
+
+def BA08_spectrum(M, RJB, VS30=760, periods=None):
+    """
+    Spektrum respons BA08 (g): input M, RJB, VS30 disiarkan bersama lalu
+    ditambah sumbu periode terakhir, hasil berbentuk (..., n_periode).
+    Contoh event x kelas tanah x periode: BA08_spectrum(M[:, None], R[:, None], vs30[None, :]).
+    """
+    c = ba08_coefficients(periods)
+    M, RJB, VS30 = (np.asarray(x, dtype=np.float64)[..., None] for x in (M, RJB, VS30))
+    return np.exp(ba08_ln(M, RJB, VS30, c))
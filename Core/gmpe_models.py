@@ -0,0 +1,149 @@
+import abc
+
+import numpy as np
+
+from Core.gmpe import BA08_COEFFS, ba08_ln
+
+
+# Percepatan gravitasi (cm/s^2) untuk konversi gal -> g
+GRAVITY_CM_S2 = 981.0
+
+
+class GMPEContext:
+    """
+    Suku bersama seluruh model GMPE (dihitung sekali per evaluasi):
+    magnitudo, jarak RJB, kedalaman, VS30 dan jarak hiposenter.
+    """
+
+    def __init__(self, M, RJB, VS30=760.0, depth=None):
+        M, RJB, VS30 = np.broadcast_arrays(*(np.asarray(x, dtype=np.float64) for x in (M, RJB, VS30)))
+        self.M, self.RJB, self.VS30 = M, RJB, VS30
+        self.depth = np.zeros_like(M) if depth is None else np.broadcast_to(np.asarray(depth, dtype=np.float64), M.shape)
+        self.r_hypo = np.sqrt(RJB**2 + self.depth**2)
+
+
+class GMPE(abc.ABC):
+    """
+    Antarmuka model GMPE: ln PGA (g) dan sigma ln dari GMPEContext.
+    Subkelas tanpa ln_pga/sigma gagal saat dibuat (sebelum didaftarkan).
+    """
+
+    name = None
+    label = None
+
+    @abc.abstractmethod
+    def ln_pga(self, ctx):
+        """ln PGA (g) untuk setiap elemen konteks"""
+
+    @abc.abstractmethod
+    def sigma(self, ctx):
+        """Simpangan baku ln PGA untuk setiap elemen konteks"""
+
+    def pga(self, ctx):
+        return np.exp(self.ln_pga(ctx))
+
+
+class BooreAtkinson2008(GMPE):
+    """Boore & Atkinson (2008), sama dengan fungsi BA08 (gempa kerak dangkal)"""
+
+    name = 'BA08'
+    label = "Boore-Atkinson (2008)"
+
+    def __init__(self):
+        self.coeffs = {name: values[0] for name, values in BA08_COEFFS.items()}
+
+    def ln_pga(self, ctx):
+        return ba08_ln(ctx.M, ctx.RJB, ctx.VS30, self.coeffs)
+
+    def sigma(self, ctx):
+        return np.full(ctx.M.shape, self.coeffs['sigma'])
+
+
+class Zhao2006Interface(GMPE):
+    """
+    Zhao et al. (2006) untuk gempa antarmuka subduksi (megathrust Sumatra), PGA.
+    Jarak sumber didekati jarak hiposenter; kelas situs dari VS30.
+    """
+
+    name = 'ZHAO06'
+    label = "Zhao et al. (2006) - Interface"
+
+    a, b, c, d, e = 1.101, -0.00564, 0.0055, 1.080, 0.01412
+    SI = 0.0
+    HC = 15.0
+    # Suku situs: batuan keras, batuan, tanah keras, tanah sedang, tanah lunak
+    SITE_VS30 = np.array([1100.0, 600.0, 300.0, 200.0])
+    SITE_TERMS = np.array([0.293, 1.111, 1.344, 1.355, 1.420])
+    SIGMA, TAU = 0.604, 0.398
+
+    def ln_pga(self, ctx):
+        x = np.maximum(ctx.r_hypo, 1.0)
+        h = np.minimum(ctx.depth, 125.0)
+        r = x + self.c * np.exp(self.d * ctx.M)
+        site = self.SITE_TERMS[np.searchsorted(-self.SITE_VS30, -ctx.VS30, side='right')]
+        ln_gal = (self.a * ctx.M + self.b * x - np.log(r)
+                  + self.e * np.where(h >= self.HC, h - self.HC, 0.0) + self.SI + site)
+        return ln_gal - np.log(GRAVITY_CM_S2)
+
+    def sigma(self, ctx):
+        return np.full(ctx.M.shape, np.hypot(self.SIGMA, self.TAU))
+
+
+class Youngs1997Interface(GMPE):
+    """
+    Youngs et al. (1997) untuk gempa antarmuka subduksi (Zt = 0), PGA.
+    Persamaan batuan untuk VS30 >= 760 m/s, persamaan tanah untuk lainnya.
+    """
+
+    name = 'YOUNGS97'
+    label = "Youngs et al. (1997) - Interface"
+
+    ROCK_VS30 = 760.0
+
+    def ln_pga(self, ctx):
+        M, r, H = ctx.M, np.maximum(ctx.r_hypo, 1.0), ctx.depth
+        rock = 0.2418 + 1.414 * M - 2.552 * np.log(r + 1.7818 * np.exp(0.554 * M)) + 0.00607 * H
+        soil = -0.6687 + 1.438 * M - 2.329 * np.log(r + 1.097 * np.exp(0.617 * M)) + 0.00648 * H
+        return np.where(ctx.VS30 >= self.ROCK_VS30, rock, soil)
+
+    def sigma(self, ctx):
+        return 1.45 - 0.1 * np.minimum(ctx.M, 8.0)
+
+
+GMPE_REGISTRY = {}
+
+
+def register_gmpe(model):
+    """Mendaftarkan model GMPE (instance) berdasarkan `name`"""
+    GMPE_REGISTRY[model.name] = model
+    return model
+
+
+for _model in (BooreAtkinson2008(), Zhao2006Interface(), Youngs1997Interface()):
+    register_gmpe(_model)
+
+
+def get_gmpe(name):
+    if name not in GMPE_REGISTRY:
+        raise ValueError(f"Model GMPE tidak dikenal: {name}")
+    return GMPE_REGISTRY[name]
+
+
+def evaluate_gmpes(names, M, RJB, VS30=760.0, depth=None):
+    """PGA (g) beberapa model sekaligus dari satu GMPEContext: {nama: array}"""
+    ctx = GMPEContext(M, RJB, VS30, depth)
+    return {name: get_gmpe(name).pga(ctx) for name in names}
+
+
+def logic_tree_mean(results, weights=None):
+    """
+    Rata-rata logic tree (berbobot pada ln PGA, yaitu rata-rata geometrik).
+    Bobot dinormalisasi; None = bobot sama.
+    """
+    names = list(results)
+    weights = np.ones(len(names)) if weights is None else np.array([weights[n] for n in names], dtype=np.float64)
+    if weights.sum() <= 0:
+        raise ValueError("Total bobot logic tree harus lebih dari 0.")
+    weights = weights / weights.sum()
+    ln_mean = sum(w * np.log(results[n]) for n, w in zip(names, weights))
+    return np.exp(ln_mean)
@@ -0,0 +1,181 @@
+import base64
+import warnings
+from io import BytesIO
+
+import numpy as np
+
+from Core.features import FeatureTransformer
+from Core.geodesy import chord_to_km, unit_vectors
+from Core.gmpe import BA08
+from Core.sites import event_mask
+from Core.spatial_index import KM_PER_DEG, SpatialIndex
+
+
+# Ukuran tile grid (sel per sisi) dan batas memori sementara per blok (byte)
+DEFAULT_TILE_CELLS = 32
+DEFAULT_BLOCK_BYTES = 64 * 1024 * 1024
+
+# Wilayah studi default (Aceh dan sekitarnya)
+ACEH_EXTENT = (1.5, 6.5, 94.5, 98.5)
+
+
+def make_grid(lat_min, lat_max, lon_min, lon_max, step_deg):
+    """Titik tengah sel grid (lats dari selatan ke utara, lons dari barat ke timur)"""
+    lats = np.arange(lat_min + step_deg / 2, lat_max, step_deg)
+    lons = np.arange(lon_min + step_deg / 2, lon_max, step_deg)
+    return lats, lons
+
+
+def grid_bounds(lats, lons, step_deg):
+    """
+    Tepi luar grid (lat_min, lat_max, lon_min, lon_max) dari titik tengah sel ± step/2.
+    Bisa melewati batas wilayah jika step tidak membagi habis rentangnya.
+    """
+    half = step_deg / 2
+    return float(lats[0] - half), float(lats[-1] + half), float(lons[0] - half), float(lons[-1] + half)
+
+
+def _reduce(values, reducer, percentile):
+    """Reduksi PGA sepanjang sumbu event (NaN = event di luar radius)"""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        if reducer == 'max':
+            return np.nanmax(values, axis=0)
+        return np.nanpercentile(values, percentile, axis=0)
+
+
+def pga_raster(lat, lon, mag, vs30, lats, lons, reducer='max', percentile=84.0,
+               max_distance_km=200.0, pga_event=None, valid=None, spatial_index=None,
+               out=None, tile_cells=DEFAULT_TILE_CELLS, block_bytes=DEFAULT_BLOCK_BYTES):
+    """
+    Raster PGA (n_lat, n_lon): untuk setiap sel, PGA maksimum atau persentil
+    dari seluruh event dalam radius, dihitung per tile dengan memori terbatas.
+
+    - vs30: skalar atau array per event.
+    - pga_event: jika diberikan (mis. PGA MLP per event), nilai ini yang direduksi
+      untuk event dalam radius; jika None, BA08 dihitung per event x sel.
+    - valid: mask boolean event yang dihitung (None = seluruh event).
+    - out: array/np.memmap (n_lat, n_lon) yang sudah dialokasikan pemanggil.
+    """
+    # Array kolom (boleh float32) dikonversi ke float64 hanya untuk event kandidat per tile
+    mag = np.asarray(mag)
+    vs30 = np.broadcast_to(np.asarray(vs30), mag.shape)
+    if spatial_index is None:
+        spatial_index = SpatialIndex(lat, lon)
+    if out is None:
+        out = np.empty((len(lats), len(lons)), dtype=np.float32)
+
+    # Radius pencarian event per tile = radius + setengah diagonal tile
+    step_km = max(np.diff(lats).max(initial=0.0), np.diff(lons).max(initial=0.0)) * KM_PER_DEG
+    tile_half_diag_km = tile_cells * step_km / np.sqrt(2)
+
+    for i0 in range(0, len(lats), tile_cells):
+        for j0 in range(0, len(lons), tile_cells):
+            tile_lats, tile_lons = lats[i0:i0 + tile_cells], lons[j0:j0 + tile_cells]
+            grid_lat, grid_lon = np.meshgrid(tile_lats, tile_lons, indexing='ij')
+            cell_vectors = unit_vectors(grid_lat.ravel(), grid_lon.ravel())
+
+            center_lat, center_lon = tile_lats.mean(), tile_lons.mean()
+            cand = spatial_index.candidates(center_lat, center_lon, max_distance_km + tile_half_diag_km)
+            if valid is not None:
+                cand = cand[valid[cand]]
+            result = np.full(cell_vectors.shape[0], np.nan)
+
+            if cand.shape[0] > 0:
+                # Sub-blok sel agar matriks event x sel tidak melebihi block_bytes
+                cells_per_block = max(1, int(block_bytes // (8 * cand.shape[0])))
+                ev_vectors = spatial_index.vectors.vectors[cand]
+                if pga_event is None:
+                    cand_mag = mag[cand].astype(np.float64)[:, None]
+                    cand_vs30 = vs30[cand].astype(np.float64)[:, None]
+                for c0 in range(0, cell_vectors.shape[0], cells_per_block):
+                    dot = ev_vectors @ cell_vectors[c0:c0 + cells_per_block].T
+                    rjb = chord_to_km(dot, dot)
+                    if pga_event is None:
+                        values = BA08(cand_mag, rjb, cand_vs30)
+                    else:
+                        values = np.broadcast_to(pga_event[cand][:, None], rjb.shape).copy()
+                    values[rjb > max_distance_km] = np.nan
+                    result[c0:c0 + cells_per_block] = _reduce(values, reducer, percentile)
+
+            out[i0:i0 + len(tile_lats), j0:j0 + len(tile_lons)] = result.reshape(grid_lat.shape)
+
+    if isinstance(out, np.memmap):
+        out.flush()
+    return out
+
+
+def event_pga_mlp(df, mapped_columns, models, vs30, valid):
+    """
+    PGA MLP per event (tidak bergantung jarak). Batas outlier IQR dihitung
+    sekali dari seluruh event valid di wilayah, bukan per sel grid.
+    """
+    rows = np.flatnonzero(valid)
+    transformer = FeatureTransformer(mapped_columns)
+    transformer.fit(df, rows=rows)
+    vs30_rows = np.asarray(np.broadcast_to(np.asarray(vs30), valid.shape)[rows], dtype=np.float64)
+    X = transformer.transform(df, vs30_rows, rows=rows)
+
+    pga = np.full(valid.shape[0], np.nan)
+    pga[rows] = np.maximum(models.engine.predict(X), 0.0001)
+    return pga
+
+
+def estimate_raster(df, mapped_columns, extent=ACEH_EXTENT, step_deg=0.05, vs30=None,
+                    models=None, reducer='max', percentile=84.0, max_distance_km=200.0,
+                    spatial_index=None, out=None):
+    """
+    Raster PGA wilayah studi dari katalog: (lats, lons, raster GMPE, raster MLP/None).
+    vs30=None memakai kolom VS30 data (per event); jika tidak, satu nilai VS30 untuk seluruh grid.
+    """
+    lat = df[mapped_columns['latitude']].to_numpy()
+    lon = df[mapped_columns['longitude']].to_numpy()
+    mag = df[mapped_columns['magnitude']].to_numpy()
+    if vs30 is None:
+        vs30 = df[mapped_columns['vs30']].to_numpy()
+    if spatial_index is None:
+        spatial_index = SpatialIndex(lat, lon)
+
+    valid = event_mask(df, mapped_columns)
+    lats, lons = make_grid(*extent, step_deg)
+    common = dict(reducer=reducer, percentile=percentile, max_distance_km=max_distance_km,
+                  valid=valid, spatial_index=spatial_index)
+
+    raster_gmpe = pga_raster(lat, lon, mag, vs30, lats, lons, out=out, **common)
+    raster_mlp = None
+    if models is not None and valid.any():
+        pga_event = event_pga_mlp(df, mapped_columns, models, vs30, valid)
+        raster_mlp = pga_raster(lat, lon, mag, vs30, lats, lons, pga_event=pga_event, **common)
+    return lats, lons, raster_gmpe, raster_mlp
+
+
+def raster_to_png(raster, vmin=None, vmax=None, colorscale='Reds', opacity=0.75):
+    """
+    Mengubah raster PGA menjadi PNG RGBA (data URI) untuk overlay peta.
+    Baris pertama raster = lintang paling selatan; sel NaN transparan.
+    """
+    from PIL import Image
+    from plotly.colors import sample_colorscale
+
+    raster = np.asarray(raster, dtype=np.float64)
+    finite = np.isfinite(raster)
+    if vmin is None:
+        vmin = np.nanmin(raster) if finite.any() else 0.0
+    if vmax is None:
+        vmax = np.nanmax(raster) if finite.any() else 1.0
+    span = vmax - vmin if vmax > vmin else 1.0
+
+    # Lookup table 256 warna dari colorscale plotly
+    lut = np.array([
+        [int(float(v)) for v in c[c.index('(') + 1:-1].split(',')[:3]]
+        for c in sample_colorscale(colorscale, np.linspace(0, 1, 256))
+    ], dtype=np.uint8)
+
+    level = np.clip((np.nan_to_num(raster, nan=vmin) - vmin) / span * 255, 0, 255).astype(np.uint8)
+    rgba = np.zeros(raster.shape + (4,), dtype=np.uint8)
+    rgba[..., :3] = lut[level]
+    rgba[..., 3] = np.where(finite, int(opacity * 255), 0)
+
+    buffer = BytesIO()
+    Image.fromarray(rgba[::-1], 'RGBA').save(buffer, format='PNG')
+    return "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode()
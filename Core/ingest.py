@@ -0,0 +1,204 @@
+from operator import itemgetter
+
+import numpy as np
+import pandas as pd
+
+from Core.columns import map_columns
+from Core.dtypes import downcast_columns
+from Core.validation import ValidationReport
+
+
+# Jumlah baris per chunk saat membaca upload
+DEFAULT_CHUNK_ROWS = 100000
+
+# Jumlah baris pertama file yang disimpan untuk preview
+PREVIEW_ROWS = 10
+
+# Interval laporan progres saat membaca Excel (baris)
+PROGRESS_ROWS = 10000
+
+# Format Excel yang dibaca streaming dengan openpyxl (.xls lama tetap lewat pd.read_excel)
+STREAMING_EXCEL = ('.xlsx', '.xlsm')
+
+
+def is_streaming_excel(uploaded_file):
+    """File upload dibaca lewat ExcelStream (bukan pd.read_excel)"""
+    return uploaded_file.name.lower().endswith(STREAMING_EXCEL)
+
+
+def excel_sheet_names(uploaded_file):
+    """Daftar nama sheet workbook (hanya membaca metadata workbook)"""
+    from openpyxl import load_workbook
+
+    uploaded_file.seek(0)
+    workbook = load_workbook(uploaded_file, read_only=True)
+    try:
+        return list(workbook.sheetnames)
+    finally:
+        workbook.close()
+
+
+class ExcelStream:
+    """
+    Pembaca sheet Excel secara streaming (openpyxl read-only, baris demi baris).
+    Hanya kolom hasil mapping (COLUMN_ALIASES) yang diambil dan diisi ke buffer
+    kolom yang dialokasikan sekali; tiap chunk berupa DataFrame kolom tersebut
+    (berlaku sampai chunk berikutnya dibaca). Baris yang seluruhnya kosong dilewati.
+    progress(fraksi atau None, jumlah baris) dipanggil tiap PROGRESS_ROWS baris.
+    `source` berupa file upload atau path; `usecols` mengganti kolom hasil mapping.
+    """
+
+    def __init__(self, source, sheet_name=None, chunk_rows=DEFAULT_CHUNK_ROWS,
+                 preview_rows=PREVIEW_ROWS, progress=None, usecols=None):
+        from openpyxl import load_workbook
+
+        self.chunk_rows = chunk_rows
+        self.progress = progress
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        self._workbook = load_workbook(source, read_only=True, data_only=True)
+        sheet = self._workbook[sheet_name] if sheet_name is not None else self._workbook.worksheets[0]
+        self.sheet_name = sheet.title
+        # Perkiraan jumlah baris dari metadata sheet (bisa tidak ada)
+        self.total_rows = sheet.max_row - 1 if sheet.max_row else None
+
+        self._rows = (row for row in sheet.iter_rows(values_only=True) if any(v is not None for v in row))
+        header = next(self._rows, None)
+        if header is None:
+            self.close()
+            raise ValueError("File tidak berisi data.")
+        self.columns = [f"Unnamed: {i}" if name is None else name for i, name in enumerate(header)]
+        self.mapped_columns = map_columns(self.columns)
+        # Kolom yang dibaca (urutan sesuai file)
+        wanted = set(self.mapped_columns.values() if usecols is None else usecols)
+        absent = wanted.difference(self.columns)
+        if absent:
+            self.close()
+            raise ValueError(f"Kolom tidak ditemukan: {', '.join(map(str, absent))}")
+        self._indices = [i for i, col in enumerate(self.columns) if col in wanted]
+        self.selected = [self.columns[i] for i in self._indices]
+
+        # Preview: N baris pertama seluruh kolom (dibaca ulang sebagai awal chunk pertama)
+        self._head = [row for _, row in zip(range(max(preview_rows, 1)), self._rows)]
+        if not self._head:
+            self.close()
+            raise ValueError("File tidak berisi data.")
+        self.preview = pd.DataFrame([self._pad(row) for row in self._head[:preview_rows]], columns=self.columns)
+
+    def _pad(self, row):
+        n = len(self.columns)
+        return row[:n] if len(row) >= n else row + (None,) * (n - len(row))
+
+    def __iter__(self):
+        n_cols = len(self.selected)
+        if n_cols == 0:
+            pick = lambda row: ()
+        elif n_cols == 1:
+            index = self._indices[0]
+            pick = lambda row: (row[index],)
+        else:
+            pick = itemgetter(*self._indices)
+        buffer = np.empty((self.chunk_rows, n_cols), dtype=object)
+        width = max(self._indices, default=-1) + 1
+
+        rows = iter(self._head)
+        done, filled = 0, 0
+        try:
+            for source in (rows, self._rows):
+                for row in source:
+                    if len(row) < width:
+                        row = self._pad(row)
+                    buffer[filled] = pick(row)
+                    filled += 1
+                    if filled == self.chunk_rows:
+                        yield self._frame(buffer, filled)
+                        done, filled = done + filled, 0
+                    if (done + filled) % PROGRESS_ROWS == 0:
+                        self._report(done + filled)
+            if filled:
+                yield self._frame(buffer, filled)
+            self._report(done + filled, finished=True)
+        finally:
+            self.close()
+
+    def _frame(self, buffer, n):
+        return pd.DataFrame({col: buffer[:n, j] for j, col in enumerate(self.selected)},
+                            columns=self.selected, copy=False)
+
+    def _report(self, n_rows, finished=False):
+        if self.progress is None:
+            return
+        if finished:
+            fraction = 1.0
+        elif self.total_rows:
+            fraction = min(n_rows / self.total_rows, 1.0)
+        else:
+            fraction = None
+        self.progress(fraction, n_rows)
+
+    def close(self):
+        self._workbook.close()
+
+
+def iter_upload(uploaded_file, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Membaca file upload (CSV/Excel .xls) per chunk"""
+    name = uploaded_file.name.lower()
+    if name.endswith('.csv'):
+        yield from pd.read_csv(uploaded_file, chunksize=chunk_rows)
+    elif name.endswith(('.xlsx', '.xls')):
+        # .xls tidak didukung openpyxl: dibaca penuh lewat pd.read_excel
+        df = pd.read_excel(uploaded_file)
+        for start in range(0, len(df), chunk_rows):
+            yield df.iloc[start:start + chunk_rows].copy()
+    else:
+        raise ValueError(f"Format file tidak didukung: {uploaded_file.name}")
+
+
+def ingest(uploaded_file, chunk_rows=DEFAULT_CHUNK_ROWS, sheet_name=None, progress=None):
+    """
+    Membaca dan memvalidasi upload per chunk dalam satu lintasan.
+    Mengembalikan (DataFrame, mapped_columns, ValidationReport). DataFrame hanya
+    berisi kolom hasil mapping yang sudah dikonversi ke angka (kolom lain tidak
+    disimpan; N baris pertama file ada di report.preview) dan bernilai None jika
+    data tidak valid (array tidak lagi disimpan setelah error pertama).
+    Kolom diturunkan ke tipe data ringkas (Core.dtypes); pilihan dtype ada di report.dtypes.
+    File .xlsx dibaca streaming (ExcelStream, sheet `sheet_name`). Untuk semua format,
+    validasi (nilai kosong dan bukan angka) hanya mencakup kolom hasil mapping
+    (urutan sesuai file), karena kolom lain tidak disimpan maupun dipakai.
+    """
+    report = ValidationReport()
+    mapped_columns = None
+    parts = {}
+    if is_streaming_excel(uploaded_file):
+        chunks = ExcelStream(uploaded_file, sheet_name, chunk_rows, progress=progress)
+        mapped_columns = chunks.mapped_columns
+        report.preview = chunks.preview
+    else:
+        chunks = iter_upload(uploaded_file, chunk_rows)
+
+    selected = None
+    for chunk in chunks:
+        if mapped_columns is None:
+            mapped_columns = map_columns(chunk.columns)
+            report.preview = chunk.head(PREVIEW_ROWS)
+        if selected is None:
+            mapped = set(mapped_columns.values())
+            selected = [col for col in chunk.columns if col in mapped]
+        converted = report.update(chunk[selected], selected)
+        if not report.is_valid:
+            parts.clear()
+            continue
+        for col, values in converted.items():
+            parts.setdefault(col, []).append(values)
+
+    if mapped_columns is None:
+        raise ValueError("File tidak berisi data.")
+    if not report.is_valid:
+        return None, mapped_columns, report
+
+    df = pd.DataFrame({
+        col: arrays[0] if len(arrays) == 1 else np.concatenate(arrays)
+        for col, arrays in parts.items()
+    }, copy=False)
+    df, report.dtypes = downcast_columns(df, mapped_columns)
+    return df, mapped_columns, report
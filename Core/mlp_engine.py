@@ -0,0 +1,73 @@
+import numpy as np
+
+
+# Jumlah baris per blok inferensi (menjaga memori sementara tetap kecil)
+DEFAULT_BATCH_ROWS = 65536
+
+
+def _scaler_params(scaler, n_features):
+    """Mengambil mean dan std StandardScaler (mendukung with_mean/with_std=False)"""
+    mean = getattr(scaler, 'mean_', None)
+    scale = getattr(scaler, 'scale_', None)
+    mean = np.zeros(n_features) if mean is None else np.asarray(mean, dtype=np.float64)
+    scale = np.ones(n_features) if scale is None else np.asarray(scale, dtype=np.float64)
+    return mean, scale
+
+
+class MLPEngine:
+    """
+    Inferensi MLP murni NumPy: bobot diambil dari coefs_/intercepts_ model
+    sklearn, scaler_x dilebur ke layer pertama dan scaler_y ke layer terakhir.
+    """
+
+    def __init__(self, model_mlp, scaler_x, scaler_y, dtype=np.float32):
+        if getattr(model_mlp, 'activation', 'relu') != 'relu':
+            raise ValueError("MLPEngine hanya mendukung aktivasi ReLU.")
+        if getattr(model_mlp, 'out_activation_', 'identity') != 'identity':
+            raise ValueError("MLPEngine hanya mendukung output identity (regresi).")
+
+        coefs = [np.asarray(w, dtype=np.float64) for w in model_mlp.coefs_]
+        intercepts = [np.asarray(b, dtype=np.float64) for b in model_mlp.intercepts_]
+
+        # Layer pertama: W' = W / std_x, b' = b - (mean_x / std_x) @ W
+        mean_x, scale_x = _scaler_params(scaler_x, coefs[0].shape[0])
+        coefs[0] = coefs[0] / scale_x[:, None]
+        intercepts[0] = intercepts[0] - (mean_x / scale_x) @ model_mlp.coefs_[0]
+
+        # Layer terakhir: y = y_scaled * std_y + mean_y
+        mean_y, scale_y = _scaler_params(scaler_y, coefs[-1].shape[1])
+        coefs[-1] = coefs[-1] * scale_y[None, :]
+        intercepts[-1] = intercepts[-1] * scale_y + mean_y
+
+        self.dtype = np.dtype(dtype)
+        self.coefs = [w.astype(self.dtype) for w in coefs]
+        self.intercepts = [b.astype(self.dtype) for b in intercepts]
+        self.n_features = self.coefs[0].shape[0]
+
+    def _forward(self, X):
+        h = X
+        last = len(self.coefs) - 1
+        for i, (W, b) in enumerate(zip(self.coefs, self.intercepts)):
+            h = h @ W
+            h += b
+            if i < last:
+                np.maximum(h, 0, out=h)
+        return h
+
+    def predict(self, X, out=None, batch_rows=DEFAULT_BATCH_ROWS):
+        """
+        Prediksi PGA (g, sudah di-inverse scaling) untuk matriks fitur (n, 22).
+        Hasil berupa array 1D; `out` boleh dialokasikan oleh pemanggil.
+        """
+        X = np.asarray(X)
+        if X.ndim != 2 or X.shape[1] != self.n_features:
+            raise ValueError(f"Matriks fitur harus berukuran (n, {self.n_features}).")
+
+        n_rows = X.shape[0]
+        if out is None:
+            out = np.empty(n_rows, dtype=np.float64)
+        for start in range(0, n_rows, batch_rows):
+            stop = min(start + batch_rows, n_rows)
+            block = X[start:stop].astype(self.dtype, copy=False)
+            out[start:stop] = self._forward(block)[:, 0]
+        return out
@@ -0,0 +1,154 @@
+import hashlib
+import os
+import threading
+
+import joblib
+
+from Core.mlp_engine import MLPEngine
+
+
+# LOKASI ARTEFAK MODEL
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODEL_FILES = {
+    'model_mlp': 'model_pga_mlp.pkl',
+    'scaler_x': 'scaler_x.pkl',
+    'scaler_y': 'scaler_y.pkl'
+}
+
+# Urutan fitur MLP (harus SAMA dengan saat training)
+MLP_FEATURES_ORDER = [
+    'latitude', 'longitude', 'depth', 'nst', 'gap', 'rms', 'magNst',
+    'Soil_SA', 'Soil_SB', 'Soil_SC', 'Soil_SD', 'Soil_SE',
+    'flag_missing_gap', 'flag_missing_rms', 'flag_missing_magNst',
+    'flag_missing_depthError', 'flag_missing_nst',
+    'flag_outlier_gap', 'flag_outlier_rms', 'flag_outlier_magNst',
+    'flag_outlier_depth', 'flag_outlier_depthError'
+]
+
+
+class ModelBundle:
+    """Kumpulan artefak MLP yang sudah tervalidasi (read-only, dipakai bersama)"""
+
+    def __init__(self, model_mlp, scaler_x, scaler_y, fingerprint):
+        self.model_mlp = model_mlp
+        self.scaler_x = scaler_x
+        self.scaler_y = scaler_y
+        self.fingerprint = fingerprint
+        # Engine NumPy dengan scaler terlebur, dibangun sekali saat warm-up
+        self.engine = MLPEngine(model_mlp, scaler_x, scaler_y)
+
+
+def _file_hash(path, block_size=1 << 20):
+    """Menghitung hash SHA-256 isi file artefak"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def validate_bundle(model_mlp, scaler_x, scaler_y):
+    """
+    Memvalidasi kecocokan model dan scaler satu kali saat warm-up.
+    Melempar ValueError jika artefak tidak konsisten dengan urutan fitur.
+    """
+    n_features = len(MLP_FEATURES_ORDER)
+
+    if not hasattr(model_mlp, 'coefs_') or not hasattr(model_mlp, 'predict'):
+        raise ValueError("model_pga_mlp.pkl bukan model MLP yang sudah di-training.")
+    if model_mlp.coefs_[0].shape[0] != n_features:
+        raise ValueError(f"Model MLP membutuhkan {model_mlp.coefs_[0].shape[0]} fitur, bukan {n_features}.")
+
+    if getattr(scaler_x, 'n_features_in_', None) != n_features:
+        raise ValueError(f"scaler_x.pkl tidak sesuai dengan {n_features} fitur MLP.")
+    feature_names = getattr(scaler_x, 'feature_names_in_', None)
+    if feature_names is not None and list(feature_names) != MLP_FEATURES_ORDER:
+        raise ValueError("Urutan fitur scaler_x.pkl berbeda dengan urutan fitur MLP.")
+
+    if getattr(scaler_y, 'n_features_in_', None) != 1:
+        raise ValueError("scaler_y.pkl harus berupa scaler satu kolom (PGA).")
+
+
+class ModelRegistry:
+    """
+    Registry model per-proses: artefak dimuat sekali, dipakai bersama oleh
+    semua sesi, dan dimuat ulang otomatis jika mtime/hash file berubah.
+    """
+
+    def __init__(self, base_dir=BASE_DIR, files=None):
+        self.base_dir = base_dir
+        self.files = dict(files or MODEL_FILES)
+        self._lock = threading.Lock()
+        self._bundle = None
+        self._stats = None
+        self._hashes = None
+        self.load_count = 0
+        self.last_error = None
+
+    def _paths(self):
+        return {key: os.path.join(self.base_dir, name) for key, name in self.files.items()}
+
+    def _stat(self):
+        """Tanda tangan murah (mtime, ukuran) untuk deteksi perubahan file"""
+        result = {}
+        for key, path in self._paths().items():
+            st_info = os.stat(path)
+            result[key] = (st_info.st_mtime_ns, st_info.st_size)
+        return result
+
+    def _load(self, stats):
+        paths = self._paths()
+        hashes = {key: _file_hash(path) for key, path in paths.items()}
+
+        # File hanya di-touch (isi sama): cukup perbarui mtime
+        if self._bundle is not None and hashes == self._hashes:
+            self._stats = stats
+            return
+
+        loaded = {key: joblib.load(path) for key, path in paths.items()}
+        validate_bundle(loaded['model_mlp'], loaded['scaler_x'], loaded['scaler_y'])
+
+        fingerprint = hashlib.sha256(
+            "".join(hashes[key] for key in sorted(hashes)).encode()
+        ).hexdigest()
+        self._bundle = ModelBundle(loaded['model_mlp'], loaded['scaler_x'], loaded['scaler_y'], fingerprint)
+        self._stats = stats
+        self._hashes = hashes
+        self.load_count += 1
+        self.last_error = None
+
+    def get(self):
+        """Mengembalikan ModelBundle aktif, memuat ulang jika artefak berubah"""
+        stats = self._stat()
+        bundle = self._bundle
+        if bundle is not None and stats == self._stats:
+            return bundle
+
+        with self._lock:
+            # Sesi lain mungkin sudah memuat ulang saat menunggu lock
+            if self._bundle is not None and stats == self._stats:
+                return self._bundle
+            try:
+                self._load(stats)
+            except Exception as e:
+                # Hot-reload gagal: tetap layani artefak lama yang valid
+                if self._bundle is None:
+                    raise
+                self.last_error = e
+                self._stats = stats
+            return self._bundle
+
+
+_registry = ModelRegistry()
+
+
+def get_models():
+    """Akses registry global (dipakai bersama semua sesi dalam satu proses)"""
+    return _registry.get()
+
+
+def warm_up():
+    """Memuat dan memvalidasi artefak sebelum request pertama"""
+    return _registry.get()
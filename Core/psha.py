@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+from scipy.special import ndtr
+
+from Core.dtypes import float64_values
+from Core.gmpe import BA08, BA08_SIGMA
+from Core.seismicity import calculate_bvalue
+from Core.sites import candidate_pairs, event_mask
+from Core.spatial_index import SpatialIndex
+
+
+# Level PGA (g) untuk kurva hazard
+PGA_LEVELS = np.logspace(-3, 0.5, 60)
+
+# Lebar bin magnitudo dan jarak untuk integrasi hazard
+MAG_BIN = 0.1
+DIST_BIN_KM = 2.0
+
+# Probabilitas terlampaui dalam periode ulang desain (tahun)
+INVESTIGATION_YEARS = 50
+DESIGN_POE = {'PGA_10pct_50th': 0.10, 'PGA_2pct_50th': 0.02}
+
+# Pemotongan distribusi epsilon (jumlah sigma)
+DEFAULT_TRUNCATION = 3.0
+
+
+def magnitude_rates(a, b, m_min, m_max, duration_years, bin_width=MAG_BIN):
+    """
+    Laju tahunan kejadian per bin magnitudo dari Gutenberg-Richter terpotong.
+    a adalah log10 jumlah kumulatif di katalog, sehingga dibagi durasi katalog.
+    Mengembalikan (magnitudo tengah bin, laju tahunan per bin).
+    """
+    edges = np.arange(m_min, m_max + bin_width / 2, bin_width)
+    if edges.shape[0] < 2:
+        edges = np.array([m_min, m_min + bin_width])
+    cumulative = 10.0 ** (a - b * edges) / duration_years
+    rates = cumulative[:-1] - cumulative[1:]
+    return (edges[:-1] + edges[1:]) / 2, rates
+
+
+def exceedance_given_mr(mags, dists, vs30, levels=PGA_LEVELS, sigma=BA08_SIGMA,
+                        truncation=DEFAULT_TRUNCATION):
+    """
+    P(PGA > x | m, r) berbentuk (n_mag, n_dist, n_level) dari median BA08
+    dan sigma lognormal, dengan epsilon dipotong pada `truncation` sigma.
+    """
+    ln_median = np.log(BA08(mags[:, None], dists[None, :], vs30))
+    z = (np.log(levels)[None, None, :] - ln_median[:, :, None]) / sigma
+    prob = ndtr(-z)
+    if truncation:
+        tail = ndtr(-truncation)
+        prob = np.clip((prob - tail) / (1.0 - tail), 0.0, 1.0)
+    return prob
+
+
+def distance_weights(spatial_index, site_lat, site_lon, valid, max_distance_km=200.0,
+                     bin_km=DIST_BIN_KM):
+    """
+    Fraksi event katalog (valid) per bin jarak untuk setiap lokasi, (n_sites, n_dist).
+    Sebaran episenter katalog dipakai sebagai model sumber spasial.
+    """
+    n_bins = int(np.ceil(max_distance_km / bin_km))
+    ev_idx, site_idx, dist = candidate_pairs(spatial_index, site_lat, site_lon,
+                                             max_distance_km, event_mask=valid)
+    dist_bin = np.minimum((dist / bin_km).astype(np.int64), n_bins - 1)
+    counts = np.bincount(site_idx * n_bins + dist_bin, minlength=len(site_lat) * n_bins)
+    weights = counts.reshape(len(site_lat), n_bins) / max(int(valid.sum()), 1)
+    centers = (np.arange(n_bins) + 0.5) * bin_km
+    return centers, weights
+
+
+def design_pga(levels, curves, poe=0.10, years=INVESTIGATION_YEARS):
+    """
+    PGA dengan probabilitas terlampaui `poe` dalam `years` tahun (interpolasi log-log).
+    NaN jika laju target di luar rentang kurva: di atas laju level terendah, atau di
+    bawah laju positif terkecil (PGA desain melebihi level tertinggi PGA_LEVELS).
+    """
+    target = -np.log(1.0 - poe) / years
+    log_levels = np.log(levels)
+    result = np.full(curves.shape[0], np.nan)
+    for i, curve in enumerate(curves):
+        positive = curve > 0
+        if curve[0] < target or curve[positive].min() > target:
+            continue
+        # Kurva menurun terhadap level; np.interp butuh sumbu x menaik
+        x = np.log(curve[positive])[::-1]
+        y = log_levels[positive][::-1]
+        result[i] = np.exp(np.interp(np.log(target), x, y))
+    return result
+
+
+def hazard_curves(mag_centers, rates, dist_centers, weights, vs30, levels=PGA_LEVELS,
+                  sigma=BA08_SIGMA, truncation=DEFAULT_TRUNCATION):
+    """
+    Laju tahunan terlampaui (n_sites, n_level) untuk seluruh lokasi sekaligus:
+    kernel (jarak x level) = sum_m laju_m * P(PGA > x | m, r), lalu satu perkalian
+    matriks dengan bobot jarak per lokasi. VS30 boleh skalar atau per lokasi.
+    """
+    vs30 = np.broadcast_to(np.asarray(vs30, dtype=np.float64), (weights.shape[0],))
+    curves = np.empty((weights.shape[0], levels.shape[0]))
+    for value in np.unique(vs30):
+        rows = vs30 == value
+        prob = exceedance_given_mr(mag_centers, dist_centers, value, levels, sigma, truncation)
+        kernel = np.tensordot(rates, prob, axes=(0, 0))
+        curves[rows] = weights[rows] @ kernel
+    return curves
+
+
+class HazardResult:
+    """Hasil PSHA: parameter G-R, kurva hazard per lokasi dan PGA desain"""
+
+    def __init__(self, sites, levels, curves, a, b, r2, duration_years):
+        self.sites = sites
+        self.levels = levels
+        self.curves = curves
+        self.a, self.b, self.r2 = a, b, r2
+        self.duration_years = duration_years
+
+    @property
+    def nbytes(self):
+        return (int(self.sites.memory_usage(index=True, deep=True).sum())
+                + self.levels.nbytes + self.curves.nbytes)
+
+    def summary(self):
+        """Tabel PGA desain per lokasi (10% dan 2% dalam 50 tahun)"""
+        table = self.sites[['Lokasi', 'latitude', 'longitude']].copy()
+        for col, poe in DESIGN_POE.items():
+            table[col] = design_pga(self.levels, self.curves, poe)
+        return table
+
+    def curve_frame(self):
+        """Kurva hazard long-form: Lokasi, PGA_g, Laju_Tahunan"""
+        return pd.DataFrame({
+            'Lokasi': np.repeat(self.sites['Lokasi'].values, self.levels.shape[0]),
+            'PGA_g': np.tile(self.levels, self.curves.shape[0]),
+            'Laju_Tahunan': self.curves.ravel()
+        })
+
+
+def run_psha(df, mapped_columns, sites, duration_years, vs30=760.0, m_max=None,
+             spatial_index=None, max_distance_km=200.0, levels=PGA_LEVELS,
+             truncation=DEFAULT_TRUNCATION):
+    """
+    PSHA untuk seluruh lokasi target: a/b dari calculate_bvalue pada event valid
+    (M>=5, depth>0), laju G-R terpotong di [5.0, m_max], BA08 + sigma lognormal.
+    m_max default = magnitudo maksimum katalog.
+    """
+    if spatial_index is None:
+        spatial_index = SpatialIndex(df[mapped_columns['latitude']].values, df[mapped_columns['longitude']].values)
+
+    valid = event_mask(df, mapped_columns)
+    mags = float64_values(df, mapped_columns['magnitude'], valid)
+    if mags.shape[0] < 3:
+        raise ValueError("Data gempa valid terlalu sedikit untuk PSHA.")
+
+    b, a, r2 = calculate_bvalue(mags)
+    m_max = mags.max() if m_max is None else m_max
+    mag_centers, rates = magnitude_rates(a, b, 5.0, m_max, duration_years)
+
+    dist_centers, weights = distance_weights(
+        spatial_index, sites['latitude'].values, sites['longitude'].values, valid, max_distance_km
+    )
+    curves = hazard_curves(mag_centers, rates, dist_centers, weights, vs30, levels, truncation=truncation)
+    return HazardResult(sites, levels, curves, a, b, r2, duration_years)
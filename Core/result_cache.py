@@ -0,0 +1,104 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+# Batas memori cache hasil estimasi (byte)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def estimate_size(value):
+    """Perkiraan ukuran objek hasil di memori (byte)"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray) or hasattr(value, 'nbytes'):
+        # Array NumPy dan objek hasil ringkas (mis. ScenarioResult)
+        return int(value.nbytes)
+    if hasattr(value, 'to_plotly_json'):
+        # Figure plotly (tanpa nbytes): dihitung dari array trace dan layout-nya
+        return estimate_size(value.to_plotly_json())
+    if isinstance(value, dict):
+        return sum(estimate_size(v) for v in value.values()) + sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        return sum(estimate_size(v) for v in value) + sys.getsizeof(value)
+    return sys.getsizeof(value)
+
+
+class ResultCache:
+    """
+    Cache LRU hasil estimasi dalam proses (dipakai bersama semua sesi),
+    dibatasi total ukuran memori. Entri yang paling lama tidak dipakai dibuang
+    lebih dulu. Nilai yang disimpan diperlakukan read-only oleh pemanggil.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Nilai tersimpan untuk key (None jika tidak ada)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        """Menyimpan hasil; entri LRU dibuang sampai ukuran total muat di batas"""
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return False
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            while self._entries and self.current_bytes + size > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """Statistik cache: jumlah entri, ukuran, hit, miss, eviksi"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / total if total else 0.0
+            }
+
+
+_result_cache = ResultCache()
+
+
+def get_result_cache():
+    """Cache hasil estimasi global (satu per proses)"""
+    return _result_cache
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+
+# Tipe data nilai per skenario (PGA, VS30, statistik Monte Carlo)
+SCENARIO_DTYPE = np.float32
+
+
+def scenario_vs30(scenarios, n_events, vs30=None):
+    """
+    VS30 (float64) berbentuk (n_event, n_skenario): nilai VS30 data per event
+    jika tersedia (sama untuk setiap skenario), selain itu VS30 tiap kelas tanah.
+    """
+    shape = (n_events, len(scenarios))
+    if vs30 is not None:
+        return np.broadcast_to(np.asarray(vs30, dtype=np.float64)[:, None], shape)
+    return np.broadcast_to(np.array(list(scenarios.values()), dtype=np.float64)[None, :], shape)
+
+
+class ScenarioResult:
+    """
+    Hasil estimasi event x skenario tanah dalam bentuk ringkas: tabel event
+    disimpan sekali, nilai per skenario sebagai array float32 (n_event, n_skenario).
+    Bentuk panjang (satu baris per skenario x event, urutan per skenario) hanya
+    dibuat saat ditampilkan atau di-export.
+    """
+
+    def __init__(self, events, labels):
+        self.events = events.reset_index(drop=True)
+        self.labels = list(labels)
+        self.values = {}
+
+    @property
+    def n_events(self):
+        return len(self.events)
+
+    @property
+    def n_scenarios(self):
+        return len(self.labels)
+
+    def __len__(self):
+        return self.n_events * self.n_scenarios
+
+    @property
+    def columns(self):
+        """Kolom bentuk panjang: kolom event, Tipe_Tanah, lalu nilai per skenario"""
+        return list(self.events.columns) + ['Tipe_Tanah'] + list(self.values)
+
+    def __contains__(self, name):
+        return name in self.values or name in self.events.columns or name == 'Tipe_Tanah'
+
+    def __getitem__(self, name):
+        return self.values[name]
+
+    def __setitem__(self, name, values):
+        """Menyimpan nilai (n_event, n_skenario) atau bentuk panjang urutan per skenario"""
+        values = np.asarray(values)
+        shape = (self.n_events, self.n_scenarios)
+        if values.shape != shape:
+            values = values.reshape(shape[::-1]).T
+        self.values[name] = np.ascontiguousarray(values, dtype=SCENARIO_DTYPE)
+
+    @property
+    def nbytes(self):
+        return (int(self.events.memory_usage(index=True, deep=True).sum())
+                + sum(v.nbytes for v in self.values.values()))
+
+    def mask(self, soil=None, ranges=None):
+        """Mask (n_event, n_skenario) dari pilihan tipe tanah dan rentang kolom event {kolom: (min, max)}"""
+        mask = np.ones((self.n_events, self.n_scenarios), dtype=bool)
+        if soil is not None:
+            mask &= np.isin(self.labels, list(soil))[None, :]
+        for col, (low, high) in (ranges or {}).items():
+            values = self.events[col].to_numpy()
+            mask &= ((values >= low) & (values <= high))[:, None]
+        return mask
+
+    def take(self, rows, columns=None):
+        """Bentuk panjang untuk posisi baris tertentu (urutan per skenario)"""
+        columns = self.columns if columns is None else list(columns)
+        rows = np.asarray(rows, dtype=np.int64)
+        ev, sc = rows % self.n_events, rows // self.n_events
+
+        event_cols = [c for c in columns if c in self.events.columns]
+        frame = self.events[event_cols].take(ev).reset_index(drop=True)
+        for col in columns:
+            if col == 'Tipe_Tanah':
+                frame[col] = pd.Categorical.from_codes(sc, categories=self.labels)
+            elif col in self.values:
+                frame[col] = self.values[col][ev, sc]
+        return frame[columns]
+
+    def to_frame(self, columns=None, mask=None):
+        """DataFrame bentuk panjang (seluruh skenario atau yang lolos mask)"""
+        if mask is None:
+            rows = np.arange(len(self))
+        else:
+            rows = np.flatnonzero(mask.T)
+        return self.take(rows, columns)
+
+    def max_by_scenario(self, columns):
+        """Nilai maksimum tiap kolom per tipe tanah"""
+        frame = pd.DataFrame({col: self.values[col].max(axis=0) for col in columns}, index=self.labels)
+        frame.index.name = 'Tipe_Tanah'
+        return frame
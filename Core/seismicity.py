@@ -0,0 +1,114 @@
+import numpy as np
+from scipy import stats
+
+
+# Jumlah resampling bootstrap dan tingkat kepercayaan default (%)
+DEFAULT_BOOTSTRAP = 1000
+DEFAULT_CONFIDENCE = 95.0
+
+# Batas nilai magnitudo unik untuk bootstrap langsung via multinomial; di atasnya
+# (magnitudo kontinu) magnitudo dikelompokkan ke bin selebar bin_width lebih dulu
+MAX_UNIQUE_MULTINOMIAL = 5000
+
+# Toleransi (dalam satuan bin) untuk menganggap magnitudo sudah dibulatkan ke
+# kelipatan bin_width; cukup longgar untuk galat pembulatan float32
+BIN_TOLERANCE = 1e-3
+
+
+def cumulative_counts(magnitudes, mag_bins):
+    """Jumlah event dengan M >= setiap batas bin (satu kali sort + searchsorted)"""
+    sorted_mags = np.sort(np.asarray(magnitudes, dtype=np.float64))
+    return sorted_mags.shape[0] - np.searchsorted(sorted_mags, mag_bins, side='left')
+
+
+def calculate_bvalue(magnitudes, bin_width=0.1):
+    """Menghitung parameter Gutenberg-Richter (a, b, R2) dengan regresi kuadrat terkecil"""
+    magnitudes = np.asarray(magnitudes, dtype=np.float64)
+    mag_bins = np.arange(magnitudes.min(), magnitudes.max() + bin_width, bin_width)
+    cumulative_N = cumulative_counts(magnitudes, mag_bins)
+
+    valid_idx = cumulative_N > 0
+    log_N = np.log10(cumulative_N[valid_idx])
+    M_valid = mag_bins[valid_idx]
+
+    slope, intercept, r_value, _, _ = stats.linregress(M_valid, log_N)
+    return -slope, intercept, r_value**2
+
+
+def reporting_bin_width(magnitudes, bin_width=0.1):
+    """
+    Lebar bin pelaporan katalog: bin_width bila seluruh magnitudo merupakan
+    kelipatan bin_width, 0 bila magnitudo kontinu (tanpa koreksi Utsu).
+    """
+    steps = np.asarray(magnitudes, dtype=np.float64) / bin_width
+    on_grid = np.abs(steps - np.round(steps)).max() <= BIN_TOLERANCE
+    return bin_width if on_grid else 0.0
+
+
+def _mle_from_mean(mean_mag, mc, bin_width):
+    """b-value Aki/Utsu dari rata-rata magnitudo (koreksi setengah lebar bin)"""
+    return np.log10(np.e) / (mean_mag - (mc - bin_width / 2))
+
+
+def bvalue_mle(magnitudes, mc=None, bin_width=0.1):
+    """
+    b-value maximum likelihood Aki (1965) / Utsu (1966) untuk M >= mc
+    (mc default = magnitudo minimum). Koreksi setengah bin hanya dipakai bila
+    magnitudo dibulatkan ke bin_width. Mengembalikan (b, a).
+    """
+    magnitudes = np.asarray(magnitudes, dtype=np.float64)
+    mc = magnitudes.min() if mc is None else mc
+    above = magnitudes[magnitudes >= mc]
+    b = _mle_from_mean(above.mean(), mc, reporting_bin_width(above, bin_width))
+    a = np.log10(above.shape[0]) + b * mc
+    return b, a
+
+
+def _bootstrap_means(magnitudes, n_boot, rng, bin_width=0.1):
+    """
+    Rata-rata magnitudo tiap sampel bootstrap (n_boot,). Resampling setara dengan
+    multinomial atas nilai unik. Magnitudo kontinu (> MAX_UNIQUE_MULTINOMIAL nilai
+    unik) dikelompokkan per bin_width dengan nilai wakil = rata-rata bin, sehingga
+    rata-rata bootstrap tetap berpusat pada rata-rata data; variasi di dalam bin
+    (<= bin_width^2 / 12) diabaikan, interval sedikit menyempit (~0.2% untuk b ~ 1).
+    """
+    n = magnitudes.shape[0]
+    values, counts = np.unique(magnitudes, return_counts=True)
+    if values.shape[0] > MAX_UNIQUE_MULTINOMIAL:
+        bins = np.floor((magnitudes - magnitudes.min()) / bin_width).astype(np.int64)
+        counts = np.bincount(bins)
+        sums = np.bincount(bins, weights=magnitudes)
+        filled = counts > 0
+        counts, values = counts[filled], sums[filled] / counts[filled]
+
+    draws = rng.multinomial(n, counts / n, size=n_boot)
+    return draws @ values / n
+
+
+def bootstrap_bvalue(magnitudes, mc=None, bin_width=0.1, n_boot=DEFAULT_BOOTSTRAP,
+                     confidence=DEFAULT_CONFIDENCE, seed=None):
+    """
+    Interval kepercayaan bootstrap b-value MLE: (b_bawah, b_atas, simpangan baku).
+    Seluruh sampel bootstrap dihitung dalam satu batch vektor.
+    """
+    magnitudes = np.asarray(magnitudes, dtype=np.float64)
+    mc = magnitudes.min() if mc is None else mc
+    above = magnitudes[magnitudes >= mc]
+
+    rng = np.random.default_rng(seed)
+    b_boot = _mle_from_mean(_bootstrap_means(above, n_boot, rng, bin_width), mc,
+                            reporting_bin_width(above, bin_width))
+    alpha = (100.0 - confidence) / 2
+    low, high = np.percentile(b_boot, [alpha, 100.0 - alpha])
+    return low, high, b_boot.std(ddof=1)
+
+
+def seismicity_summary(magnitudes, seed=0):
+    """
+    Ringkasan statistik seismisitas (dict, bisa disimpan bersama hasil estimasi):
+    regresi G-R (b, a, R2), b-value MLE Aki/Utsu dan IK bootstrap-nya.
+    """
+    b, a, r2 = calculate_bvalue(magnitudes)
+    b_mle, _ = bvalue_mle(magnitudes)
+    b_low, b_high, _ = bootstrap_bvalue(magnitudes, seed=seed)
+    return {'b': b, 'a': a, 'r2': r2, 'b_mle': b_mle, 'b_low': b_low, 'b_high': b_high}
@@ -0,0 +1,190 @@
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from uuid import uuid4
+
+from Core.result_cache import estimate_size
+
+
+# Batas memori objek besar per sesi (MB, bisa diganti lewat environment variable)
+SESSION_BUDGET_BYTES = int(float(os.environ.get('QUAKEACEH_SESSION_MB', 256)) * 1024 * 1024)
+
+# Direktori file spill hasil yang dikeluarkan dari memori
+SPILL_DIR = os.environ.get(
+    'QUAKEACEH_SPILL_DIR',
+    os.path.join(tempfile.gettempdir(), 'quakeaceh_spill')
+)
+
+# Sesi yang tidak diakses selama ini dianggap berakhir dan dibersihkan (detik)
+SESSION_IDLE_SECONDS = 2 * 60 * 60
+
+
+class SessionStore:
+    """
+    Penyimpanan objek besar satu sesi (hasil estimasi, figure, raster) dengan
+    batas memori. Jika total melebihi max_bytes, entri yang paling lama tidak
+    dipakai ditulis ke disk (pickle) dan dimuat kembali saat diakses.
+    """
+
+    def __init__(self, session_id, max_bytes=SESSION_BUDGET_BYTES, spill_dir=SPILL_DIR):
+        self.session_id = session_id
+        self.max_bytes = max_bytes
+        self.spill_dir = os.path.join(spill_dir, session_id)
+        self._memory = OrderedDict()
+        self._spilled = {}
+        self._lock = threading.RLock()
+        self.last_access = time.time()
+        self.spills = 0
+        self.loads = 0
+
+    def __contains__(self, name):
+        return name in self._memory or name in self._spilled
+
+    def __getitem__(self, name):
+        if name not in self:
+            raise KeyError(name)
+        return self.get(name)
+
+    def __setitem__(self, name, value):
+        with self._lock:
+            self.pop(name)
+            self._memory[name] = (value, estimate_size(value))
+            self._enforce(keep=name)
+
+    def __delitem__(self, name):
+        if name not in self:
+            raise KeyError(name)
+        self.pop(name)
+
+    @property
+    def memory_bytes(self):
+        return sum(size for _, size in self._memory.values())
+
+    @property
+    def disk_bytes(self):
+        return sum(size for _, size in self._spilled.values())
+
+    def get(self, name, default=None):
+        """Nilai entri; entri yang sudah di-spill dimuat kembali ke memori"""
+        with self._lock:
+            self.last_access = time.time()
+            if name in self._memory:
+                self._memory.move_to_end(name)
+                return self._memory[name][0]
+            if name not in self._spilled:
+                return default
+
+            path, size = self._spilled.pop(name)
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+            os.remove(path)
+            self.loads += 1
+            self._memory[name] = (value, size)
+            self._enforce(keep=name)
+            return value
+
+    def pop(self, name, default=None):
+        """Menghapus entri (termasuk file spill) dan mengembalikan nilainya jika masih di memori"""
+        with self._lock:
+            entry = self._memory.pop(name, None)
+            spilled = self._spilled.pop(name, None)
+            if spilled is not None:
+                try:
+                    os.remove(spilled[0])
+                except OSError:
+                    pass
+            return default if entry is None else entry[0]
+
+    def _spill(self, name):
+        value, size = self._memory[name]
+        os.makedirs(self.spill_dir, exist_ok=True)
+        path = os.path.join(self.spill_dir, f'{uuid4().hex}.pkl')
+        try:
+            with open(path, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # Objek tidak bisa di-pickle atau disk penuh: tetap di memori
+            if os.path.exists(path):
+                os.remove(path)
+            return False
+        del self._memory[name]
+        self._spilled[name] = (path, size)
+        self.spills += 1
+        return True
+
+    def _enforce(self, keep=None):
+        """Spill entri LRU sampai total memori muat di batas (entri `keep` tidak di-spill)"""
+        failed = set()
+        while self.memory_bytes > self.max_bytes:
+            candidates = [n for n in self._memory if n != keep and n not in failed]
+            if not candidates:
+                break
+            if not self._spill(candidates[0]):
+                failed.add(candidates[0])
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._spilled.clear()
+            shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+    def stats(self):
+        """Ringkasan pemakaian memori sesi"""
+        with self._lock:
+            return {
+                'session': self.session_id,
+                'entries': len(self._memory) + len(self._spilled),
+                'memory_bytes': self.memory_bytes,
+                'disk_bytes': self.disk_bytes,
+                'max_bytes': self.max_bytes,
+                'spills': self.spills,
+                'loads': self.loads,
+                'idle_seconds': time.time() - self.last_access,
+                'items': {name: size for name, (_, size) in self._memory.items()}
+            }
+
+
+class SessionMemory:
+    """Registry SessionStore semua sesi dalam proses"""
+
+    def __init__(self, max_bytes=SESSION_BUDGET_BYTES, spill_dir=SPILL_DIR):
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self._stores = {}
+        self._lock = threading.Lock()
+
+    def store(self, session_id):
+        """SessionStore untuk satu sesi (dibuat jika belum ada)"""
+        with self._lock:
+            store = self._stores.get(session_id)
+            if store is None:
+                store = SessionStore(session_id, self.max_bytes, self.spill_dir)
+                self._stores[session_id] = store
+            return store
+
+    def collect(self, idle_seconds=SESSION_IDLE_SECONDS):
+        """Membersihkan sesi yang tidak aktif lebih dari idle_seconds"""
+        now = time.time()
+        with self._lock:
+            stale = [sid for sid, s in self._stores.items() if now - s.last_access > idle_seconds]
+            for sid in stale:
+                self._stores.pop(sid).clear()
+        return len(stale)
+
+    def report(self):
+        """Statistik memori per sesi, terurut dari pemakaian terbesar"""
+        with self._lock:
+            stores = list(self._stores.values())
+        return sorted((s.stats() for s in stores), key=lambda r: r['memory_bytes'], reverse=True)
+
+
+_session_memory = SessionMemory()
+
+
+def get_session_memory():
+    """Registry memori sesi global (satu per proses)"""
+    return _session_memory
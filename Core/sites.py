@@ -0,0 +1,225 @@
+import numpy as np
+import pandas as pd
+
+from Core.dtypes import float64_values
+from Core.features import FeatureTransformer, classify_vs30_codes, predict_soil_scenarios
+from Core.gmpe import BA08, TANAH_MAPPING
+from Core.model_registry import MLP_FEATURES_ORDER
+from Core.spatial_index import SpatialIndex
+
+
+# Variasi nama kolom pada tabel lokasi target
+SITE_COLUMN_ALIASES = {
+    'name': ['name', 'nama', 'lokasi', 'site', 'kota'],
+    'latitude': ['latitude', 'lat', 'lintang', 'y'],
+    'longitude': ['longitude', 'lon', 'long', 'bujur', 'x']
+}
+
+HYBRID_KEYS = ['magnitude', 'depth', 'latitude', 'longitude',
+               'nst', 'gap', 'rms', 'magnst', 'deptherror']
+
+# Jumlah pasangan (event, lokasi) per batch prediksi MLP
+MLP_BATCH_PAIRS = 50000
+
+
+def prepare_sites(df_sites):
+    """
+    Normalisasi tabel lokasi target menjadi kolom Lokasi, latitude, longitude.
+    Baris dengan koordinat kosong/tidak valid dibuang.
+    """
+    actual_columns = {str(col).lower(): col for col in df_sites.columns}
+    mapped = {}
+    for key, aliases in SITE_COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in actual_columns:
+                mapped[key] = actual_columns[alias]
+                break
+
+    if 'latitude' not in mapped or 'longitude' not in mapped:
+        raise ValueError("Tabel lokasi harus memiliki kolom latitude dan longitude.")
+
+    sites = pd.DataFrame({
+        'Lokasi': (df_sites[mapped['name']].astype(str) if 'name' in mapped
+                   else [f"Lokasi {i + 1}" for i in range(len(df_sites))]),
+        'latitude': pd.to_numeric(df_sites[mapped['latitude']], errors='coerce'),
+        'longitude': pd.to_numeric(df_sites[mapped['longitude']], errors='coerce')
+    })
+    valid = sites['latitude'].between(-90, 90) & sites['longitude'].between(-180, 180)
+    sites = sites[valid].reset_index(drop=True)
+
+    # Nama lokasi ganda diberi nomor agar ringkasan per lokasi tidak tergabung
+    dup_rank = sites.groupby('Lokasi').cumcount()
+    sites.loc[dup_rank > 0, 'Lokasi'] = sites['Lokasi'] + ' #' + (dup_rank + 1).astype(str)
+    return sites
+
+
+def candidate_pairs(spatial_index, site_lat, site_lon, max_distance_km=200.0, event_mask=None):
+    """
+    Mencari pasangan (event, lokasi) dengan jarak <= max_distance_km.
+    Indeks spasial menyaring event di luar bounding box sebelum jarak eksak.
+    """
+    ev_parts, site_parts, dist_parts = [], [], []
+    for site, (lat, lon) in enumerate(zip(site_lat, site_lon)):
+        idx, dist = spatial_index.query_radius(lat, lon, max_distance_km)
+        if event_mask is not None:
+            keep = event_mask[idx]
+            idx, dist = idx[keep], dist[keep]
+        ev_parts.append(idx)
+        site_parts.append(np.full(idx.shape[0], site, dtype=np.int64))
+        dist_parts.append(dist)
+
+    if not ev_parts:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, np.empty(0)
+
+    # Hasil sudah terurut per lokasi sehingga statistik per lokasi bisa diambil dengan slicing
+    return np.concatenate(ev_parts), np.concatenate(site_parts), np.concatenate(dist_parts)
+
+
+def event_mask(df, mapped_columns):
+    """Kriteria validitas event (sama dengan estimasi satu lokasi, tanpa jarak)"""
+    # Perbandingan langsung pada array kolom (tanpa upcast seluruh kolom)
+    mag = df[mapped_columns['magnitude']].to_numpy()
+    dep = df[mapped_columns['depth']].to_numpy()
+    mask = (mag >= 5.0) & (dep > 0)
+    if 'vs30' in mapped_columns:
+        vs30_data = df[mapped_columns['vs30']].to_numpy()
+        mask &= (vs30_data >= 180) & (vs30_data <= 1300)
+    return mask
+
+
+def find_pairs(df, mapped_columns, sites, spatial_index=None, max_distance_km=200.0):
+    """Pasangan (event, lokasi) valid untuk satu DataFrame/chunk katalog"""
+    if spatial_index is None:
+        spatial_index = SpatialIndex(df[mapped_columns['latitude']].values, df[mapped_columns['longitude']].values)
+    return candidate_pairs(
+        spatial_index, sites['latitude'].values, sites['longitude'].values,
+        max_distance_km=max_distance_km, event_mask=event_mask(df, mapped_columns)
+    )
+
+
+def estimate_pairs(df, mapped_columns, sites, models=None, spatial_index=None,
+                   max_distance_km=200.0, site_bounds=None):
+    """
+    Detail PGA (long-form) untuk setiap event x lokasi x kelas tanah.
+
+    `site_bounds` (list batas outlier per lokasi) dipakai saat katalog diproses
+    per chunk; jika None, batas IQR dihitung dari `df` itu sendiri.
+    """
+    ev_idx, site_idx, rjb = find_pairs(df, mapped_columns, sites, spatial_index, max_distance_km)
+
+    # VS30 per pasangan x tanah: dari data (sama untuk seluruh skenario) atau nilai SNI
+    labels = list(TANAH_MAPPING.keys())
+    if 'vs30' in mapped_columns:
+        vs30_data = float64_values(df, mapped_columns['vs30'], ev_idx)
+        vs30 = np.repeat(vs30_data[:, None], len(labels), axis=1)
+    else:
+        vs30 = np.broadcast_to(np.array(list(TANAH_MAPPING.values()), dtype=np.float64),
+                               (ev_idx.shape[0], len(labels)))
+
+    M = float64_values(df, mapped_columns['magnitude'], ev_idx)
+    pga_gmpe = BA08(M[:, None], rjb[:, None], vs30)
+
+    is_hybrid = models is not None and all(k in mapped_columns for k in HYBRID_KEYS)
+    pga_mlp = None
+    if is_hybrid:
+        # Matriks fitur per pasangan; batas outlier IQR dihitung per lokasi target
+        transformer = FeatureTransformer(mapped_columns)
+        base = np.empty((ev_idx.shape[0], len(MLP_FEATURES_ORDER)), dtype=np.float64)
+        bounds = np.searchsorted(site_idx, np.arange(len(sites) + 1))
+        for site in range(len(sites)):
+            lo, hi = bounds[site], bounds[site + 1]
+            if lo == hi:
+                continue
+            if site_bounds is None:
+                transformer.fit(df, rows=ev_idx[lo:hi])
+            else:
+                transformer.bounds_ = site_bounds[site]
+            transformer.transform(df, rows=ev_idx[lo:hi], out=base[lo:hi])
+
+        soil_codes = classify_vs30_codes(vs30)
+        pga_mlp = np.empty_like(pga_gmpe)
+        for start in range(0, ev_idx.shape[0], MLP_BATCH_PAIRS):
+            stop = start + MLP_BATCH_PAIRS
+            pga_mlp[start:stop] = predict_soil_scenarios(models.engine, transformer, base[start:stop],
+                                                          soil_codes[start:stop])
+
+    # Detail (long-form): satu baris per event x lokasi x tanah
+    n_pairs, n_soil = ev_idx.shape[0], len(labels)
+    detail_cols = [mapped_columns[k] for k in ['magnitude', 'depth', 'latitude', 'longitude']]
+    detail = df[detail_cols].iloc[np.repeat(ev_idx, n_soil)].reset_index(drop=True)
+    detail.insert(0, 'Tipe_Tanah', np.tile(labels, n_pairs))
+    detail.insert(0, 'Lokasi', sites['Lokasi'].to_numpy()[np.repeat(site_idx, n_soil)])
+    detail['RJB_km'] = np.repeat(rjb, n_soil)
+    detail['Vs30_m_s'] = vs30.reshape(-1)
+    detail['PGA_GMPE'] = pga_gmpe.reshape(-1)
+    if pga_mlp is not None:
+        detail['PGA_MLP'] = pga_mlp.reshape(-1)
+    return detail
+
+
+class SiteSummary:
+    """
+    Ringkasan per lokasi x tanah yang bisa diakumulasi per chunk
+    (jumlah, RJB minimum, PGA maksimum dan rata-rata).
+    """
+
+    def __init__(self, sites):
+        self.sites = sites
+        self._parts = []
+
+    def update(self, detail):
+        if detail.empty:
+            return
+        agg = {
+            'Jumlah_Event': ('PGA_GMPE', 'size'),
+            'RJB_Min_km': ('RJB_km', 'min'),
+            'PGA_GMPE_Maks': ('PGA_GMPE', 'max'),
+            'PGA_GMPE_Sum': ('PGA_GMPE', 'sum')
+        }
+        if 'PGA_MLP' in detail.columns:
+            agg['PGA_MLP_Maks'] = ('PGA_MLP', 'max')
+            agg['PGA_MLP_Sum'] = ('PGA_MLP', 'sum')
+        self._parts.append(detail.groupby(['Lokasi', 'Tipe_Tanah'], sort=False).agg(**agg).reset_index())
+
+    def result(self):
+        labels = list(TANAH_MAPPING.keys())
+        n_soil = len(labels)
+        summary = pd.DataFrame({
+            'Lokasi': np.repeat(self.sites['Lokasi'].to_numpy(), n_soil),
+            'Latitude': np.repeat(self.sites['latitude'].to_numpy(), n_soil),
+            'Longitude': np.repeat(self.sites['longitude'].to_numpy(), n_soil),
+            'Tipe_Tanah': np.tile(labels, len(self.sites))
+        })
+        if not self._parts:
+            summary['Jumlah_Event'] = 0
+            return summary
+
+        parts = pd.concat(self._parts, ignore_index=True)
+        combine = {col: ('sum' if col.endswith('_Sum') or col == 'Jumlah_Event'
+                         else 'min' if col.endswith('_Min_km') else 'max')
+                   for col in parts.columns if col not in ('Lokasi', 'Tipe_Tanah')}
+        totals = parts.groupby(['Lokasi', 'Tipe_Tanah'], sort=False).agg(combine).reset_index()
+
+        # Rata-rata dihitung dari total akumulasi
+        for method in ['GMPE', 'MLP']:
+            if f'PGA_{method}_Sum' in totals.columns:
+                mean = totals.pop(f'PGA_{method}_Sum') / totals['Jumlah_Event']
+                totals.insert(totals.columns.get_loc(f'PGA_{method}_Maks') + 1, f'PGA_{method}_Rata', mean)
+
+        summary = summary.merge(totals, on=['Lokasi', 'Tipe_Tanah'], how='left')
+        summary['Jumlah_Event'] = summary['Jumlah_Event'].fillna(0).astype(int)
+        return summary
+
+
+def estimate_sites(df, mapped_columns, sites, models=None, spatial_index=None, max_distance_km=200.0):
+    """
+    Estimasi PGA GMPE (dan MLP jika fitur lengkap) untuk setiap
+    event x lokasi x kelas tanah dalam satu proses broadcast.
+
+    Mengembalikan (ringkasan per lokasi, detail per event-lokasi-tanah).
+    """
+    detail = estimate_pairs(df, mapped_columns, sites, models, spatial_index, max_distance_km)
+    summary = SiteSummary(sites)
+    summary.update(detail)
+    return summary.result(), detail
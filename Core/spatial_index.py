@@ -0,0 +1,112 @@
+import numpy as np
+
+from Core.geodesy import EARTH_RADIUS_KM, EventVectors
+from Core.result_cache import ResultCache
+
+
+# Ukuran sel grid (derajat); 1 derajat ~ 111 km
+DEFAULT_CELL_DEG = 1.0
+
+KM_PER_DEG = np.pi * EARTH_RADIUS_KM / 180.0
+
+# Batas memori indeks yang dipakai bersama antar sesi (byte)
+INDEX_CACHE_BYTES = 512 * 1024 * 1024
+
+
+def bounding_box(lat, lon, radius_km):
+    """
+    Bounding box (lat_min, lat_max, lon_min, lon_max) yang pasti memuat
+    lingkaran berjari-jari radius_km. lon_min > lon_max berarti melewati 180°.
+    """
+    dlat = radius_km / KM_PER_DEG
+    lat_min, lat_max = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+
+    # Dekat kutub seluruh bujur harus diperiksa
+    max_abs_lat = max(abs(lat_min), abs(lat_max))
+    if max_abs_lat >= 89.9:
+        return lat_min, lat_max, -180.0, 180.0
+    dlon = dlat / np.cos(np.radians(max_abs_lat))
+    if dlon >= 180.0:
+        return lat_min, lat_max, -180.0, 180.0
+
+    lon_min = (lon - dlon + 180.0) % 360.0 - 180.0
+    lon_max = (lon + dlon + 180.0) % 360.0 - 180.0
+    return lat_min, lat_max, lon_min, lon_max
+
+
+class SpatialIndex:
+    """
+    Indeks grid lat/lon per dataset: event dikelompokkan per sel (CSR),
+    query radius hanya menghitung jarak eksak untuk event di sel yang
+    beririsan dengan bounding box target.
+    """
+
+    def __init__(self, lat, lon, cell_deg=DEFAULT_CELL_DEG):
+        # Array kolom dipakai apa adanya (float32 tidak disalin); vektor satuan selalu float64
+        self.lat = np.asarray(lat)
+        self.lon = np.asarray(lon)
+        self.vectors = EventVectors(self.lat, self.lon)
+        self.cell_deg = cell_deg
+        self.n_rows = int(np.ceil(180.0 / cell_deg)) + 1
+        self.n_cols = int(np.ceil(360.0 / cell_deg))
+
+        cell_ids = self._cell_ids(self.lat, self.lon)
+        self.order = np.argsort(cell_ids, kind='stable')
+        self.sorted_ids = cell_ids[self.order]
+
+    def __len__(self):
+        return self.lat.shape[0]
+
+    @property
+    def nbytes(self):
+        """Ukuran array indeks di memori (byte)"""
+        return (self.lat.nbytes + self.lon.nbytes + self.vectors.vectors.nbytes
+                + self.order.nbytes + self.sorted_ids.nbytes)
+
+    def _rows(self, lat):
+        return np.clip(np.floor((lat + 90.0) / self.cell_deg), 0, self.n_rows - 1).astype(np.int64)
+
+    def _cols(self, lon):
+        return np.clip(np.floor(((lon + 180.0) % 360.0) / self.cell_deg), 0, self.n_cols - 1).astype(np.int64)
+
+    def _cell_ids(self, lat, lon):
+        return self._rows(lat) * self.n_cols + self._cols(lon)
+
+    def candidates(self, lat, lon, radius_km):
+        """Indeks event (terurut) di dalam sel yang beririsan dengan bounding box"""
+        lat_min, lat_max, lon_min, lon_max = bounding_box(lat, lon, radius_km)
+        rows = np.arange(self._rows(lat_min), self._rows(lat_max) + 1)
+
+        if lon_min == -180.0 and lon_max == 180.0:
+            col_ranges = [(0, self.n_cols - 1)]
+        else:
+            c0, c1 = int(self._cols(lon_min)), int(self._cols(lon_max))
+            col_ranges = [(c0, c1)] if c0 <= c1 else [(c0, self.n_cols - 1), (0, c1)]
+
+        parts = []
+        for c0, c1 in col_ranges:
+            starts = np.searchsorted(self.sorted_ids, rows * self.n_cols + c0, side='left')
+            stops = np.searchsorted(self.sorted_ids, rows * self.n_cols + c1, side='right')
+            parts.extend(self.order[start:stop] for start, stop in zip(starts, stops) if start < stop)
+
+        if not parts:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(parts))
+
+    def query_radius(self, lat, lon, radius_km):
+        """
+        Event dalam radius_km dari titik target.
+        Mengembalikan (indeks event terurut, jarak km).
+        """
+        idx = self.candidates(lat, lon, radius_km)
+        dist = self.vectors.distance_to(lat, lon, rows=idx)
+        within = dist <= radius_km
+        return idx[within], dist[within]
+
+
+_index_cache = ResultCache(max_bytes=INDEX_CACHE_BYTES)
+
+
+def get_index_cache():
+    """Cache indeks spasial per dataset (satu per proses, dipakai bersama semua sesi)"""
+    return _index_cache
@@ -0,0 +1,200 @@
+import numpy as np
+import pandas as pd
+
+
+# Batas lokasi error yang disimpan (memori tetap kecil berapa pun ukuran file)
+MAX_MISSING_ROWS = 20
+MAX_TYPE_EXAMPLES = 5
+
+
+def convert_numeric(values):
+    """
+    Konversi satu kolom ke float64 sekaligus mask nilai kosong dan nilai bukan angka.
+    Kolom yang sudah numerik tidak di-parse ulang.
+    Mengembalikan (array float64, mask kosong, mask bukan angka).
+    """
+    if isinstance(values, pd.Series):
+        dtype = values.dtype
+        if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype):
+            converted = values.to_numpy(dtype=np.float64, na_value=np.nan)
+            missing = np.isnan(converted)
+            return converted, missing, np.zeros_like(missing)
+        missing = values.isna().to_numpy()
+        converted = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    else:
+        missing = pd.isna(values)
+        converted = np.asarray(pd.to_numeric(values, errors='coerce'), dtype=np.float64)
+    invalid = np.isnan(converted)
+    invalid &= ~missing
+    return converted, missing, invalid
+
+
+class ColumnStats:
+    """Statistik satu kolom parameter yang diakumulasi per chunk (tanpa menyimpan data)"""
+
+    def __init__(self, name):
+        self.name = name
+        self.n_valid = 0
+        self.n_missing = 0
+        self.n_invalid = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._sum = 0.0
+        self._sumsq = 0.0
+
+    def update(self, converted, missing, invalid):
+        n_missing, n_invalid = int(np.count_nonzero(missing)), int(np.count_nonzero(invalid))
+        self.n_missing += n_missing
+        self.n_invalid += n_invalid
+        valid = converted[~np.isnan(converted)] if n_missing + n_invalid else converted
+        if valid.size:
+            self.n_valid += valid.size
+            self.min = min(self.min, float(valid.min()))
+            self.max = max(self.max, float(valid.max()))
+            self._sum += float(valid.sum())
+            self._sumsq += float(np.dot(valid, valid))
+
+    @property
+    def mean(self):
+        return self._sum / self.n_valid if self.n_valid else np.nan
+
+    @property
+    def std(self):
+        if self.n_valid < 2:
+            return np.nan
+        var = (self._sumsq - self._sum * self._sum / self.n_valid) / (self.n_valid - 1)
+        return float(np.sqrt(max(var, 0.0)))
+
+    def to_dict(self):
+        has_data = self.n_valid > 0
+        return {
+            'n_valid': self.n_valid,
+            'n_missing': self.n_missing,
+            'n_invalid': self.n_invalid,
+            'min': self.min if has_data else None,
+            'max': self.max if has_data else None,
+            'mean': self.mean if has_data else None,
+            'std': None if np.isnan(self.std) else self.std
+        }
+
+
+class ValidationReport:
+    """
+    Laporan validasi yang diakumulasi per chunk dalam satu lintasan: jumlah nilai
+    kosong per kolom, N baris kosong pertama, contoh nilai bukan angka dan
+    statistik per kolom parameter. Kolom parameter dikonversi sekali ke float64.
+    """
+
+    def __init__(self, max_missing_rows=MAX_MISSING_ROWS, max_type_examples=MAX_TYPE_EXAMPLES):
+        self.max_missing_rows = max_missing_rows
+        self.max_type_examples = max_type_examples
+        self.n_rows = 0
+        self.columns = []
+        self.missing_counts = {}
+        self.n_missing_rows = 0
+        self.missing_rows = []
+        self.numeric_cols = []
+        self.type_errors = {}
+        self.column_stats = {}
+        self.preview = None
+        self.dtypes = {}
+
+    @property
+    def has_missing(self):
+        return self.n_missing_rows > 0
+
+    @property
+    def has_type_errors(self):
+        return len(self.type_errors) > 0
+
+    @property
+    def is_valid(self):
+        return not (self.has_missing or self.has_type_errors)
+
+    def update(self, chunk, numeric_cols):
+        """
+        Memeriksa satu chunk dan mengembalikan {kolom parameter: array float64}
+        hasil konversi (dipakai langsung tanpa konversi ulang).
+        """
+        if not self.columns:
+            self.columns = list(chunk.columns)
+            self.numeric_cols = list(numeric_cols)
+            self.column_stats = {col: ColumnStats(col) for col in self.numeric_cols}
+
+        n = len(chunk)
+        row_has_null = np.zeros(n, dtype=bool)
+        converted_cols = {}
+        for col in self.columns:
+            if col in self.column_stats:
+                converted, missing, invalid = convert_numeric(chunk[col])
+                converted_cols[col] = converted
+                self.column_stats[col].update(converted, missing, invalid)
+                if invalid.any():
+                    self._record_type_errors(col, chunk[col], invalid)
+            else:
+                missing = chunk[col].isna().to_numpy()
+
+            count = int(np.count_nonzero(missing))
+            if count:
+                self.missing_counts[col] = self.missing_counts.get(col, 0) + count
+                row_has_null |= missing
+
+        # Cek Data Hilang (nomor baris 1-based terhadap seluruh file)
+        n_null_rows = int(np.count_nonzero(row_has_null))
+        if n_null_rows:
+            self.n_missing_rows += n_null_rows
+            room = self.max_missing_rows - len(self.missing_rows)
+            if room > 0:
+                self.missing_rows.extend((np.flatnonzero(row_has_null)[:room] + self.n_rows + 1).tolist())
+
+        self.n_rows += n
+        return converted_cols
+
+    def _record_type_errors(self, col, values, invalid):
+        """Cek Tipe Data (nilai ada tetapi bukan angka): jumlah dan N contoh pertama"""
+        entry = self.type_errors.setdefault(col, {'count': 0, 'rows': [], 'values': []})
+        entry['count'] += int(np.count_nonzero(invalid))
+        room = self.max_type_examples - len(entry['rows'])
+        if room > 0:
+            positions = np.flatnonzero(invalid)[:room]
+            entry['rows'].extend((positions + self.n_rows + 1).tolist())
+            entry['values'].extend(values.iloc[positions].tolist())
+
+    def missing_summary(self):
+        """Ringkasan kolom kosong (urutan kolom sesuai dataset)"""
+        counts = {col: self.missing_counts[col] for col in self.columns if col in self.missing_counts}
+        return pd.Series(counts, name="Jumlah Kosong", dtype='int64')
+
+    def type_error_table(self):
+        """Tabel kesalahan tipe data: Kolom, Baris, Nilai Salah (urutan kolom parameter)"""
+        return pd.DataFrame([
+            {"Kolom": col, "Baris": self.type_errors[col]['rows'], "Nilai Salah": self.type_errors[col]['values']}
+            for col in self.numeric_cols if col in self.type_errors
+        ])
+
+    def stats(self):
+        """Statistik per kolom parameter (dict JSON-able, bisa disimpan di metadata katalog)"""
+        return {col: self.column_stats[col].to_dict() for col in self.numeric_cols}
+
+    def to_dict(self):
+        """Ringkasan terstruktur seluruh hasil validasi"""
+        return {
+            'n_rows': self.n_rows,
+            'is_valid': self.is_valid,
+            'n_missing_rows': self.n_missing_rows,
+            'missing_rows': list(self.missing_rows),
+            'missing_counts': self.missing_summary().to_dict(),
+            'type_errors': {col: dict(entry) for col, entry in self.type_errors.items()},
+            'column_stats': self.stats()
+        }
+
+
+def stats_table(stats):
+    """Tabel statistik kolom parameter untuk ditampilkan"""
+    return pd.DataFrame([
+        {
+            "Kolom": col, "Terisi": s['n_valid'], "Kosong": s['n_missing'], "Bukan Angka": s['n_invalid'],
+            "Min": s['min'], "Maks": s['max'], "Rata-rata": s['mean'], "Std": s['std']
+        }
+        for col, s in stats.items()
+    ])
@@ -1,6 +1,9 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
+
+from Core.columns import COLUMN_ALIASES
+from Core.ingest import excel_sheet_names, ingest, is_streaming_excel
+from Core.validation import stats_table
+from Core.catalog_cache import content_key, get_cache
 
 
 def show():   
@@ -51,61 +54,70 @@ def show():
 
     if uploaded_file is not None:
         try:
-            if uploaded_file.name.endswith('.csv'):
-                df = pd.read_csv(uploaded_file)
-            elif uploaded_file.name.endswith(('.xlsx', '.xls')):
-                df = pd.read_excel(uploaded_file)
+            # Hash isi file (sekali per upload); file identik langsung memakai cache katalog
+            file_id = getattr(uploaded_file, 'file_id', uploaded_file.name)
+            upload_key = st.session_state.get('upload_key')
+            if upload_key is None or upload_key[0] != file_id:
+                upload_key = (file_id, content_key(uploaded_file.getvalue()))
+                st.session_state['upload_key'] = upload_key
+
+            # Pilihan sheet untuk workbook Excel (daftar sheet disimpan per upload)
+            sheet_name, catalog_key = None, upload_key[1]
+            if is_streaming_excel(uploaded_file):
+                if st.session_state.get('upload_sheets', (None,))[0] != file_id:
+                    st.session_state['upload_sheets'] = (file_id, excel_sheet_names(uploaded_file))
+                sheet_names = st.session_state['upload_sheets'][1]
+                if len(sheet_names) > 1:
+                    sheet_name = st.selectbox("Pilih sheet:", sheet_names, key='upload_sheet')
+                    sheet_index = sheet_names.index(sheet_name)
+                    if sheet_index > 0:
+                        catalog_key = f"{upload_key[1]}_{sheet_index}"
+
+            catalog_cache = get_cache()
+            handle = catalog_cache.get(catalog_key)
+
+            if handle is None:
+                # Baca dan validasi per chunk (satu lintasan, memori terbatas)
+                progress_bar = st.progress(0.0, text="Membaca file...")
+
+                def show_progress(fraction, n_rows):
+                    progress_bar.progress(fraction if fraction is not None else 0.0,
+                                          text=f"Membaca file... {n_rows:,} baris")
+
+                df, mapped_columns, report = ingest(uploaded_file, sheet_name=sheet_name, progress=show_progress)
+                progress_bar.empty()
+            else:
+                # Katalog sudah tervalidasi sebelumnya
+                mapped_columns, report = handle.mapped_columns, None
             
             st.success(f"File **{uploaded_file.name}** berhasil diupload!")
             st.markdown("---")
             
-            # Mendefinisikan variasi nama yang mungkin diinput user
-            column_aliases = {
-                'magnitude': ['magnitude', 'mag', 'm', 'mw', 'mag_mw'],
-                'vs30': ['vs30', 'v_s30', 's-wave_velocity'],
-                'depth': ['depth', 'kedalaman', 'd', 'dep'],
-                'latitude': ['latitude', 'lat', 'lintang', 'y'],
-                'longitude': ['longitude', 'lon', 'long', 'bujur', 'x'],
-                'nst': ['nst', 'number_of_stations', 'stn_count'],
-                'magnst': ['magnst', 'mag_nst'],
-                'gap': ['gap', 'azimuthal_gap'],
-                'rms': ['rms', 'root_mean_square'],
-                'deptherror': ['deptherror', 'depth_error', 'err_depth']
-            }
-
-            # Pengecekan kolom
-            actual_columns = {col.lower(): col for col in df.columns}
-            mapped_columns = {}
-            for key, aliases in column_aliases.items():
-                for alias in aliases:
-                    if alias in actual_columns:
-                        mapped_columns[key] = actual_columns[alias]
-                        break
+            # Alias nama kolom didefinisikan di Core.columns
+            column_aliases = COLUMN_ALIASES
 
             # Pemilihan Metode
             st.markdown("### Validasi Kualitas Data")
 
 
             # Cek Data Hilang
-            if df.isnull().values.any():
+            if report is not None and report.has_missing:
                 st.error("### 🛑 Ditemukan Data Hilang (Missing Values)")
-                nan_details = df.isnull().sum()
-                nan_cols = nan_details[nan_details > 0]
+                nan_cols = report.missing_summary()
 
-                # Baris yang mengandung NA
-                rows_with_nan = df[df.isnull().any(axis=1)].index.tolist()
-                rows_display = [r + 1 for r in rows_with_nan]
+                # Baris yang mengandung NA (hanya N lokasi pertama yang disimpan)
+                rows_display = report.missing_rows
                 
                 col_err1, col_err2 = st.columns([1, 2])
                 
                 with col_err1:
                     st.write("**Ringkasan Kolom Kosong:**")
-                    st.dataframe(nan_cols.rename("Jumlah Kosong"), use_container_width=True)
+                    st.dataframe(nan_cols, use_container_width=True)
                 
                 with col_err2:
                     st.write("**Lokasi Baris:**")
                     baris_teks = ", ".join(map(str, rows_display[:20]))
-                    if len(rows_display) > 20:
+                    if report.n_missing_rows > 20:
                         baris_teks += " ... dan seterusnya."
                     
                     st.warning(f"Data kosong ditemukan pada baris: \n\n `{baris_teks}`")
@@ -114,31 +126,29 @@ def show():
                 st.stop()
             
             # Cek Tipe Data 
-            cols_to_check = [v for k, v in mapped_columns.items()]
-            error_log = []
-            for col in cols_to_check:
-                converted = pd.to_numeric(df[col], errors='coerce')
-                if converted.isnull().any():
-                    invalid_rows = df[converted.isnull()].index.tolist()
-                    invalid_values = df.loc[converted.isnull(), col].tolist()
-                    error_log.append({
-                        "Kolom": col, 
-                        "Baris": [r + 1 for r in invalid_rows[:5]], 
-                        "Nilai Salah": invalid_values[:5]
-                    })
-
-            if error_log:
+            if report is not None and report.has_type_errors:
                 st.error("### ❌ Kesalahan Tipe Data (Bukan Angka)")
-                st.dataframe(pd.DataFrame(error_log), use_container_width=True, hide_index=True)
+                st.dataframe(report.type_error_table(), use_container_width=True, hide_index=True)
                 st.info("💡 **Saran:** Pastikan semua kolom parameter berisi angka numerik.")
                 st.stop()
 
 
             st.success("✅ Data Valid")
 
+            # Simpan kolom numerik (sudah dikonversi saat validasi) ke cache kolumnar
+            # (memory-mapped, dipakai bersama antar sesi)
+            if handle is None:
+                handle = catalog_cache.put(catalog_key, df, mapped_columns, uploaded_file.name,
+                                           preview=report.preview, column_stats=report.stats())
+                del df
 
-            for col in cols_to_check:
-                df[col] = pd.to_numeric(df[col])
+            # Statistik kolom parameter dari lintasan validasi (tanpa membaca ulang data)
+            if handle.column_stats:
+                with st.expander(f"Statistik Kolom Parameter ({handle.n_rows:,} baris)"):
+                    st.dataframe(stats_table(handle.column_stats), use_container_width=True, hide_index=True)
+                    catalog = handle.frame()
+                    st.caption("Tipe data tersimpan: " + ", ".join(f"{col} ({dtype})" for col, dtype in catalog.dtypes.items())
+                               + f" | {catalog.memory_usage(index=False).sum() / 1e6:.1f} MB")
 
 
             # Analisis Kesiapan Metode
@@ -177,11 +187,12 @@ def show():
             # Preview & Button
             st.markdown("---")
             st.markdown("### Preview Dataset")
-            st.dataframe(df.head(10), use_container_width=True)
+            st.dataframe(handle.preview(), use_container_width=True)
 
             if is_gmpe_ready:
                 if st.button("Lanjut ke Estimasi PGA", type="primary", use_container_width=True):
-                    st.session_state['uploaded_data'] = df
+                    # Sesi hanya menyimpan handle ke katalog di cache
+                    st.session_state['uploaded_data'] = handle
                     st.session_state['mapped_columns'] = mapped_columns 
                     st.session_state.page = 'Estimasi PGA'
                     st.rerun()
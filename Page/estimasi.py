@@ -1,14 +1,54 @@
 import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
 import plotly.express as px
 from datetime import datetime
-from scipy import stats
-import joblib
-import time
-from io import BytesIO
+from uuid import uuid4
 from sklearn.metrics import mean_squared_error, mean_absolute_error
+from Core.model_registry import get_models
+from Core.spatial_index import SpatialIndex, get_index_cache
+from Core.gmpe import BA08_PERIODS, BA08_SIGMA, BA08_spectrum, TANAH_MAPPING
+from Core.gmpe_models import GMPE_REGISTRY, evaluate_gmpes, logic_tree_mean
+from Core.features import FeatureTransformer, classify_vs30_codes, predict_soil_scenarios
+from Core.dtypes import float64_values
+from Core.scenarios import ScenarioResult, scenario_vs30
+from Core.sites import prepare_sites, estimate_sites
+from Core.seismicity import seismicity_summary
+from Core.psha import DESIGN_POE, run_psha
+from Core.uncertainty import monte_carlo_pga
+from Core.result_cache import get_result_cache
+from Core.aggregation import DENSITY_THRESHOLD, WEBGL_THRESHOLD, density_grid, stratified_sample
+from Core.hazard_grid import ACEH_EXTENT, estimate_raster, grid_bounds, raster_to_png
+from Core.export import EXCEL_MAX_ROWS, EXPORT_FORMATS, cached_export
+from Core.session_memory import get_session_memory
+
+
+def session_store():
+    """Penyimpanan objek besar sesi ini (dibatasi memori, entri lama di-spill ke disk)"""
+    session_memory = get_session_memory()
+    session_memory.collect()
+    ctx = get_script_run_ctx()
+    return session_memory.store(ctx.session_id if ctx is not None else 'local')
+
+
+def get_spatial_index(df, lat_col, lon_col):
+    """
+    Indeks spasial episenter, dibangun sekali per dataset. Dataset yang sama
+    (content key) memakai satu indeks bersama untuk semua sesi.
+    """
+    dataset_key = getattr(st.session_state['uploaded_data'], 'key', None)
+    index_key = ('spatial_index', dataset_key, lat_col, lon_col, len(df))
+    cache = get_index_cache() if dataset_key is not None else session_store()
+    spatial_index = cache.get(index_key)
+    if spatial_index is None:
+        spatial_index = SpatialIndex(df[lat_col].values, df[lon_col].values)
+        if dataset_key is not None:
+            cache.put(index_key, spatial_index)
+        else:
+            cache[index_key] = spatial_index
+    return spatial_index
 
 
 def show():
@@ -170,7 +210,8 @@ def show():
         st.stop()
     
     # Jika Data Sudah Di Upload
-    df = st.session_state['uploaded_data']  
+    # Handle katalog (memory-mapped, read-only); data disalin sebelum diubah
+    df = st.session_state['uploaded_data'].frame()
     mapped_columns = st.session_state.get('mapped_columns', {})  # Mapping nama kolom
     
    
@@ -254,18 +295,21 @@ def show():
 
         initial_rows = len(df)
         
-        # Filter data: Only keep rows within Boore-Atkinson 2008 valid range (180 - 1300 m/s)
-        df = df[(df[vs30_col] >= 180) & (df[vs30_col] <= 1300)].copy()
+        # Only keep rows within Boore-Atkinson 2008 valid range (180 - 1300 m/s).
+        # Hanya mask yang dihitung (katalog memory-mapped tidak disalin); seluruh jalur
+        # estimasi menerapkan batas VS30 yang sama pada baris yang dipilih
+        vs30_values = df[vs30_col].to_numpy()
+        vs30_valid = (vs30_values >= 180) & (vs30_values <= 1300)
         
-        final_rows = len(df)
+        final_rows = int(np.count_nonzero(vs30_valid))
         dropped_rows = initial_rows - final_rows
         
         if dropped_rows > 0:
             st.warning(f"⚠️ {dropped_rows} rows removed: VS30 values were outside BA08 valid range (180-1300 m/s).")
         
         # 
-        if not df.empty:
-            vs30_from_data = df[vs30_col].mean()
+        if final_rows > 0:
+            vs30_from_data = float(vs30_values.mean(where=vs30_valid, dtype=np.float64))
             st.success(f"✅ Using {final_rows} valid records (Mean VS30: {vs30_from_data:.1f} m/s)")
             
             st.session_state['run_mode'] = 'single'
@@ -297,6 +341,22 @@ def show():
     
     # LOKASI OBSERVASI 
     st.markdown("#### Lokasi Target Estimasi")
+
+    mode_lokasi = st.radio(
+        "Mode Lokasi Target:",
+        ["Satu Lokasi", "Banyak Lokasi (Upload Tabel)", "Peta Raster Wilayah (Grid)"],
+        horizontal=True,
+        help="Mode banyak lokasi menghitung seluruh kota/bangunan sekaligus dalam satu proses. "
+             "Mode raster menghitung PGA di setiap sel grid wilayah studi."
+    )
+
+    if mode_lokasi == "Banyak Lokasi (Upload Tabel)":
+        show_multi_site(df, mapped_columns)
+        st.stop()
+
+    if mode_lokasi == "Peta Raster Wilayah (Grid)":
+        show_hazard_raster(df, mapped_columns, is_hybrid_ready)
+        st.stop()
     
     st.info("""
     Masukkan koordinat lokasi yang ingin Anda analisis (Lokasi Proyek/Kota). 
@@ -319,89 +379,50 @@ def show():
             min_value=95.0, max_value=141.0, value=110.0, format="%.4f",
             help="Contoh: 95.3238 (Banda Aceh)"
         )
+
+    max_distance_km = st.number_input(
+        "📏 Radius Maksimum Gempa (km):",
+        min_value=10.0, max_value=200.0, value=200.0, step=10.0,
+        help="Hanya gempa dalam radius ini dari lokasi target yang dihitung (BA08 valid hingga 200 km)."
+    )
     
-    # Mulai Estimasi
-    model_mlp = joblib.load('model_pga_mlp.pkl')
-    scaler_x = joblib.load('scaler_x.pkl')
-    scaler_y = joblib.load('scaler_y.pkl')
-
-    def haversine(lat1, lon1, lat2, lon2):
-            """Menghitung jarak episentral (km) antara dua koordinat"""
-            R = 6371  
-            lat1, lon1, lat2, lon2 = map(np.radians, [lat1, lon1, lat2, lon2])
-            dlat, dlon = lat2 - lat1, lon2 - lon1
-            a = np.sin(dlat / 2)**2 + np.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2)**2
-            return 2 * R * np.arcsin(np.sqrt(a))
-
-    def calculate_bvalue(magnitudes, bin_width=0.1):
-            """Menghitung parameter Gutenberg-Richter (a, b, R2)"""
-            mag_bins = np.arange(magnitudes.min(), magnitudes.max() + bin_width, bin_width)
-            cumulative_N = []
-            for M in mag_bins:
-                cumulative_N.append(np.sum(magnitudes >= M))
-            
-            valid_idx = np.array(cumulative_N) > 0
-            log_N = np.log10(np.array(cumulative_N)[valid_idx])
-            M_valid = mag_bins[valid_idx]
-            
-            slope, intercept, r_value, _, _ = stats.linregress(M_valid, log_N)
-            return -slope, intercept, r_value**2
-
-    def BA08(M, RJB, VS30=760):
-            """Estimasi PGA menggunakan model Boore-Atkinson (2008)"""
-            c = {'e1': -0.53804, 'e5': 0.28805, 'e6': -0.10164, 'e7': 0.0,
-                'c1': -0.66050, 'c2': 0.11970, 'c3': -0.01151, 'h': 1.35, 'blin': -0.360}
-            Mh, Mref, Rref, Vref = 6.75, 4.5, 1.0, 760.0
-            
-            # Komponen Magnitudo
-            FM = np.where(M <= Mh,
-                        c['e1'] + c['e5']*(M-Mh) + c['e6']*(M-Mh)**2,
-                        c['e1'] + c['e7']*(M-Mh))
-            
-            # Komponen Jarak
-            R_eff = np.sqrt(RJB**2 + c['h']**2)
-            FD = (c['c1'] + c['c2']*(M-Mref)) * np.log(R_eff/Rref) + c['c3']*(R_eff-Rref)
-            
-            # Komponen Situs
-            FS = c['blin'] * np.log(VS30/Vref)
-            
-            return np.exp(FM + FD + FS)
-    
-    def detect_outliers_iqr(df, columns):
-        """
-        Menambahkan kolom flag_outlier (1 jika outlier, 0 jika normal)
-        Berdasarkan metode IQR (Q1 - 1.5*IQR dan Q3 + 1.5*IQR)
-        """
-        new_df = df.copy()
-        for col in columns:
-            if col in new_df.columns:
-                Q1 = new_df[col].quantile(0.25)
-                Q3 = new_df[col].quantile(0.75)
-                IQR = Q3 - Q1
-                lower_bound = Q1 - 1.5 * IQR
-                upper_bound = Q3 + 1.5 * IQR
-                
-                new_df[f'flag_outlier_{col}'] = ((new_df[col] < lower_bound) | (new_df[col] > upper_bound)).astype(int)
-            else:
-                new_df[f'flag_outlier_{col}'] = 0
-        return new_df
-    
-    def classify_vs30(vs30_val):
-        """
-        Mengklasifikasikan nilai VS30 ke dalam kategori SNI 1726:2019
-        untuk diumpankan ke fitur One-Hot Encoding MLP (Soil_SA s/d Soil_SE)
-        """
-        if vs30_val >= 760:
-            return 'SA' if vs30_val >= 1300 else 'SB'
-        elif 360 <= vs30_val < 760:
-            return 'SC'
-        elif 180 <= vs30_val < 360:
-            return 'SD'
-        else:
-            return 'SE'
-    
+    # Model GMPE pembanding (subduksi) dan bobot logic tree
+    with st.expander("⚖️ Model GMPE Pembanding & Logic Tree"):
+        st.caption("BA08 selalu dihitung. Model tambahan dievaluasi dalam satu lintasan dengan suku jarak yang sama.")
+        extra_gmpes = st.multiselect(
+            "Model GMPE Tambahan:",
+            [name for name in GMPE_REGISTRY if name != 'BA08'],
+            format_func=lambda name: GMPE_REGISTRY[name].label
+        )
+        gmpe_weights = {}
+        if extra_gmpes:
+            weight_cols = st.columns(len(extra_gmpes) + 1)
+            for col, name in zip(weight_cols, ['BA08'] + extra_gmpes):
+                gmpe_weights[name] = col.number_input(
+                    f"Bobot {name}:", min_value=0.0, max_value=1.0,
+                    value=round(1.0 / (len(extra_gmpes) + 1), 2), step=0.05, key=f"bobot_{name}"
+                )
+
+    # Ketidakpastian aleatori BA08 (sampling epsilon)
+    with st.expander("🎲 Ketidakpastian Aleatori (Monte Carlo ε)"):
+        use_mc = st.checkbox("Hitung sebaran PGA dengan sampling ε (σ BA08)", value=False)
+        col_mc1, col_mc2, col_mc3 = st.columns(3)
+        mc_samples = col_mc1.selectbox("Jumlah Sampel:", [1000, 5000, 10000], index=0)
+        mc_threshold = col_mc2.number_input("Ambang PGA (g):", min_value=0.001, max_value=2.0, value=0.1,
+                                            step=0.01, format="%.3f")
+        mc_seed = col_mc3.number_input("Seed:", min_value=0, value=42, step=1)
+
+    # Mulai Estimasi (model dimuat sekali per proses oleh registry)
+    models = get_models()
+    model_mlp = models.model_mlp
+    mlp_engine = models.engine
+
     st.markdown("### Jalankan Estimasi")
     
+    cache_stats = get_result_cache().stats()
+    st.caption(f"Cache hasil: {cache_stats['entries']} entri, {cache_stats['hits']} hit / "
+               f"{cache_stats['misses']} miss ({cache_stats['bytes'] / 1e6:.1f} MB)")
+
     # Button untuk mulai kalkulasi
     if st.button("Mulai Estimasi PGA", type="primary", use_container_width=True):
 
@@ -409,464 +430,839 @@ def show():
             st.error("Mohon masukkan koordinat lokasi target Anda.")
             st.stop()
 
-        progress_bar = st.progress(0)
-        status_text = st.empty()
+        # Hasil untuk kombinasi (katalog, lokasi, mode VS30, parameter) yang sama diambil dari cache
+        result_cache = get_result_cache()
+        dataset_key = getattr(st.session_state['uploaded_data'], 'key', None)
+        result_key = None
+        cached = None
+        if dataset_key is not None:
+            result_key = (
+                dataset_key, round(target_latitude, 4), round(target_longitude, 4),
+                'data' if 'vs30' in mapped_columns else 'sni', float(max_distance_km),
+                tuple(extra_gmpes), tuple(sorted(gmpe_weights.items())),
+                (mc_samples, mc_threshold, int(mc_seed)) if use_mc else None,
+                models.fingerprint
+            )
+            cached = result_cache.get(result_key)
+
+        # Cache hit: hasil langsung ditampilkan pada run yang sama (tanpa rerun halaman)
+        if cached is not None:
+            data_final, st.session_state['is_hybrid_done'], seismicity = cached
+            session_store()['hasil_estimasi'] = data_final
+            session_store()['hasil_seismisitas'] = seismicity
+            st.session_state['hasil_token'] = result_key
+            st.session_state['is_gmpe_done'] = True
+        else:
+            progress_bar = st.progress(0)
+            status_text = st.empty()
         
-        # Mencari Jarak RJB
-        status_text.text("Menghitung jarak episenter...")
-        progress_bar.progress(10)  
-        df_calc = df.copy()
-
-        epi_lat_col = mapped_columns['latitude']
-        epi_lon_col = mapped_columns['longitude']
-        mag_col = mapped_columns['magnitude']
-        dep_col = mapped_columns['depth']
+            # Mencari Jarak RJB
+            status_text.text("Menghitung jarak episenter...")
+            progress_bar.progress(10)  
+            epi_lat_col = mapped_columns['latitude']
+            epi_lon_col = mapped_columns['longitude']
+            mag_col = mapped_columns['magnitude']
+            dep_col = mapped_columns['depth']
 
-        df_calc['RJB_km'] = df_calc.apply(
-            lambda row: haversine(row[epi_lat_col], row[epi_lon_col], target_latitude, target_longitude), 
-            axis=1
-        )
+            # Prefilter spasial (grid + bounding box): jarak eksak hanya untuk event kandidat
+            spatial_index = get_spatial_index(df, epi_lat_col, epi_lon_col)
+            cand_idx, cand_dist = spatial_index.query_radius(target_latitude, target_longitude, max_distance_km)
         
-        progress_bar.progress(20)  
+            progress_bar.progress(20)  
         
-        # Filtering Data VS30, depth dan mag
-        status_text.text("Melakukan filtering data...")
+            # Filtering Data VS30, depth dan mag (hanya kolom yang dibutuhkan, untuk event kandidat)
+            status_text.text("Melakukan filtering data...")
 
-        condition = (df_calc[mag_col] >= 5.0) & (df_calc[dep_col] > 0) & (df_calc['RJB_km'] <= 200)
+            mag = float64_values(df, mag_col, cand_idx)
+            depth = float64_values(df, dep_col, cand_idx)
+            condition = (mag >= 5.0) & (depth > 0) & (cand_dist <= max_distance_km)
         
-        # Filter VS30 jika kolomnya ada (BA08 Range: 180 - 1300)
-        if 'vs30' in mapped_columns:
-            vs30_col = mapped_columns['vs30']
-            condition &= (df_calc[vs30_col] >= 180) & (df_calc[vs30_col] <= 1300)
-            
-        data_clean = df_calc[condition].copy()
+            # Filter VS30 jika kolomnya ada (BA08 Range: 180 - 1300)
+            vs30 = None
+            if 'vs30' in mapped_columns:
+                vs30 = float64_values(df, mapped_columns['vs30'], cand_idx)
+                condition &= (vs30 >= 180) & (vs30 <= 1300)
+                vs30 = vs30[condition]
+            mag, depth, rjb = mag[condition], depth[condition], cand_dist[condition]
+
+            # Tabel event disimpan sekali (tidak diduplikasi per skenario tanah)
+            data_clean = df.iloc[cand_idx[condition]].reset_index(drop=True)
+            data_clean['RJB_km'] = rjb
         
-        if data_clean.empty:
-            st.error("❌ Tidak ada data yang memenuhi kriteria validitas (M>=5, Dist<=200km, VS30 180-1300).")
-            st.stop()
+            if data_clean.empty:
+                st.error(f"❌ Tidak ada data yang memenuhi kriteria validitas (M>=5, Dist<={max_distance_km:.0f}km, VS30 180-1300).")
+                st.stop()
 
-        progress_bar.progress(40)
+            progress_bar.progress(40)
        
      
-        # Analisis Gutenberg Ritcher Law
+            # Analisis Gutenberg Ritcher Law
        
-        status_text.text("📊 Menghitung parameter seismisitas (b-value)...")
+            status_text.text("📊 Menghitung parameter seismisitas (b-value)...")
         
-        if len(data_clean) > 2:
-            b, a, r2 = calculate_bvalue(data_clean[mag_col])
-            
-            # Menampilkan hasil GR Law di atas progress bar
-            st.subheader("📊 Hasil Analisis Statistik Seismisitas")
-            col_gr1, col_gr2, col_gr3 = st.columns(3)
-            col_gr1.metric("b-value", f"{b:.3f}")
-            col_gr2.metric("a-value", f"{a:.3f}")
-            col_gr3.metric("R²", f"{r2:.4f}")
-        else:
-            st.warning("Data setelah difilter terlalu sedikit untuk analisis b-value.")
+            # Ringkasan disimpan bersama hasil sehingga tampil sama saat hasil diambil dari cache
+            seismicity = seismicity_summary(mag) if len(data_clean) > 2 else None
             
-        progress_bar.progress(60)
-
+            progress_bar.progress(60)
 
-        # Metode GMPE 
-        status_text.text("🧬 Menghitung PGA GMPE...")
-        
-        tanah_mapping = {
-            'SA': 1300, 'SB': 760, 'SC': 520, 'SD': 250, 'SE': 180
-        }
 
-        final_scenario = []
-        for label, vs_val in tanah_mapping.items():
-            subset = data_clean.copy()
-            subset['Tipe_Tanah'] = label
-            if 'vs30' in mapped_columns:
-                subset['Vs30_m_s'] = subset[mapped_columns['vs30']]
-            else:
-                subset['Vs30_m_s'] = vs_val
-            # Hitung PGA menggunakan fungsi BA08
-            subset['PGA_GMPE'] = BA08(subset[mag_col], subset['RJB_km'], subset['Vs30_m_s'])
-            final_scenario.append(subset)
+            # Metode GMPE 
+            status_text.text("🧬 Menghitung PGA GMPE...")
         
-    
-        data_final = pd.concat(final_scenario, ignore_index=True)
+            # Hasil ringkas: array (event, skenario tanah) tanpa menyalin tabel event per skenario
+            data_final = ScenarioResult(data_clean, TANAH_MAPPING)
+            vs30_grid = scenario_vs30(TANAH_MAPPING, len(data_clean), vs30)
+            data_final['Vs30_m_s'] = vs30_grid
+
+            # Seluruh model GMPE dihitung sekaligus dari suku bersama (jarak, kedalaman, VS30)
+            gmpe_results = evaluate_gmpes(
+                ['BA08'] + extra_gmpes, mag[:, None], rjb[:, None], vs30_grid, depth[:, None]
+            )
+            data_final['PGA_GMPE'] = gmpe_results['BA08']
+            for name in extra_gmpes:
+                data_final[f'PGA_{name}'] = gmpe_results[name]
+            if extra_gmpes:
+                try:
+                    data_final['PGA_LOGIC_TREE'] = logic_tree_mean(gmpe_results, gmpe_weights)
+                except ValueError as e:
+                    st.warning(f"⚠️ {e}")
+
+            # Sampling epsilon: mean, P16/P50/P84 dan probabilitas terlampaui per skenario
+            if use_mc:
+                status_text.text("🎲 Sampling ketidakpastian aleatori (Monte Carlo)...")
+                # Urutan per skenario (sama dengan bentuk panjang) agar aliran acak tetap sama
+                df_mc = monte_carlo_pga(gmpe_results['BA08'].ravel(order='F'), BA08_SIGMA, n_samples=mc_samples,
+                                        thresholds=(mc_threshold,), seed=int(mc_seed))
+                for col in df_mc.columns:
+                    data_final[col] = df_mc[col].to_numpy()
         
-        progress_bar.progress(70)
-        status_text.text("✅ Estimasi Selesai!")
+            progress_bar.progress(70)
+            status_text.text("✅ Estimasi Selesai!")
 
-        st.markdown("### 📋 Dataset Hasil Estimasi (Multi-Skenario)")
-        st.dataframe(data_final)
         
 
-        # Estimasi GMPE + ML
+            # Estimasi GMPE + ML
 
-        if is_hybrid_ready and ('model_mlp' in globals() or 'model_mlp' in locals()):
+            if is_hybrid_ready and ('model_mlp' in globals() or 'model_mlp' in locals()):
             
-            # Kalkulasi Menggunakan neural Network
-            status_text.text("Menjalankan model Machine Learning (MLP)...")
-
-            nst_col = mapped_columns.get('nst')
-            gap_col = mapped_columns.get('gap')
-            rms_col = mapped_columns.get('rms')
-            magnst_col = mapped_columns.get('magnst')
-            deperr_col = mapped_columns.get('deptherror')
-            epi_lat_col = mapped_columns.get('latitude')
-            epi_lon_col = mapped_columns.get('longitude')
-            dep_col = mapped_columns.get('depth')
-
-            mlp_features_order = [
-                'latitude', 'longitude', 'depth', 'nst', 'gap', 'rms', 'magNst',
-                'Soil_SA', 'Soil_SB', 'Soil_SC', 'Soil_SD', 'Soil_SE',
-                'flag_missing_gap', 'flag_missing_rms', 'flag_missing_magNst', 
-                'flag_missing_depthError', 'flag_missing_nst',
-                'flag_outlier_gap', 'flag_outlier_rms', 'flag_outlier_magNst', 
-                'flag_outlier_depth', 'flag_outlier_depthError'
-            ]
-
-            hybrid_results = []
-            for label in tanah_mapping.keys():
-                subset = data_final[data_final['Tipe_Tanah'] == label].copy()
-                if subset.empty: continue
-
-                # Penentuan Tipe Tanah
-                for idx, row in subset.iterrows():
-                    # Tentukan kategori tanah berdasarkan VS30 asli
-                    target_class = classify_vs30(row['Vs30_m_s'])
-                    for s in tanah_mapping.keys():
-                        subset.loc[idx, f'Soil_{s}'] = 1 if target_class == s else 0
-
-                    rename_map = {
-                    epi_lat_col: 'latitude',
-                    epi_lon_col: 'longitude',
-                    dep_col: 'depth',
-                    nst_col: 'nst',
-                    gap_col: 'gap',
-                    rms_col: 'rms',
-                    magnst_col: 'magNst', 
-                    deperr_col: 'depthError' 
-                }
-                subset = subset.rename(columns=rename_map)
-
-                cols_to_flag = ['gap', 'rms', 'magNst', 'depthError', 'nst']
-
-                # Flag Missing & Outlier 
-                for m in cols_to_flag:
-                    subset[f'flag_missing_{m}'] = 0 
-
-                # Outlier Detection (IQR)
-                target_outliers = ['nst', 'gap', 'rms', 'magNst', 'depth', 'depthError']
-                for feat in target_outliers:
-                    Q1 = subset[feat].quantile(0.25)
-                    Q3 = subset[feat].quantile(0.75)
-                    IQR = Q3 - Q1
-                    subset[f'flag_outlier_{feat}'] = np.where(
-                        (subset[feat] < (Q1 - 1.5*IQR)) | (subset[feat] > (Q3 + 1.5*IQR)), 1, 0
-                    )
-                # Prediksi MLP
-                # Pastikan urutan mlp_features_order SAMA dengan saat training!
-                X_input = subset[mlp_features_order]
-                X_scaled = scaler_x.transform(X_input)
-                y_pred_scaled = model_mlp.predict(X_scaled)
-                pga_inv = scaler_y.inverse_transform(y_pred_scaled.reshape(-1, 1))
-                subset['PGA_MLP'] = np.maximum(pga_inv, 0.0001)
-                
-                hybrid_results.append(subset)
+                # Kalkulasi Menggunakan neural Network
+                status_text.text("Menjalankan model Machine Learning (MLP)...")
+
+                # Transformer fitur MLP (urutan fitur SAMA dengan saat training)
+                transformer = FeatureTransformer(mapped_columns)
+
+                # Setiap skenario tanah berisi event yang sama (data_clean): fitur event dan batas
+                # outlier IQR dihitung sekali, lalu seluruh skenario diprediksi dalam satu
+                # panggilan engine (NumPy, scaler terlebur) sebagai array (event, skenario)
+                X_base = transformer.fit_transform(data_clean)
+                data_final['PGA_MLP'] = predict_soil_scenarios(
+                    mlp_engine, transformer, X_base, classify_vs30_codes(vs30_grid)
+                )
 
-            data_final = pd.concat(hybrid_results, ignore_index=True)
-            progress_bar.progress(95)
-            status_text.text("✅ Estimasi Hybrid Selesai!")
+                progress_bar.progress(95)
+                status_text.text("✅ Estimasi Hybrid Selesai!")
             
         
-        else:
-            status_text.text("✅ Estimasi GMPE Selesai (Fitur Hybrid tidak lengkap)")
-            progress_bar.progress(100)
+            else:
+                status_text.text("✅ Estimasi GMPE Selesai (Fitur Hybrid tidak lengkap)")
+                progress_bar.progress(100)
                     
 
-        # Kalkulasi Selesai
-        status_text.text("✅ Kalkulasi selesai!")
-        progress_bar.progress(100)
+            # Kalkulasi Selesai
+            status_text.text("✅ Kalkulasi selesai!")
+            progress_bar.progress(100)
         
 
-        st.session_state['hasil_estimasi'] = data_final
-        st.session_state['is_gmpe_done'] = True
+            session_store()['hasil_estimasi'] = data_final
+            session_store()['hasil_seismisitas'] = seismicity
+            st.session_state['hasil_token'] = result_key if result_key is not None else uuid4().hex
+            st.session_state['is_gmpe_done'] = True
 
-        if 'PGA_MLP' in data_final.columns:
-            st.session_state['is_hybrid_done'] = True
-        else:
-            st.session_state['is_hybrid_done'] = False
-        
+            if 'PGA_MLP' in data_final:
+                st.session_state['is_hybrid_done'] = True
+            else:
+                st.session_state['is_hybrid_done'] = False
         
-        time.sleep(0.5)
+            if result_key is not None:
+                result_cache.put(result_key, (data_final, st.session_state['is_hybrid_done'], seismicity))
         
-        progress_bar.empty()
-        status_text.empty()
+            progress_bar.empty()
+            status_text.empty()
         
-        st.success("Estimasi PGA berhasil!")
-        st.rerun()
-
-        if st.session_state.get('is_gmpe_done'):
-            st.subheader("Visualisasi Hasil Estimasi")
-            df_hasil = st.session_state['hasil_estimasi']
-            
-            st.dataframe(df_hasil.head())
-            
-            if st.session_state.get('is_hybrid_done'):
-                st.info("💡 Data ini mencakup perbandingan metode Empiris (GMPE) dan Neural Network (MLP).")
+            st.success("Estimasi PGA berhasil!")
 
 
         # Hasil Estimasi
-    if 'hasil_estimasi' in st.session_state:
-        st.markdown("---")
-        st.header("Hasil Analisis Estimasi PGA")
-        
-        # Load hasil dari session state
-        df_result = st.session_state['hasil_estimasi']
-        
-        # Validasi Kolom
-        if 'PGA_GMPE' not in df_result.columns:
-            if 'PGA_g' in df_result.columns:
-                df_result = df_result.rename(columns={'PGA_g': 'PGA_GMPE'})
-            else:
-                st.error("Kolom 'PGA_GMPE' tidak ditemukan.")
-                st.stop()
+    if 'hasil_estimasi' in session_store():
+        show_results(mapped_columns, model_mlp)
+
+
+def build_scatter(df, x, y, color, title, large_mode=None):
+    """
+    Scatter dengan payload terbatas: SVG untuk data kecil, Scattergl untuk data
+    menengah, dan untuk data besar densitas 2D (agregasi NumPy) atau sampel
+    acak terstratifikasi per `color`.
+    """
+    n_points = len(df)
+    if n_points <= WEBGL_THRESHOLD:
+        return px.scatter(df, x=x, y=y, color=color, title=title)
+    if n_points <= DENSITY_THRESHOLD or large_mode == 'sample':
+        idx = stratified_sample(df[color].values)
+        return px.scatter(df.iloc[idx], x=x, y=y, color=color, render_mode='webgl',
+                          title=title if len(idx) == n_points else f"{title} (sampel {len(idx):,} dari {n_points:,})")
+
+    x_centers, y_centers, counts = density_grid(df[x].values, df[y].values)
+    with np.errstate(divide='ignore'):
+        z = np.where(counts > 0, np.log10(counts), np.nan)
+    fig = go.Figure(go.Heatmap(
+        x=x_centers, y=y_centers, z=z, colorscale='Viridis',
+        colorbar=dict(title="log10 jumlah"),
+        hovertemplate=f"{x}: %{{x:.3f}}<br>{y}: %{{y:.4f}}<br>log10 jumlah: %{{z:.2f}}<extra></extra>"
+    ))
+    fig.update_layout(title=f"{title} (densitas {n_points:,} titik)", xaxis_title=x, yaxis_title=y)
+    return fig
+
+
+def get_result_figures(result, mapped_columns, model_mlp, large_mode=None):
+    """
+    Figure hasil estimasi dibangun sekali per hasil dan di-cache di session state,
+    sehingga interaksi filter atau rerun halaman tidak membangun ulang peta/grafik.
+    """
+    store = session_store()
+    token = st.session_state.get('hasil_token')
+    cached = store.get('hasil_figures')
+    if cached is not None and cached[0] == token and cached[1] == large_mode:
+        return cached[2]
+
+    figures = {}
+    mag_col = mapped_columns['magnitude']
+    has_mlp = 'PGA_MLP' in result
+
+    # Bentuk panjang hanya untuk kolom yang diplot
+    df_result = result.to_frame([mag_col, 'RJB_km', 'Tipe_Tanah', 'PGA_GMPE'])
+
+    # Peta memakai sampel terstratifikasi per tipe tanah jika data sangat besar
+    map_cols = [mapped_columns['latitude'], mapped_columns['longitude'], mag_col, 'RJB_km', 'Tipe_Tanah',
+                'PGA_GMPE'] + (['PGA_MLP'] if has_mlp else [])
+    if len(result) > DENSITY_THRESHOLD:
+        df_map = result.take(stratified_sample(df_result['Tipe_Tanah'].cat.codes.values), map_cols)
+        figures['map_note'] = f"Peta menampilkan sampel {len(df_map):,} dari {len(result):,} skenario."
+    else:
+        df_map = result.to_frame(map_cols)
+
+    # Peta Sebaran PGA GMPE
+    figures['map_gmpe'] = px.scatter_mapbox(df_map, 
+                                lat=mapped_columns['latitude'], 
+                                lon=mapped_columns['longitude'],
+                                color='PGA_GMPE', size='PGA_GMPE',
+                                color_continuous_scale='Reds',
+                                hover_data=[mag_col, 'RJB_km', 'Tipe_Tanah'],
+                                zoom=4, center={"lat": -2.5, "lon": 118.0},
+                                mapbox_style="open-street-map",
+                                title="Intensitas PGA (GMPE) di Wilayah Target")
+
+    # Magnitude vs PGA dan Jarak (RJB) vs PGA
+    figures['mag'] = build_scatter(df_result, mag_col, 'PGA_GMPE', 'Tipe_Tanah',
+                                   "Magnitude vs PGA GMPE", large_mode)
+    figures['rjb'] = build_scatter(df_result, 'RJB_km', 'PGA_GMPE', 'Tipe_Tanah',
+                                   "Jarak (RJB) vs PGA GMPE", large_mode)
+
+    # Perbandingan model GMPE (jika model tambahan dipilih)
+    gmpe_cols = ['PGA_GMPE'] + [c for c in result.values
+                                if (c.startswith('PGA_') and c[4:] in GMPE_REGISTRY) or c == 'PGA_LOGIC_TREE']
+    if len(gmpe_cols) > 1:
+        df_models = pd.DataFrame({c: result[c].ravel() for c in gmpe_cols}).rename(columns={'PGA_GMPE': 'PGA_BA08'})
+        figures['models_table'] = df_models.describe().T[['mean', '50%', 'max']].rename(
+            columns={'mean': 'Rata-rata (g)', '50%': 'Median (g)', 'max': 'Maks (g)'}
+        )
+        figures['models'] = px.box(df_models.melt(var_name='Model', value_name='PGA_g'), x='Model', y='PGA_g',
+                                   log_y=True, title="Sebaran PGA per Model GMPE")
+
+    # Spektrum Respons (SA) seluruh periode BA08 dalam satu evaluasi
+    events = result.events
+    sa = BA08_spectrum(events[mag_col].to_numpy(dtype=np.float64)[:, None],
+                       events['RJB_km'].to_numpy()[:, None], result['Vs30_m_s'].astype(np.float64))
+    df_spectrum = pd.DataFrame(sa.max(axis=0), index=result.labels, columns=BA08_PERIODS)
+    df_spectrum_long = df_spectrum.drop(columns=0.0).reset_index(names='Tipe_Tanah').melt(
+        id_vars='Tipe_Tanah', var_name='Periode_s', value_name='SA_g'
+    )
+    figures['spectrum_table'] = df_spectrum.rename(columns=lambda p: f"{p:g}")
+    figures['spectrum'] = px.line(df_spectrum_long, x='Periode_s', y='SA_g', color='Tipe_Tanah', log_x=True,
+                                  markers=True, labels={'Periode_s': 'Periode (s)', 'SA_g': 'SA (g)'},
+                                  title="Spektrum Respons Maksimum (BA08)")
+
+    if has_mlp:
+        # Peta Sebaran PGA ML
+        figures['map_mlp'] = px.scatter_mapbox(df_map, 
+                                    lat=mapped_columns['latitude'], 
+                                    lon=mapped_columns['longitude'],
+                                    color='PGA_MLP', size='PGA_MLP',
+                                    color_continuous_scale='Bluered', 
+                                    hover_data=[mag_col, 'RJB_km', 'Tipe_Tanah'],
+                                    zoom=4, center={"lat": -2.5, "lon": 118.0},
+                                    mapbox_style="open-street-map",
+                                    title="Intensitas PGA (MLP) di Wilayah Target")
+
+        # Feature Importance
+        try:
+            weights = np.abs(model_mlp.coefs_[0]).sum(axis=1)
+
+            feature_names = [
+                'Latitude', 'Longitude', 'Depth', 'Nst', 'Gap', 'RMS', 'MagNst',
+                'Soil_SA', 'Soil_SB', 'Soil_SC', 'Soil_SD', 'Soil_SE',
+                'F_Miss_Gap', 'F_Miss_RMS', 'F_Miss_MagNst', 'F_Miss_DErr', 'F_Miss_Nst',
+                'F_Out_Gap', 'F_Out_RMS', 'F_Out_MagNst', 'F_Out_Dep', 'F_Out_DErr'
+            ]
+            df_imp = pd.DataFrame({'Fitur': feature_names, 'Importance': weights}).sort_values(by='Importance', ascending=True)
+            
+            figures['importance'] = px.bar(df_imp.tail(12), x='Importance', y='Fitur', orientation='h',
+                            title="Top 12 Fitur Paling Berpengaruh",
+                            color='Importance', color_continuous_scale='Viridis')
+        except Exception as e:
+            figures['importance_error'] = str(e)
+
+    store['hasil_figures'] = (token, large_mode, figures)
+    return figures
 
-        is_hybrid_done = st.session_state.get('is_hybrid_done', False)
-        
-        # --- BAGIAN RINGKASAN PGA MAKSIMUM (PERBAIKAN ERROR) ---
-        st.markdown("### 🚨 Skenario PGA Maksimum")
-        
-        # Hitung nilai maksimum global
-        val_max_gmpe = df_result['PGA_GMPE'].max()
-        
-        # Buat kolom tampilan dengan nama unik (m_col) agar tidak bentrok
-        m_col1, m_col2 = st.columns(2)
 
-        with m_col1:
-            st.metric("PGA GMPE Tertinggi", f"{val_max_gmpe:.4f} g")
+def show_results(mapped_columns, model_mlp):
+    """Bagian hasil estimasi: ringkasan, tabel terfilter (fragment) dan visualisasi"""
+    st.markdown("---")
+    st.header("Hasil Analisis Estimasi PGA")
     
-        with m_col2:
-            if is_hybrid_done:
-                val_max_mlp = df_result['PGA_MLP'].max()
-                
-                # Menghitung selisih (delta) antara MLP dan GMPE
-                diff_max = val_max_mlp - val_max_gmpe
-                
-                st.metric(
-                    label="PGA MLP Tertinggi", 
-                    value=f"{val_max_mlp:.4f} g", 
-                    delta=f"{diff_max:.4f} g",
-                    delta_color="normal" 
-                )
-            else:
-                st.info("💡 Jalankan Estimasi MLP untuk melihat perbandingan nilai maksimum.")
+    # Load hasil dari session state (ScenarioResult: array event x skenario tanah)
+    result = session_store()['hasil_estimasi']
+    
+    # Validasi Kolom
+    if 'PGA_GMPE' not in result:
+        st.error("Kolom 'PGA_GMPE' tidak ditemukan.")
+        st.stop()
 
-        # --- FILTER DATASET ---
-        st.markdown("---")
-        st.markdown("### Dataset Hasil Estimasi")
-        
-        f_col1, f_col2 = st.columns(2)
-        with f_col1:
-            soil_options = df_result['Tipe_Tanah'].unique().tolist()
-            selected_soil = st.multiselect("Pilih Tipe Tanah:", soil_options, default=soil_options)
-        with f_col2:
-            mag_col = mapped_columns['magnitude']
-            mag_min, mag_max = float(df_result[mag_col].min()), float(df_result[mag_col].max())
-            selected_mag = st.slider("Filter Rentang Magnitude:", mag_min, mag_max, (mag_min, mag_max))
-
-        # Terapkan Filter
-        df_filtered = df_result[
-            (df_result['Tipe_Tanah'].isin(selected_soil)) &
-            (df_result[mag_col].between(selected_mag[0], selected_mag[1]))
-        ].copy()
-
-        # Kolom yang ditampilkan di tabel
-        display_cols = ['Tipe_Tanah', mag_col, mapped_columns['depth'], 'RJB_km', 'PGA_GMPE']
-        if is_hybrid_done: display_cols.append('PGA_MLP')
-        
-        rename_map = {
-            mag_col: 'Magnitude', 
-            mapped_columns['depth']: 'Kedalaman (km)', 
-            'RJB_km': 'Jarak JB (km)', 
-            'PGA_GMPE': 'PGA GMPE (g)', 
-            'PGA_MLP': 'PGA MLP (g)'
-        }
-        
-        st.dataframe(df_filtered[display_cols].rename(columns=rename_map), use_container_width=True, height=400)
-        st.caption(f"Menampilkan {len(df_filtered)} skenario hasil filter.")
+    is_hybrid_done = st.session_state.get('is_hybrid_done', False)
+
+    if 'hasil_seismisitas' in session_store():
+        show_seismicity(session_store()['hasil_seismisitas'])
+    
+    # --- BAGIAN RINGKASAN PGA MAKSIMUM (PERBAIKAN ERROR) ---
+    st.markdown("### 🚨 Skenario PGA Maksimum")
+    
+    # Hitung nilai maksimum global
+    val_max_gmpe = float(result['PGA_GMPE'].max())
+    
+    # Buat kolom tampilan dengan nama unik (m_col) agar tidak bentrok
+    m_col1, m_col2 = st.columns(2)
 
+    with m_col1:
+        st.metric("PGA GMPE Tertinggi", f"{val_max_gmpe:.4f} g")
 
-        # RMSE dan MAE data User
+    with m_col2:
         if is_hybrid_done:
-            st.markdown("---")
-            st.subheader("Validasi Akurasi Untuk GMPE + Neural Network (MLP)")
-            st.write("Statistik ini mengukur seberapa presisi Neural Network dan GMPE dalam melakukan estimasi PGA:")
-
-            
+            val_max_mlp = float(result['PGA_MLP'].max())
             
-            y_true = df_filtered['PGA_GMPE']
-            y_pred = df_filtered['PGA_MLP']
+            # Menghitung selisih (delta) antara MLP dan GMPE
+            diff_max = val_max_mlp - val_max_gmpe
             
-            # Menghitung Metrik Absolut
-            user_rmse = np.sqrt(mean_squared_error(y_true, y_pred))
-            user_mae = mean_absolute_error(y_true, y_pred)
-            avg_corr = (y_pred - y_true).abs().mean()
+            st.metric(
+                label="PGA MLP Tertinggi", 
+                value=f"{val_max_mlp:.4f} g", 
+                delta=f"{diff_max:.4f} g",
+                delta_color="normal" 
+            )
+        else:
+            st.info("💡 Jalankan Estimasi MLP untuk melihat perbandingan nilai maksimum.")
+
+    # Filter, tabel, metrik dan export dirender ulang sendiri saat filter berubah
+    show_filtered_results(result, mapped_columns, is_hybrid_done)
 
-            u_col1, u_col2 = st.columns(2)
-            with u_col1:
-                st.metric("MAE (Rata-rata Error)", f"{user_mae:.5f} g")
-                st.caption("Semakin kecil MAE, semakin dekat MLP dengan GMPE.")
-            with u_col2:
-                st.metric("RMSE (Deviasi Error)", f"{user_rmse:.5f} g")
-                st.caption("Mengukur penyebaran error prediksi.")
+    st.markdown("---")
+    st.markdown("### Visualisasi Perbandingan Metode")
+
+    # Visualisasi (figure di-cache per hasil); data besar diagregasi di server
+    large_mode = None
+    if len(result) > DENSITY_THRESHOLD:
+        large_mode = st.radio(
+            "Mode Plot Data Besar:", ['density', 'sample'], horizontal=True,
+            format_func=lambda m: "Densitas (Agregasi)" if m == 'density' else "Sampel Titik (Stratified)",
+            help=f"Lebih dari {DENSITY_THRESHOLD:,} skenario: titik tidak dikirim seluruhnya ke browser."
+        )
+    figures = get_result_figures(result, mapped_columns, model_mlp, large_mode)
+
+    # Buat Main Tabs
+    tab_gmpe, tab_ml = st.tabs(["Metode GMPE ", "Metode Hybrid (GMPE + Neural Network)"])
 
-            st.info("ℹ️ **Keterangan:** Nilai RMSE dan MAE di atas menunjukkan tingkat kesalahan model MLP dan GMPE melakukan estimasi PGA.")
+    # Visualisasi GMPE
+    with tab_gmpe:
+        st.subheader("Analisis Klasik Boore-Atkinson (2008)")
         
-       
-        # Visualisasi
-        st.markdown("---")
-        st.markdown("### Visualisasi Perbandingan Metode")
+        # Peta Sebaran PGA GMPE
+        st.markdown("#### Peta Distribusi Spasial PGA (GMPE)")
+        st.plotly_chart(figures['map_gmpe'], use_container_width=True)
+        if 'map_note' in figures:
+            st.caption(figures['map_note'])
+
+        # Visualisasi Pola (Mag, RJB, Tipe Tanah)
+        st.markdown("#### Analisis Pola Parameter GMPE")
+        c1, c2 = st.columns(2)
+        with c1:
+            st.plotly_chart(figures['mag'], use_container_width=True)
+        with c2:
+            st.plotly_chart(figures['rjb'], use_container_width=True)
+
+        if 'models' in figures:
+            st.markdown("#### Perbandingan Model GMPE")
+            st.dataframe(figures['models_table'], use_container_width=True)
+            st.plotly_chart(figures['models'], use_container_width=True)
+
+        # Ringkasan sampling epsilon (jika mode Monte Carlo aktif)
+        prob_cols = [c for c in result.values if c.startswith('Prob_PGA_gt_')]
+        if 'PGA_MC_Mean' in result:
+            st.markdown("#### Ketidakpastian Aleatori (Monte Carlo ε)")
+            mc_cols = ['PGA_GMPE', 'PGA_MC_Mean', 'PGA_P16', 'PGA_P50', 'PGA_P84'] + prob_cols
+            st.dataframe(result.max_by_scenario(mc_cols), use_container_width=True)
+            st.caption("Nilai maksimum per kelas tanah. P16/P50/P84 = persentil PGA dari sampel ε; "
+                       "Prob = probabilitas PGA melampaui ambang.")
+
+        st.markdown("#### Spektrum Respons BA08 (Maksimum per Kelas Tanah)")
+        st.plotly_chart(figures['spectrum'], use_container_width=True)
+        with st.expander("Lihat Tabel Spektrum (kolom = periode dalam detik, 0 = PGA)"):
+            st.dataframe(figures['spectrum_table'], use_container_width=True)
+
+    # Visualisasi Hybrid
+    with tab_ml:
+        st.subheader("Analisis Inteligensi Buatan (Neural Network)")
 
-        # Buat Main Tabs
-        tab_gmpe, tab_ml = st.tabs(["Metode GMPE ", "Metode Hybrid (GMPE + Neural Network)"])
+        if is_hybrid_done:
+            show_mlp_results(result, figures)
+        else:
+            st.info("💡 Kolom fitur hybrid tidak lengkap, hasil Neural Network tidak tersedia.")
 
-        # Visualisasi GMPE
-        with tab_gmpe:
-            st.subheader("Analisis Klasik Boore-Atkinson (2008)")
-            
-            # Peta Sebaran PGA GMPE
-            st.markdown("#### Peta Distribusi Spasial PGA (GMPE)")
-            fig_map_gmpe = px.scatter_mapbox(df_result, 
-                                        lat=mapped_columns['latitude'], 
-                                        lon=mapped_columns['longitude'],
-                                        color='PGA_GMPE', size='PGA_GMPE',
-                                        color_continuous_scale='Reds',
-                                        hover_data=[mapped_columns['magnitude'], 'RJB_km', 'Tipe_Tanah'],
-                                        zoom=4, center={"lat": -2.5, "lon": 118.0},
-                                        mapbox_style="open-street-map",
-                                        title="Intensitas PGA (GMPE) di Wilayah Target")
-            st.plotly_chart(fig_map_gmpe, use_container_width=True)
-
-            # Visualisasi Pola (Mag, RJB, Tipe Tanah)
-            st.markdown("#### Analisis Pola Parameter GMPE")
-            c1, c2 = st.columns(2)
-            with c1:
-                # Magnitude vs PGA
-                fig_mag = px.scatter(df_result, x=mapped_columns['magnitude'], y='PGA_GMPE',
-                                color='Tipe_Tanah', title="Magnitude vs PGA GMPE")
-                st.plotly_chart(fig_mag, use_container_width=True)
-            with c2:
-                # Jarak (RJB) vs PGA
-                fig_rjb = px.scatter(df_result, x='RJB_km', y='PGA_GMPE',
-                                color='Tipe_Tanah', title="Jarak (RJB) vs PGA GMPE")
-                st.plotly_chart(fig_rjb, use_container_width=True)
-
-        # Visualisasi Hybrid
-        with tab_ml:
-            st.subheader("Analisis Inteligensi Buatan (Neural Network)")
-            
-            # Peta Sebaran PGA ML
-            st.markdown("#### Peta Distribusi Spasial PGA (Neural Network)")
-            fig_map_mlp = px.scatter_mapbox(df_result, 
-                                        lat=mapped_columns['latitude'], 
-                                        lon=mapped_columns['longitude'],
-                                        color='PGA_MLP', size='PGA_MLP',
-                                        color_continuous_scale='Bluered', 
-                                        hover_data=[mapped_columns['magnitude'], 'RJB_km', 'Tipe_Tanah'],
-                                        zoom=4, center={"lat": -2.5, "lon": 118.0},
-                                        mapbox_style="open-street-map",
-                                        title="Intensitas PGA (MLP) di Wilayah Target")
-            st.plotly_chart(fig_map_mlp, use_container_width=True)
-
-            # Visualisasi RMSE & MAE
-            st.markdown("#### Metrik Akurasi Model terhadap GMPE")
-            y_true = df_result['PGA_GMPE']
-            y_pred = df_result['PGA_MLP']
-            u_rmse = np.sqrt(mean_squared_error(y_true, y_pred))
-            u_mae = mean_absolute_error(y_true, y_pred)
-            
-            col_acc1, col_acc2 = st.columns(2)
-            with col_acc1:
-                st.metric("MAE (Mean Absolute Error)", f"{u_mae:.5f}")
-                # Progress bar sebagai indikator visual (misal max error 0.2)
-                progress_mae = min(u_mae / 0.2, 1.0) 
-                st.progress(progress_mae)
-                
-            with col_acc2:
-                st.metric("RMSE (Root Mean Square Error)", f"{u_rmse:.5f}")
-                progress_rmse = min(u_rmse / 0.2, 1.0)
-                st.progress(progress_rmse)
+    st.markdown("<br>", unsafe_allow_html=True)
 
-            st.caption("ℹ️ Semakin pendek bar, semakin kecil tingkat kesalahan model.")
+    # Button Reset
+    if st.button("Estimasi Ulang dengan Parameter Berbeda", use_container_width=True, type="secondary"):
+        keys_to_delete = ['hasil_token', 'is_gmpe_done', 'is_hybrid_done']
+        
+        for key in keys_to_delete:
+            if key in st.session_state:
+                del st.session_state[key]
+        for key in ['hasil_estimasi', 'hasil_seismisitas', 'hasil_figures']:
+            session_store().pop(key)
+        st.rerun()
+
+
+def show_seismicity(summary):
+    """Hasil analisis statistik seismisitas (G-R, MLE dan IK bootstrap b-value)"""
+    if summary is None:
+        st.warning("Data setelah difilter terlalu sedikit untuk analisis b-value.")
+        return
+
+    st.subheader("📊 Hasil Analisis Statistik Seismisitas")
+    col_gr1, col_gr2, col_gr3 = st.columns(3)
+    col_gr1.metric("b-value", f"{summary['b']:.3f}")
+    col_gr2.metric("a-value", f"{summary['a']:.3f}")
+    col_gr3.metric("R²", f"{summary['r2']:.4f}")
+
+    # Estimator maximum likelihood Aki/Utsu + interval kepercayaan bootstrap
+    col_ml1, col_ml2, _ = st.columns(3)
+    col_ml1.metric("b-value (MLE Aki/Utsu)", f"{summary['b_mle']:.3f}")
+    col_ml2.metric("IK 95% b-value (bootstrap)", f"{summary['b_low']:.3f} – {summary['b_high']:.3f}")
+
+
+def show_mlp_results(result, figures):
+    """Tab hasil Neural Network: peta, metrik akurasi dan kontribusi fitur"""
+    # Peta Sebaran PGA ML
+    st.markdown("#### Peta Distribusi Spasial PGA (Neural Network)")
+    st.plotly_chart(figures['map_mlp'], use_container_width=True)
+
+    # Visualisasi RMSE & MAE
+    st.markdown("#### Metrik Akurasi Model terhadap GMPE")
+    y_true = result['PGA_GMPE'].ravel().astype(np.float64)
+    y_pred = result['PGA_MLP'].ravel().astype(np.float64)
+    u_rmse = np.sqrt(mean_squared_error(y_true, y_pred))
+    u_mae = mean_absolute_error(y_true, y_pred)
+
+    col_acc1, col_acc2 = st.columns(2)
+    with col_acc1:
+        st.metric("MAE (Mean Absolute Error)", f"{u_mae:.5f}")
+        # Progress bar sebagai indikator visual (misal max error 0.2)
+        progress_mae = min(u_mae / 0.2, 1.0) 
+        st.progress(progress_mae)
+
+    with col_acc2:
+        st.metric("RMSE (Root Mean Square Error)", f"{u_rmse:.5f}")
+        progress_rmse = min(u_rmse / 0.2, 1.0)
+        st.progress(progress_rmse)
+
+    st.caption("ℹ️ Semakin pendek bar, semakin kecil tingkat kesalahan model.")
+
+    # Feature Importance
+    st.markdown("#### Kontribusi Variabel terhadap Prediksi")
+    if 'importance' in figures:
+        st.plotly_chart(figures['importance'], use_container_width=True)
+    else:
+        st.warning(f"Feature Importance tidak dapat dimuat: {figures.get('importance_error')}")
+
+    # Notes
+    st.warning("""
+    ⚠️ **Catatan Penting:** Hasil estimasi menggunakan metode **Neural Network (MLP)** ini dikembangkan sebagai model pendukung untuk mengoreksi atau memperhalus hasil dari metode empiris. 
+    """)
+
+
+@st.fragment
+def show_filtered_results(result, mapped_columns, is_hybrid_done):
+    """Filter dataset hasil (tanah, magnitude), tabel, metrik akurasi dan export"""
+    # --- FILTER DATASET ---
+    st.markdown("---")
+    st.markdown("### Dataset Hasil Estimasi")
+    
+    f_col1, f_col2 = st.columns(2)
+    with f_col1:
+        soil_options = result.labels
+        selected_soil = st.multiselect("Pilih Tipe Tanah:", soil_options, default=soil_options)
+    with f_col2:
+        mag_col = mapped_columns['magnitude']
+        mag_min, mag_max = float(result.events[mag_col].min()), float(result.events[mag_col].max())
+        selected_mag = st.slider("Filter Rentang Magnitude:", mag_min, mag_max, (mag_min, mag_max))
+
+    # Terapkan Filter (mask event x skenario; bentuk panjang hanya untuk kolom tabel)
+    mask = result.mask(selected_soil, {mag_col: selected_mag})
+    n_filtered = int(mask.sum())
+
+    # Kolom yang ditampilkan di tabel
+    display_cols = ['Tipe_Tanah', mag_col, mapped_columns['depth'], 'RJB_km', 'PGA_GMPE']
+    if is_hybrid_done: display_cols.append('PGA_MLP')
+    
+    rename_map = {
+        mag_col: 'Magnitude', 
+        mapped_columns['depth']: 'Kedalaman (km)', 
+        'RJB_km': 'Jarak JB (km)', 
+        'PGA_GMPE': 'PGA GMPE (g)', 
+        'PGA_MLP': 'PGA MLP (g)'
+    }
+    
+    st.dataframe(result.to_frame(display_cols, mask).rename(columns=rename_map), use_container_width=True, height=400)
+    st.caption(f"Menampilkan {n_filtered} skenario hasil filter.")
 
-            # Feature Importance
-            st.markdown("#### Kontribusi Variabel terhadap Prediksi")
-            try:
-                weights = np.abs(model_mlp.coefs_[0]).sum(axis=1)
-
-                feature_names = [
-                    'Latitude', 'Longitude', 'Depth', 'Nst', 'Gap', 'RMS', 'MagNst',
-                    'Soil_SA', 'Soil_SB', 'Soil_SC', 'Soil_SD', 'Soil_SE',
-                    'F_Miss_Gap', 'F_Miss_RMS', 'F_Miss_MagNst', 'F_Miss_DErr', 'F_Miss_Nst',
-                    'F_Out_Gap', 'F_Out_RMS', 'F_Out_MagNst', 'F_Out_Dep', 'F_Out_DErr'
-                ]
-                df_imp = pd.DataFrame({'Fitur': feature_names, 'Importance': weights}).sort_values(by='Importance', ascending=True)
-                
-                fig_imp = px.bar(df_imp.tail(12), x='Importance', y='Fitur', orientation='h',
-                                title="Top 12 Fitur Paling Berpengaruh",
-                                color='Importance', color_continuous_scale='Viridis')
-                st.plotly_chart(fig_imp, use_container_width=True)
-            except Exception as e:
-                st.warning(f"Feature Importance tidak dapat dimuat: {e}")
-
-            # Notes
-            st.warning("""
-            ⚠️ **Catatan Penting:** Hasil estimasi menggunakan metode **Neural Network (MLP)** ini dikembangkan sebagai model pendukung untuk mengoreksi atau memperhalus hasil dari metode empiris. 
-            """)
 
-        # Export Hasil
+    # RMSE dan MAE data User
+    if is_hybrid_done:
         st.markdown("---")
-        st.markdown("### Export Hasil")
+        st.subheader("Validasi Akurasi Untuk GMPE + Neural Network (MLP)")
+        st.write("Statistik ini mengukur seberapa presisi Neural Network dan GMPE dalam melakukan estimasi PGA:")
+
+        
+        
+        y_true = result['PGA_GMPE'][mask].astype(np.float64)
+        y_pred = result['PGA_MLP'][mask].astype(np.float64)
+        
+        # Menghitung Metrik Absolut
+        user_rmse = np.sqrt(mean_squared_error(y_true, y_pred))
+        user_mae = mean_absolute_error(y_true, y_pred)
+
+        u_col1, u_col2 = st.columns(2)
+        with u_col1:
+            st.metric("MAE (Rata-rata Error)", f"{user_mae:.5f} g")
+            st.caption("Semakin kecil MAE, semakin dekat MLP dengan GMPE.")
+        with u_col2:
+            st.metric("RMSE (Deviasi Error)", f"{user_rmse:.5f} g")
+            st.caption("Mengukur penyebaran error prediksi.")
+
+        st.info("ℹ️ **Keterangan:** Nilai RMSE dan MAE di atas menunjukkan tingkat kesalahan model MLP dan GMPE melakukan estimasi PGA.")
 
-        st.info(f"Data yang akan diunduh mencakup {len(df_filtered)} baris hasil estimasi berdasarkan filter yang Anda terapkan.")
+    # Export Hasil
+    st.markdown("---")
+    st.markdown("### Export Hasil")
 
-        col_exp1, col_exp2 = st.columns(2)
+    st.info(f"Data yang akan diunduh mencakup {n_filtered} baris hasil estimasi berdasarkan filter yang Anda terapkan.")
 
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    # File dibuat saat tombol diklik (bukan setiap rerun) dan di-cache per kondisi filter
+    export_key = (st.session_state.get('hasil_token'), tuple(selected_soil), tuple(selected_mag))
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    labels = {'csv': "Download Hasil (CSV)", 'xlsx': "Download Hasil (Excel)", 'parquet': "Download Hasil (Parquet)"}
 
-        # Download CSV
-        with col_exp1:
-            csv = df_filtered.to_csv(index=False).encode('utf-8')
+    for col_exp, fmt in zip(st.columns(3), EXPORT_FORMATS):
+        ext, mime = EXPORT_FORMATS[fmt]
+        too_large = fmt == 'xlsx' and n_filtered > EXCEL_MAX_ROWS
+        with col_exp:
             st.download_button(
-                label="Download Hasil (CSV)",
-                data=csv,
-                file_name=f"pga_hybrid_export_{timestamp}.csv",
-                mime="text/csv",
+                label=labels[fmt],
+                data=lambda fmt=fmt: cached_export(export_key, lambda: result.to_frame(mask=mask), fmt),
+                file_name=f"pga_hybrid_export_{timestamp}.{ext}",
+                mime=mime,
+                disabled=too_large,
                 use_container_width=True
             )
+            if too_large:
+                st.caption(f"Excel maksimum {EXCEL_MAX_ROWS:,} baris, gunakan CSV atau Parquet.")
+
+
+def show_multi_site(df, mapped_columns):
+    """Estimasi PGA untuk banyak lokasi target sekaligus (tabel lokasi diupload)"""
+    st.info("""
+    Upload tabel lokasi target (CSV/Excel) dengan kolom **nama**, **latitude** dan **longitude**.
+    PGA dihitung untuk setiap kombinasi **gempa x lokasi x kelas tanah** dalam satu proses.
+    """)
+
+    sites_file = st.file_uploader(
+        "Pilih file lokasi target",
+        type=['csv', 'xlsx', 'xls'],
+        help="Contoh kolom: nama, latitude, longitude"
+    )
+
+    if sites_file is None:
+        st.stop()
 
-        # Download Excel
-        with col_exp2:
-            output = BytesIO()
+    try:
+        if sites_file.name.endswith('.csv'):
+            df_sites = pd.read_csv(sites_file)
+        else:
+            df_sites = pd.read_excel(sites_file)
+        sites = prepare_sites(df_sites)
+    except Exception as e:
+        st.error(f"Tabel lokasi tidak dapat dibaca: {e}")
+        st.stop()
+
+    if sites.empty:
+        st.error("❌ Tidak ada lokasi dengan koordinat valid pada tabel.")
+        st.stop()
+
+    st.success(f"✅ {len(sites)} lokasi target terbaca.")
+    with st.expander("Lihat Tabel Lokasi"):
+        st.dataframe(sites, use_container_width=True, hide_index=True)
+
+    max_distance_km = st.number_input(
+        "📏 Radius Maksimum Gempa (km):",
+        min_value=10.0, max_value=200.0, value=200.0, step=10.0,
+        help="Hanya gempa dalam radius ini dari tiap lokasi yang dihitung (BA08 valid hingga 200 km)."
+    )
+
+    if st.button("Mulai Estimasi PGA Multi-Lokasi", type="primary", use_container_width=True):
+        with st.spinner("Menghitung PGA untuk seluruh lokasi..."):
+            spatial_index = get_spatial_index(df, mapped_columns['latitude'], mapped_columns['longitude'])
+            summary, detail = estimate_sites(df, mapped_columns, sites, get_models(), spatial_index, max_distance_km)
+        session_store()['hasil_multilokasi'] = (summary, detail)
+
+    show_psha(df, mapped_columns, sites, max_distance_km)
+
+    if 'hasil_multilokasi' not in session_store():
+        st.stop()
+
+    summary, detail = session_store()['hasil_multilokasi']
+
+    st.markdown("---")
+    st.header("Ringkasan PGA per Lokasi")
+    st.dataframe(summary, use_container_width=True, hide_index=True)
+    st.caption(f"{summary['Lokasi'].nunique()} lokasi, {len(detail)} skenario event-lokasi-tanah.")
+
+    # Drill-down per lokasi
+    st.markdown("### Detail per Lokasi")
+    selected_site = st.selectbox("Pilih Lokasi:", summary['Lokasi'].unique().tolist())
+    df_site = detail[detail['Lokasi'] == selected_site]
+    if df_site.empty:
+        st.info("Tidak ada gempa yang memenuhi kriteria (M>=5, dalam radius) untuk lokasi ini.")
+    else:
+        st.dataframe(df_site, use_container_width=True, height=400, hide_index=True)
+
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    col_exp1, col_exp2 = st.columns(2)
+    with col_exp1:
+        st.download_button(
+            label="Download Ringkasan (CSV)",
+            data=summary.to_csv(index=False).encode('utf-8'),
+            file_name=f"pga_multilokasi_ringkasan_{timestamp}.csv",
+            mime="text/csv",
+            use_container_width=True
+        )
+    with col_exp2:
+        st.download_button(
+            label="Download Detail Lokasi (CSV)",
+            data=df_site.to_csv(index=False).encode('utf-8'),
+            file_name=f"pga_multilokasi_{selected_site}_{timestamp}.csv",
+            mime="text/csv",
+            use_container_width=True
+        )
+
+
+def show_psha(df, mapped_columns, sites, max_distance_km):
+    """Analisis bahaya seismik probabilistik (PSHA) untuk seluruh lokasi target"""
+    with st.expander("📈 Analisis Bahaya Probabilistik (PSHA)"):
+        st.markdown("""
+        Parameter Gutenberg-Richter (a, b) dari katalog digabung dengan BA08 dan sigma-nya
+        menjadi **kurva hazard** (laju tahunan PGA terlampaui) serta PGA desain
+        **10% dan 2% dalam 50 tahun** untuk setiap lokasi.
+        """)
+        col_dur, col_soil = st.columns(2)
+        duration_years = col_dur.number_input(
+            "Durasi Katalog (tahun):",
+            min_value=1.0, max_value=500.0, value=50.0, step=1.0,
+            help="Rentang waktu katalog, dipakai untuk mengubah jumlah kejadian menjadi laju tahunan."
+        )
+        soil = col_soil.selectbox("Kelas Tanah:", list(TANAH_MAPPING.keys()), index=1, key="psha_soil")
+
+        if st.button("Hitung PSHA", use_container_width=True):
+            spatial_index = get_spatial_index(df, mapped_columns['latitude'], mapped_columns['longitude'])
             try:
-                with pd.ExcelWriter(output, engine='openpyxl') as writer:
-                    df_filtered.to_excel(writer, index=False, sheet_name='Hasil Estimasi PGA')
-                
-                excel_data = output.getvalue()
-                st.download_button(
-                    label="Download Hasil (Excel)",
-                    data=excel_data,
-                    file_name=f"pga_hybrid_export_{timestamp}.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-                    use_container_width=True
+                session_store()['hasil_psha'] = run_psha(
+                    df, mapped_columns, sites, duration_years, vs30=TANAH_MAPPING[soil],
+                    spatial_index=spatial_index, max_distance_km=max_distance_km
                 )
-            except Exception as e:
-                st.error(f"Gagal membuat file Excel. Pastikan library 'openpyxl' terinstall. Error: {e}")
+            except ValueError as e:
+                st.error(f"❌ {e}")
+
+        if 'hasil_psha' not in session_store():
+            return
+
+        hasil = session_store()['hasil_psha']
+        col_a, col_b, col_r = st.columns(3)
+        col_a.metric("a-value", f"{hasil.a:.3f}")
+        col_b.metric("b-value", f"{hasil.b:.3f}")
+        col_r.metric("R²", f"{hasil.r2:.4f}")
+
+        summary = hasil.summary()
+        st.dataframe(summary, use_container_width=True, hide_index=True)
+        if summary[list(DESIGN_POE)].isna().any(axis=None):
+            st.caption(f"Nilai kosong: laju target di luar rentang kurva hazard (PGA desain di atas "
+                       f"{hasil.levels[-1]:.2f} g atau di bawah {hasil.levels[0]:.3f} g).")
+
+        df_curve = hasil.curve_frame()
+        selected = st.multiselect("Kurva Hazard Lokasi:", summary['Lokasi'].tolist(),
+                                  default=summary['Lokasi'].tolist()[:5])
+        df_curve = df_curve[df_curve['Lokasi'].isin(selected) & (df_curve['Laju_Tahunan'] > 0)]
+        fig = px.line(df_curve, x='PGA_g', y='Laju_Tahunan', color='Lokasi', log_x=True, log_y=True,
+                      labels={'PGA_g': 'PGA (g)', 'Laju_Tahunan': 'Laju Tahunan Terlampaui'})
+        for label, poe in (("10%/50 th", 0.10), ("2%/50 th", 0.02)):
+            fig.add_hline(y=-np.log(1 - poe) / 50, line_dash='dash', annotation_text=label)
+        st.plotly_chart(fig, use_container_width=True)
+
+        st.download_button(
+            label="Download PGA Desain PSHA (CSV)",
+            data=summary.to_csv(index=False).encode('utf-8'),
+            file_name=f"psha_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            mime="text/csv",
+            use_container_width=True
+        )
 
-        st.markdown("<br>", unsafe_allow_html=True)
 
-        # Button Reset
-        if st.button("Estimasi Ulang dengan Parameter Berbeda", use_container_width=True, type="secondary"):
-            keys_to_delete = ['hasil_estimasi', 'is_gmpe_done', 'is_hybrid_done']
-            
-            for key in keys_to_delete:
-                if key in st.session_state:
-                    del st.session_state[key]
-            st.rerun()
\ No newline at end of file
+def show_hazard_raster(df, mapped_columns, is_hybrid_ready):
+    """Peta raster PGA (maksimum/persentil per sel grid) untuk seluruh wilayah studi"""
+    st.info("""
+    PGA dihitung untuk setiap sel grid dari **seluruh gempa** dalam radius, lalu direduksi menjadi
+    nilai **maksimum** atau **persentil** per sel. Hasil ditampilkan sebagai satu gambar overlay di peta.
+    """)
+
+    col_lat1, col_lat2, col_lon1, col_lon2 = st.columns(4)
+    lat_min = col_lat1.number_input("Lintang Min:", min_value=-11.0, max_value=6.5, value=ACEH_EXTENT[0], format="%.2f")
+    lat_max = col_lat2.number_input("Lintang Maks:", min_value=-11.0, max_value=6.5, value=ACEH_EXTENT[1], format="%.2f")
+    lon_min = col_lon1.number_input("Bujur Min:", min_value=90.0, max_value=141.0, value=ACEH_EXTENT[2], format="%.2f")
+    lon_max = col_lon2.number_input("Bujur Maks:", min_value=90.0, max_value=141.0, value=ACEH_EXTENT[3], format="%.2f")
+
+    if lat_min >= lat_max or lon_min >= lon_max:
+        st.error("❌ Batas wilayah tidak valid (nilai minimum harus lebih kecil dari maksimum).")
+        st.stop()
+
+    col_res, col_rad = st.columns(2)
+    step_deg = col_res.select_slider(
+        "Resolusi Grid (derajat):",
+        options=[0.01, 0.02, 0.05, 0.1, 0.25],
+        value=0.05,
+        help="0.05° ~ 5.5 km per sel"
+    )
+    max_distance_km = col_rad.number_input(
+        "📏 Radius Maksimum Gempa (km):",
+        min_value=10.0, max_value=200.0, value=200.0, step=10.0,
+        help="Hanya gempa dalam radius ini dari tiap sel yang dihitung (BA08 valid hingga 200 km)."
+    )
+
+    soil_options = list(TANAH_MAPPING.keys())
+    if 'vs30' in mapped_columns:
+        soil_options = ["VS30 Data"] + soil_options
+    col_soil, col_red = st.columns(2)
+    soil = col_soil.selectbox("Kelas Tanah / VS30:", soil_options)
+    reducer_label = col_red.radio("Reduksi per Sel:", ["Maksimum", "Persentil"], horizontal=True)
+
+    percentile = 84.0
+    if reducer_label == "Persentil":
+        percentile = st.slider("Persentil PGA (%):", min_value=50, max_value=99, value=84)
+
+    use_mlp = False
+    if is_hybrid_ready:
+        use_mlp = st.checkbox("Sertakan raster MLP (Hybrid)", value=False)
+
+    n_cells = int(np.ceil((lat_max - lat_min) / step_deg)) * int(np.ceil((lon_max - lon_min) / step_deg))
+    st.caption(f"{n_cells:,} sel grid.")
+
+    if st.button("Hitung Raster PGA", type="primary", use_container_width=True):
+        with st.spinner("Menghitung raster PGA..."):
+            spatial_index = get_spatial_index(df, mapped_columns['latitude'], mapped_columns['longitude'])
+            extent = (lat_min, lat_max, lon_min, lon_max)
+            lats, lons, raster_gmpe, raster_mlp = estimate_raster(
+                df, mapped_columns, extent, step_deg,
+                vs30=None if soil == "VS30 Data" else TANAH_MAPPING[soil],
+                models=get_models() if use_mlp else None,
+                reducer='max' if reducer_label == "Maksimum" else 'percentile',
+                percentile=percentile, max_distance_km=max_distance_km,
+                spatial_index=spatial_index
+            )
+        session_store()['hasil_raster'] = {
+            'extent': extent, 'step': step_deg, 'lats': lats, 'lons': lons,
+            'GMPE': raster_gmpe, 'MLP': raster_mlp, 'label': f"{soil}, {reducer_label}"
+        }
+
+    if 'hasil_raster' not in session_store():
+        st.stop()
+
+    hasil = session_store()['hasil_raster']
+    methods = ["GMPE"] + (["MLP"] if hasil['MLP'] is not None else [])
+
+    st.markdown("---")
+    st.header("Peta Raster PGA Wilayah")
+    method = st.radio("Metode:", methods, horizontal=True) if len(methods) > 1 else "GMPE"
+    raster = hasil[method]
+
+    if not np.isfinite(raster).any():
+        st.warning("Tidak ada gempa yang memenuhi kriteria (M>=5, dalam radius) di wilayah ini.")
+        st.stop()
+
+    vmin, vmax = float(np.nanmin(raster)), float(np.nanmax(raster))
+    # Batas gambar = tepi luar sel grid (bukan batas wilayah input) agar overlay tidak bergeser
+    lat_min, lat_max, lon_min, lon_max = grid_bounds(hasil['lats'], hasil['lons'], hasil['step'])
+    col_m1, col_m2, col_m3 = st.columns(3)
+    col_m1.metric("PGA Maks (g)", f"{vmax:.4f}")
+    col_m2.metric("PGA Min (g)", f"{vmin:.4f}")
+    col_m3.metric("Sel Terisi", f"{int(np.isfinite(raster).sum()):,} / {raster.size:,}")
+
+    # Satu gambar PNG sebagai layer mapbox; marker tak terlihat hanya untuk colorbar
+    fig = go.Figure(go.Scattermapbox(
+        lat=[lat_min, lat_max], lon=[lon_min, lon_max], mode='markers',
+        marker=dict(size=0, color=[vmin, vmax], colorscale='Reds', showscale=True,
+                    colorbar=dict(title="PGA (g)")),
+        hoverinfo='skip'
+    ))
+    fig.update_layout(
+        mapbox=dict(
+            style='open-street-map',
+            center=dict(lat=(lat_min + lat_max) / 2, lon=(lon_min + lon_max) / 2),
+            zoom=5,
+            layers=[dict(
+                sourcetype='image',
+                source=raster_to_png(raster, vmin, vmax),
+                coordinates=[[lon_min, lat_max], [lon_max, lat_max], [lon_max, lat_min], [lon_min, lat_min]]
+            )]
+        ),
+        height=600, margin=dict(l=0, r=0, t=30, b=0),
+        title=f"PGA {method} ({hasil['label']})"
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    grid_lat, grid_lon = np.meshgrid(hasil['lats'], hasil['lons'], indexing='ij')
+    df_raster = pd.DataFrame({
+        'latitude': grid_lat.ravel(), 'longitude': grid_lon.ravel(), f'PGA_{method}': raster.ravel()
+    }).dropna()
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    st.download_button(
+        label="Download Raster (CSV)",
+        data=df_raster.to_csv(index=False).encode('utf-8'),
+        file_name=f"pga_raster_{method}_{timestamp}.csv",
+        mime="text/csv",
+        use_container_width=True
+    )
@@ -1,5 +1,9 @@
 
+import hmac
+import os
+
 import streamlit as st
+from Core import model_registry
 
 
 # PAGE CONFIGURATION
@@ -13,6 +17,35 @@ st.set_page_config(
 
 
 
+# WARM-UP MODEL (sekali per proses, dipakai bersama semua sesi)
+
+try:
+    model_registry.warm_up()
+except Exception:
+    # Error ditampilkan di halaman Estimasi PGA saat model dibutuhkan
+    pass
+
+
+# AKSES ADMIN
+
+def admin_token():
+    """Token admin yang dikonfigurasi (None jika belum diatur: panel admin nonaktif)"""
+    token = os.environ.get('QUAKEACEH_ADMIN_TOKEN')
+    if not token:
+        try:
+            token = st.secrets.get('admin_token')
+        except Exception:
+            # Tidak ada secrets.toml
+            token = None
+    return token or None
+
+
+def is_admin():
+    token = admin_token()
+    given = st.query_params.get('admin')
+    return token is not None and given is not None and hmac.compare_digest(given, token)
+
+
 # SESSION STATE INITIALIZATION
 
 if 'page' not in st.session_state:
@@ -72,7 +105,35 @@ with st.sidebar:
    
     
     st.markdown("---")
-    
+
+    # PEMAKAIAN MEMORI PER SESI (khusus admin: tambahkan ?admin=<token> pada URL;
+    # token diatur lewat env QUAKEACEH_ADMIN_TOKEN atau st.secrets["admin_token"])
+    if is_admin():
+        from Core.session_memory import get_session_memory
+        from Core.result_cache import get_result_cache
+        from Core.spatial_index import get_index_cache
+        from Core.catalog_cache import get_cache
+
+        with st.expander("🧠 Memori Server (Admin)"):
+            report = get_session_memory().report()
+            st.dataframe([{
+                'Sesi': r['session'][:8],
+                'Memori (MB)': round(r['memory_bytes'] / 1e6, 1),
+                'Disk (MB)': round(r['disk_bytes'] / 1e6, 1),
+                'Entri': r['entries'],
+                'Spill': r['spills'],
+                'Idle (menit)': round(r['idle_seconds'] / 60, 1)
+            } for r in report], hide_index=True, use_container_width=True)
+            st.caption(f"Total sesi: {len(report)} | "
+                       f"{sum(r['memory_bytes'] for r in report) / 1e6:.1f} MB di memori, "
+                       f"{sum(r['disk_bytes'] for r in report) / 1e6:.1f} MB di disk")
+            for label, cache in (("Cache hasil", get_result_cache()), ("Indeks spasial", get_index_cache()),
+                                 ("Katalog di disk", get_cache())):
+                stats = cache.stats()
+                st.caption(f"{label} (bersama): {stats['entries']} entri, {stats['bytes'] / 1e6:.1f} MB")
+
+        st.markdown("---")
+
     # COPYRIGHT
     st.caption("© 2025 QuakeAceh")     
     
@@ -0,0 +1,148 @@
+"""
+Benchmark tahap hybrid (MLP) estimasi satu lokasi pada katalog sintetis.
+
+Membandingkan jalur lama per baris (loop iterrows one-hot + scaler/model
+sklearn per kelas tanah), loop per kelas tanah dengan FeatureTransformer,
+dan jalur batch yang dipakai halaman Estimasi PGA (satu panggilan engine
+untuk seluruh skenario). Jalur per baris sangat lambat sehingga diukur
+pada N event pertama saja (--legacy-events).
+
+    python benchmarks/bench_hybrid.py --events 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Core.features import FeatureTransformer, classify_vs30_codes, predict_soil_scenarios
+from Core.gmpe import TANAH_MAPPING
+from Core.model_registry import MLP_FEATURES_ORDER, get_models
+from Core.scenarios import scenario_vs30
+
+
+MAPPED_COLUMNS = {
+    'magnitude': 'mag', 'latitude': 'latitude', 'longitude': 'longitude', 'depth': 'depth',
+    'nst': 'nst', 'gap': 'gap', 'rms': 'rms', 'magnst': 'magNst', 'deptherror': 'depthError'
+}
+
+
+def make_catalog(n, seed=0):
+    """Katalog sintetis berformat USGS (event sudah lolos filter M >= 5, depth > 0)"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'latitude': rng.uniform(1.0, 7.0, n),
+        'longitude': rng.uniform(93.0, 99.0, n),
+        'depth': rng.uniform(1.0, 150.0, n),
+        'mag': rng.uniform(5.0, 7.5, n),
+        'nst': rng.integers(10, 500, n).astype(float),
+        'gap': rng.uniform(10.0, 250.0, n),
+        'rms': rng.uniform(0.3, 1.5, n),
+        'depthError': rng.uniform(0.5, 20.0, n),
+        'magNst': rng.integers(5, 200, n).astype(float)
+    })
+
+
+def classify_vs30(vs30_val):
+    if vs30_val >= 760:
+        return 'SA' if vs30_val >= 1300 else 'SB'
+    elif 360 <= vs30_val < 760:
+        return 'SC'
+    elif 180 <= vs30_val < 360:
+        return 'SD'
+    else:
+        return 'SE'
+
+
+def run_legacy(df, models):
+    """Jalur lama: per kelas tanah, one-hot per baris (iterrows), scaler dan model sklearn"""
+    rename_map = {MAPPED_COLUMNS[key]: name for name, key in
+                  [('latitude', 'latitude'), ('longitude', 'longitude'), ('depth', 'depth'), ('nst', 'nst'),
+                   ('gap', 'gap'), ('rms', 'rms'), ('magNst', 'magnst'), ('depthError', 'deptherror')]}
+    result = np.empty((len(df), len(TANAH_MAPPING)))
+    for j, (label, vs_val) in enumerate(TANAH_MAPPING.items()):
+        subset = df.copy()
+        subset['Vs30_m_s'] = vs_val
+        for idx, row in subset.iterrows():
+            target_class = classify_vs30(row['Vs30_m_s'])
+            for s in TANAH_MAPPING.keys():
+                subset.loc[idx, f'Soil_{s}'] = 1 if target_class == s else 0
+        subset = subset.rename(columns=rename_map)
+        for m in ['gap', 'rms', 'magNst', 'depthError', 'nst']:
+            subset[f'flag_missing_{m}'] = 0
+        for feat in ['nst', 'gap', 'rms', 'magNst', 'depth', 'depthError']:
+            Q1 = subset[feat].quantile(0.25)
+            Q3 = subset[feat].quantile(0.75)
+            IQR = Q3 - Q1
+            subset[f'flag_outlier_{feat}'] = np.where(
+                (subset[feat] < (Q1 - 1.5*IQR)) | (subset[feat] > (Q3 + 1.5*IQR)), 1, 0
+            )
+        X_scaled = models.scaler_x.transform(subset[MLP_FEATURES_ORDER])
+        y_pred_scaled = models.model_mlp.predict(X_scaled)
+        pga_inv = models.scaler_y.inverse_transform(y_pred_scaled.reshape(-1, 1))
+        result[:, j] = np.maximum(pga_inv[:, 0], 0.0001)
+    return result
+
+
+def run_per_label(df, models):
+    """Loop per kelas tanah: fitur dan prediksi engine diulang untuk setiap skenario"""
+    vs30_grid = scenario_vs30(TANAH_MAPPING, len(df))
+    result = np.empty(vs30_grid.shape)
+    for j in range(vs30_grid.shape[1]):
+        transformer = FeatureTransformer(MAPPED_COLUMNS)
+        X_input = transformer.fit_transform(df, vs30_grid[:, j])
+        result[:, j] = np.maximum(models.engine.predict(X_input), 0.0001)
+    return result
+
+
+def run_batched(df, models):
+    """Jalur halaman Estimasi PGA: fitur event sekali, satu panggilan engine untuk seluruh skenario"""
+    vs30_grid = scenario_vs30(TANAH_MAPPING, len(df))
+    transformer = FeatureTransformer(MAPPED_COLUMNS)
+    X_base = transformer.fit_transform(df)
+    return predict_soil_scenarios(models.engine, transformer, X_base, classify_vs30_codes(vs30_grid))
+
+
+def timed(func, df, models, repeat):
+    """Waktu terbaik dari `repeat` kali eksekusi dan hasil terakhir"""
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(df, models)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--events', type=int, default=100000, help="Jumlah event katalog sintetis")
+    parser.add_argument('--legacy-events', type=int, default=2000,
+                        help="Jumlah event untuk jalur lama per baris (0 = dilewati)")
+    parser.add_argument('--repeat', type=int, default=2, help="Jumlah ulangan (diambil waktu terbaik)")
+    args = parser.parse_args(argv)
+
+    models = get_models()
+    df = make_catalog(args.events)
+    n_scen = len(TANAH_MAPPING)
+    print(f"Katalog: {args.events:,} event x {n_scen} skenario = {args.events * n_scen:,} baris")
+
+    t_batch, pga_batch = timed(run_batched, df, models, args.repeat)
+    t_label, pga_label = timed(run_per_label, df, models, args.repeat)
+    print(f"{'batch (satu panggilan)':<28}{t_batch:>9.3f} s")
+    print(f"{'loop per kelas tanah':<28}{t_label:>9.3f} s   selisih maks {np.abs(pga_label - pga_batch).max():.1e}")
+
+    if args.legacy_events > 0:
+        head = df.iloc[:args.legacy_events].reset_index(drop=True)
+        t_legacy, pga_legacy = timed(run_legacy, head, models, 1)
+        t_head, pga_head = timed(run_batched, head, models, args.repeat)
+        print(f"{args.legacy_events:,} event pertama:")
+        print(f"{'  batch (satu panggilan)':<28}{t_head:>9.3f} s")
+        print(f"{'  per baris (iterrows)':<28}{t_legacy:>9.3f} s   selisih maks {np.abs(pga_legacy - pga_head).max():.1e}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark langkah validasi upload (ValidationReport.update) per chunk.
+
+Membandingkan validasi lama (isnull seluruh frame + to_numeric dan penulisan
+ulang kolom per chunk, sebelum Core.validation) dengan ValidationReport
+sekarang pada chunk 100k baris x 12 kolom di memori (tanpa parsing CSV).
+
+    python benchmarks/bench_validation.py --rows 1000000 10000000
+    python benchmarks/bench_validation.py --rows 1000000 --text-column
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Core.validation import ValidationReport
+
+
+CHUNK_ROWS = 100000
+
+NUMERIC_COLS = ['mag', 'depth', 'latitude', 'longitude', 'nst', 'magNst', 'gap', 'rms', 'depthError']
+
+
+class LegacyValidationReport:
+    """Validasi lama per chunk (hanya bagian yang diukur)"""
+
+    def __init__(self, max_missing_rows=20, max_type_examples=5):
+        self.max_missing_rows = max_missing_rows
+        self.max_type_examples = max_type_examples
+        self.n_rows = 0
+        self.missing_counts = {}
+        self.n_missing_rows = 0
+        self.missing_rows = []
+        self.type_errors = {}
+
+    def update(self, chunk, numeric_cols):
+        null_mask = chunk.isnull()
+        for col, count in null_mask.sum().items():
+            if count:
+                self.missing_counts[col] = self.missing_counts.get(col, 0) + int(count)
+        row_has_null = null_mask.any(axis=1)
+        n_null_rows = int(row_has_null.sum())
+        if n_null_rows:
+            self.n_missing_rows += n_null_rows
+            room = self.max_missing_rows - len(self.missing_rows)
+            if room > 0:
+                self.missing_rows.extend(r + 1 for r in chunk.index[row_has_null][:room])
+
+        for col in numeric_cols:
+            converted = pd.to_numeric(chunk[col], errors='coerce')
+            invalid = converted.isnull() & ~null_mask[col]
+            if invalid.any():
+                entry = self.type_errors.setdefault(col, {'count': 0, 'rows': [], 'values': []})
+                entry['count'] += int(invalid.sum())
+                room = self.max_type_examples - len(entry['rows'])
+                if room > 0:
+                    entry['rows'].extend(r + 1 for r in chunk.index[invalid][:room])
+                    entry['values'].extend(chunk.loc[invalid, col].iloc[:room].tolist())
+            chunk[col] = converted
+        self.n_rows += len(chunk)
+        return chunk
+
+
+def make_chunk(rng, start, text_column=False):
+    """Satu chunk sintetis berformat USGS (12 kolom, 3 kolom teks)"""
+    n = CHUNK_ROWS
+    df = pd.DataFrame({
+        'time': pd.Series(np.full(n, '2000-01-01T00:00:00Z'), dtype='str'),
+        'latitude': rng.uniform(1.0, 7.0, n),
+        'longitude': rng.uniform(93.0, 99.0, n),
+        'depth': rng.uniform(1.0, 150.0, n),
+        'mag': rng.uniform(4.5, 7.5, n),
+        'magType': pd.Series(np.full(n, 'mww'), dtype='str'),
+        'nst': rng.integers(10, 500, n),
+        'gap': rng.uniform(10.0, 300.0, n),
+        'rms': rng.uniform(0.1, 2.0, n),
+        'net': pd.Series(np.full(n, 'us'), dtype='str'),
+        'depthError': rng.uniform(1.0, 20.0, n),
+        'magNst': rng.integers(5, 200, n)
+    })
+    df.index = pd.RangeIndex(start, start + n)
+    if text_column:
+        # Kolom numerik terbaca sebagai teks (mis. ada satu sel bukan angka)
+        df['depth'] = df['depth'].astype(str)
+        df.loc[df.index[5], 'depth'] = 'x'
+    return df
+
+
+def run(report, chunks, n_rows, copy):
+    """Total waktu update (salinan chunk untuk validasi lama tidak ikut diukur)"""
+    elapsed = 0.0
+    for i in range(n_rows // CHUNK_ROWS):
+        chunk = chunks[i % len(chunks)]
+        # Validasi lama menulis ulang kolom chunk, sehingga butuh salinan baru tiap iterasi
+        if copy:
+            chunk = chunk.copy()
+        start = time.perf_counter()
+        report.update(chunk, NUMERIC_COLS)
+        elapsed += time.perf_counter() - start
+    return elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000000, 10000000],
+                        help="Jumlah baris yang divalidasi (kelipatan 100k)")
+    parser.add_argument('--text-column', action='store_true',
+                        help="Kolom depth berisi teks (jalur to_numeric)")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    n_chunks = min(10, max(args.rows) // CHUNK_ROWS)
+    chunks = [make_chunk(rng, i * CHUNK_ROWS, args.text_column) for i in range(n_chunks)]
+
+    for n_rows in args.rows:
+        t_old = run(LegacyValidationReport(), chunks, n_rows, copy=True)
+        t_new = run(ValidationReport(), chunks, n_rows, copy=False)
+        print(f"{n_rows:>12,} baris: lama {t_old:6.2f} s, baru {t_new:6.2f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1 @@
+# Direktori root repo masuk sys.path agar tests/ bisa mengimpor Core
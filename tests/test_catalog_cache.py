@@ -0,0 +1,66 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from Core.catalog_cache import CatalogCache
+
+
+MAPPED_COLUMNS = {'magnitude': 'mag', 'latitude': 'lat'}
+
+
+def make_catalog(n=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({'mag': rng.uniform(5.0, 8.0, n), 'lat': rng.uniform(-11.0, 7.0, n)})
+
+
+def set_mtime(cache, key, mtime):
+    os.utime(os.path.join(cache.cache_dir, key), (mtime, mtime))
+
+
+def test_put_and_get(tmp_path):
+    cache = CatalogCache(str(tmp_path))
+    df = make_catalog()
+    handle = cache.put('a', df, MAPPED_COLUMNS, 'a.csv')
+    assert cache.get('a') is handle
+    assert CatalogCache(str(tmp_path)).get('a').n_rows == len(df)
+    np.testing.assert_array_equal(handle.frame()['mag'].to_numpy(), df['mag'].to_numpy())
+    assert cache.stats()['entries'] == 1
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = CatalogCache(str(tmp_path))
+    for i, key in enumerate(['a', 'b']):
+        cache.put(key, make_catalog(seed=i), MAPPED_COLUMNS)
+    entry_bytes = cache.stats()['bytes'] // 2
+
+    # 'a' lebih baru dipakai daripada 'b'; batas hanya cukup untuk dua entri
+    set_mtime(cache, 'a', 2000)
+    set_mtime(cache, 'b', 1000)
+    cache.max_bytes = int(entry_bytes * 2.5)
+    handle_b = cache.get('b')
+    set_mtime(cache, 'b', 1000)
+
+    cache.put('c', make_catalog(seed=2), MAPPED_COLUMNS)
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.stats()['bytes'] <= cache.max_bytes
+
+    # Handle yang sudah dibuka tetap bisa dibaca setelah entrinya dihapus dari disk
+    np.testing.assert_array_equal(handle_b.frame()['mag'].to_numpy(), make_catalog(seed=1)['mag'].to_numpy())
+
+
+def test_get_marks_entry_as_used(tmp_path):
+    cache = CatalogCache(str(tmp_path))
+    cache.put('a', make_catalog(), MAPPED_COLUMNS)
+    set_mtime(cache, 'a', 1000)
+    cache.get('a')
+    assert os.stat(os.path.join(cache.cache_dir, 'a')).st_mtime > 1000
+
+
+def test_new_entry_is_never_evicted(tmp_path):
+    cache = CatalogCache(str(tmp_path), max_bytes=1)
+    cache.put('a', make_catalog(), MAPPED_COLUMNS)
+    cache.put('b', make_catalog(seed=1), MAPPED_COLUMNS)
+    assert cache.get('a') is None
+    assert cache.get('b') is not None
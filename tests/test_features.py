@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Core.features import FeatureTransformer
+from Core.model_registry import MLP_FEATURES_ORDER
+
+
+MAPPED_COLUMNS = {
+    'magnitude': 'mag', 'latitude': 'lat', 'longitude': 'lon', 'depth': 'kedalaman',
+    'nst': 'nst', 'gap': 'gap', 'rms': 'rms', 'magnst': 'magNst', 'deptherror': 'depthError'
+}
+
+SOIL_LABELS = ['SA', 'SB', 'SC', 'SD', 'SE']
+
+
+def make_catalog(n=500, with_vs30=True, seed=7):
+    """Katalog sintetis tetap (termasuk outlier dan VS30 tepat di batas kelas)"""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'mag': rng.uniform(5.0, 8.0, n),
+        'lat': rng.uniform(1.0, 7.0, n),
+        'lon': rng.uniform(93.0, 99.0, n),
+        'kedalaman': rng.gamma(2.0, 30.0, n),
+        'nst': rng.integers(5, 400, n).astype(float),
+        'gap': rng.uniform(10.0, 300.0, n),
+        'rms': rng.gamma(2.0, 0.5, n),
+        'magNst': rng.integers(1, 300, n).astype(float),
+        'depthError': rng.gamma(1.5, 4.0, n)
+    })
+    df.loc[:4, 'rms'] = [25.0, 30.0, 0.0, 40.0, 55.0]
+    if with_vs30:
+        vs30 = rng.uniform(100.0, 1500.0, n)
+        vs30[:6] = [180.0, 360.0, 760.0, 1300.0, 179.9, 1299.9]
+        df['vs30'] = vs30
+    return df
+
+
+def classify_vs30(vs30_val):
+    if vs30_val >= 760:
+        return 'SA' if vs30_val >= 1300 else 'SB'
+    elif 360 <= vs30_val < 760:
+        return 'SC'
+    elif 180 <= vs30_val < 360:
+        return 'SD'
+    else:
+        return 'SE'
+
+
+def legacy_features(data, mapped_columns):
+    """Penyusun fitur lama (loop iterrows di estimasi.show() sebelum FeatureTransformer)"""
+    subset = data.copy()
+    for idx, row in subset.iterrows():
+        target_class = classify_vs30(row['Vs30_m_s'])
+        for s in SOIL_LABELS:
+            subset.loc[idx, f'Soil_{s}'] = 1 if target_class == s else 0
+
+    rename_map = {
+        mapped_columns['latitude']: 'latitude',
+        mapped_columns['longitude']: 'longitude',
+        mapped_columns['depth']: 'depth',
+        mapped_columns['nst']: 'nst',
+        mapped_columns['gap']: 'gap',
+        mapped_columns['rms']: 'rms',
+        mapped_columns['magnst']: 'magNst',
+        mapped_columns['deptherror']: 'depthError'
+    }
+    subset = subset.rename(columns=rename_map)
+
+    for m in ['gap', 'rms', 'magNst', 'depthError', 'nst']:
+        subset[f'flag_missing_{m}'] = 0
+
+    for feat in ['nst', 'gap', 'rms', 'magNst', 'depth', 'depthError']:
+        Q1 = subset[feat].quantile(0.25)
+        Q3 = subset[feat].quantile(0.75)
+        IQR = Q3 - Q1
+        subset[f'flag_outlier_{feat}'] = np.where(
+            (subset[feat] < (Q1 - 1.5*IQR)) | (subset[feat] > (Q3 + 1.5*IQR)), 1, 0
+        )
+    return subset[MLP_FEATURES_ORDER]
+
+
+def test_features_order():
+    transformer = FeatureTransformer(MAPPED_COLUMNS)
+    assert transformer.features_order == MLP_FEATURES_ORDER
+    assert len(MLP_FEATURES_ORDER) == 22
+
+
+@pytest.mark.parametrize('with_vs30', [True, False])
+def test_transform_matches_legacy(with_vs30):
+    df = make_catalog(with_vs30=with_vs30)
+    mapped = dict(MAPPED_COLUMNS, vs30='vs30') if with_vs30 else MAPPED_COLUMNS
+    vs30 = df['vs30'].to_numpy() if with_vs30 else 300.0
+
+    expected = legacy_features(df.assign(Vs30_m_s=vs30), mapped)
+    X = FeatureTransformer(mapped).fit_transform(df, vs30=vs30)
+
+    assert list(expected.columns) == MLP_FEATURES_ORDER
+    assert X.shape == expected.shape
+    np.testing.assert_array_equal(X, expected.to_numpy(dtype=np.float64))
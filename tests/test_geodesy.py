@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from Core.geodesy import EventVectors, chord_to_km, haversine, unit_vectors
+
+
+def make_points(n=2000, seed=5):
+    """Titik acak di seluruh bola, termasuk kutub, antimeridian dan titik berimpit"""
+    rng = np.random.default_rng(seed)
+    lat = np.degrees(np.arcsin(rng.uniform(-1.0, 1.0, n)))
+    lon = rng.uniform(-180.0, 180.0, n)
+    lat[:4] = [90.0, -90.0, 0.0, 0.0]
+    lon[:4] = [0.0, 0.0, 180.0, -180.0]
+    return lat, lon
+
+
+TARGETS = [(5.55, 95.32), (0.0, 179.99), (89.99, -45.0), (-90.0, 0.0), (-33.9, 18.4)]
+
+
+@pytest.mark.parametrize('target_lat, target_lon', TARGETS)
+def test_distance_to_matches_haversine(target_lat, target_lon):
+    lat, lon = make_points()
+    expected = haversine(lat, lon, target_lat, target_lon)
+    np.testing.assert_allclose(EventVectors(lat, lon).distance_to(target_lat, target_lon),
+                               expected, rtol=0, atol=1e-7)
+
+
+def test_distance_to_rows():
+    lat, lon = make_points()
+    vectors = EventVectors(lat, lon)
+    rows = np.array([3, 10, 7, 1999])
+    np.testing.assert_array_equal(vectors.distance_to(5.55, 95.32, rows=rows),
+                                  vectors.distance_to(5.55, 95.32)[rows])
+
+
+def test_distance_matrix_matches_haversine():
+    lat, lon = make_points()
+    t_lat, t_lon = np.array(TARGETS).T
+    expected = haversine(lat[:, None], lon[:, None], t_lat[None, :], t_lon[None, :])
+
+    # Blok kecil memaksa beberapa iterasi blok
+    result = EventVectors(lat, lon).distance_matrix(t_lat, t_lon, block_bytes=4096)
+    assert result.shape == (lat.shape[0], len(TARGETS))
+    np.testing.assert_allclose(result, expected, rtol=0, atol=1e-7)
+
+
+def test_distance_matrix_out_float32():
+    lat, lon = make_points()
+    vectors = EventVectors(lat, lon)
+    out = np.empty((lat.shape[0], 2), dtype=np.float32)
+    result = vectors.distance_matrix([5.55, -6.2], [95.32, 106.8], out=out)
+    assert result is out
+    np.testing.assert_allclose(out, vectors.distance_matrix([5.55, -6.2], [95.32, 106.8]), rtol=1e-6)
+
+
+def test_chord_to_km_in_place():
+    lat, lon = make_points()
+    dot = unit_vectors(lat, lon) @ unit_vectors([5.55], [95.32])[0]
+    result = chord_to_km(dot, dot)
+    assert result is dot
+    np.testing.assert_allclose(result, haversine(lat, lon, 5.55, 95.32), rtol=0, atol=1e-7)
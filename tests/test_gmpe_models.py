@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from Core.gmpe import BA08
+from Core.gmpe_models import GMPE, GMPE_REGISTRY, evaluate_gmpes
+
+
+def test_builtin_models_registered():
+    assert set(GMPE_REGISTRY) >= {'BA08', 'ZHAO06', 'YOUNGS97'}
+    assert all(isinstance(model, GMPE) for model in GMPE_REGISTRY.values())
+
+
+def test_model_without_sigma_fails_on_creation():
+    class Incomplete(GMPE):
+        name = 'INCOMPLETE'
+
+        def ln_pga(self, ctx):
+            return np.zeros(ctx.M.shape)
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_ba08_model_matches_function():
+    M = np.array([[5.0], [6.5], [8.0]])
+    RJB = np.array([[10.0], [80.0], [150.0]])
+    VS30 = np.array([[1300.0, 760.0, 180.0]])
+    result = evaluate_gmpes(['BA08'], M, RJB, VS30)
+    np.testing.assert_allclose(result['BA08'], BA08(M, RJB, VS30), rtol=1e-12)
@@ -0,0 +1,69 @@
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from Core.features import FeatureTransformer
+from Core.mlp_engine import MLPEngine
+from Core.model_registry import BASE_DIR, MLP_FEATURES_ORDER, MODEL_FILES
+
+
+MAPPED_COLUMNS = {
+    'magnitude': 'mag', 'latitude': 'lat', 'longitude': 'lon', 'depth': 'kedalaman',
+    'nst': 'nst', 'gap': 'gap', 'rms': 'rms', 'magnst': 'magNst', 'deptherror': 'depthError'
+}
+
+
+@pytest.fixture(scope='module')
+def artifacts():
+    """Artefak MLP dari repo (model, scaler_x, scaler_y)"""
+    return [joblib.load(os.path.join(BASE_DIR, MODEL_FILES[key]))
+            for key in ('model_mlp', 'scaler_x', 'scaler_y')]
+
+
+@pytest.fixture(scope='module')
+def features():
+    """Matriks fitur dari katalog sintetis yang sudah lolos validasi (termasuk outlier)"""
+    rng = np.random.default_rng(11)
+    n = 5000
+    df = pd.DataFrame({
+        'mag': rng.uniform(5.0, 8.0, n),
+        'lat': rng.uniform(-11.0, 7.0, n),
+        'lon': rng.uniform(93.0, 141.0, n),
+        'kedalaman': rng.gamma(2.0, 30.0, n),
+        'nst': rng.integers(5, 400, n).astype(float),
+        'gap': rng.uniform(10.0, 300.0, n),
+        'rms': rng.gamma(2.0, 0.5, n),
+        'magNst': rng.integers(1, 300, n).astype(float),
+        'depthError': rng.gamma(1.5, 4.0, n)
+    })
+    df.loc[:4, 'rms'] = [25.0, 30.0, 0.0, 40.0, 55.0]
+    return FeatureTransformer(MAPPED_COLUMNS).fit_transform(df, vs30=rng.uniform(180.0, 1300.0, n))
+
+
+def sklearn_predict(model, scaler_x, scaler_y, X):
+    """Rantai lama: scaler_x.transform -> predict -> scaler_y.inverse_transform"""
+    X_scaled = scaler_x.transform(pd.DataFrame(X, columns=MLP_FEATURES_ORDER))
+    return scaler_y.inverse_transform(model.predict(X_scaled).reshape(-1, 1)).ravel()
+
+
+@pytest.mark.parametrize('dtype, atol', [(np.float32, 3e-6), (np.float64, 1e-13)])
+def test_predict_matches_sklearn(artifacts, features, dtype, atol):
+    expected = sklearn_predict(*artifacts, features)
+    engine = MLPEngine(*artifacts, dtype=dtype)
+    np.testing.assert_allclose(engine.predict(features), expected, rtol=0, atol=atol)
+
+
+def test_predict_blocks_and_out(artifacts, features):
+    engine = MLPEngine(*artifacts)
+    out = np.empty(features.shape[0])
+    result = engine.predict(features, out=out, batch_rows=777)
+    assert result is out
+    np.testing.assert_array_equal(result, engine.predict(features))
+
+
+def test_predict_rejects_wrong_shape(artifacts):
+    with pytest.raises(ValueError):
+        MLPEngine(*artifacts).predict(np.zeros((3, 21)))
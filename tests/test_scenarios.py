@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Core.gmpe import BA08, TANAH_MAPPING
+from Core.scenarios import ScenarioResult, scenario_vs30
+
+
+def make_events(n=300, seed=4):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'mag': rng.uniform(5.0, 8.0, n),
+        'kedalaman': rng.gamma(2.0, 30.0, n),
+        'RJB_km': rng.uniform(0.0, 200.0, n),
+        'vs30': rng.uniform(180.0, 1300.0, n)
+    })
+
+
+def legacy_concat(data_clean, with_vs30):
+    """Bentuk panjang lama: salinan tabel event per tipe tanah, digabung dengan pd.concat"""
+    final_scenario = []
+    for label, vs_val in TANAH_MAPPING.items():
+        subset = data_clean.copy()
+        subset['Tipe_Tanah'] = label
+        subset['Vs30_m_s'] = subset['vs30'] if with_vs30 else vs_val
+        subset['PGA_GMPE'] = BA08(subset['mag'], subset['RJB_km'], subset['Vs30_m_s'])
+        final_scenario.append(subset)
+    return pd.concat(final_scenario, ignore_index=True)
+
+
+def make_result(data_clean, with_vs30):
+    result = ScenarioResult(data_clean, TANAH_MAPPING)
+    vs30 = data_clean['vs30'].to_numpy() if with_vs30 else None
+    vs30_grid = scenario_vs30(TANAH_MAPPING, len(data_clean), vs30)
+    result['Vs30_m_s'] = vs30_grid
+    result['PGA_GMPE'] = BA08(data_clean['mag'].to_numpy()[:, None],
+                              data_clean['RJB_km'].to_numpy()[:, None], vs30_grid)
+    return result
+
+
+def assert_frames_match(frame, expected):
+    assert list(frame.columns) == list(expected.columns)
+    assert frame['Tipe_Tanah'].astype(str).tolist() == expected['Tipe_Tanah'].tolist()
+    for col in ['mag', 'kedalaman', 'RJB_km', 'vs30']:
+        np.testing.assert_array_equal(frame[col].to_numpy(), expected[col].to_numpy())
+    # Nilai per skenario disimpan float32
+    for col in ['Vs30_m_s', 'PGA_GMPE']:
+        np.testing.assert_allclose(frame[col].to_numpy(np.float64), expected[col].to_numpy(np.float64),
+                                   rtol=1e-6)
+
+
+@pytest.mark.parametrize('with_vs30', [True, False])
+def test_to_frame_matches_legacy_concat(with_vs30):
+    data_clean = make_events()
+    expected = legacy_concat(data_clean, with_vs30)
+    result = make_result(data_clean, with_vs30)
+    assert len(result) == len(expected)
+    assert_frames_match(result.to_frame(), expected)
+
+
+def test_masked_frame_matches_legacy_filter():
+    data_clean = make_events()
+    expected = legacy_concat(data_clean, True)
+    keep = (expected['Tipe_Tanah'].isin(['SB', 'SD'])
+            & expected['mag'].between(5.5, 7.0) & expected['RJB_km'].between(20.0, 150.0))
+    expected = expected[keep].reset_index(drop=True)
+
+    result = make_result(data_clean, True)
+    mask = result.mask(soil=['SB', 'SD'], ranges={'mag': (5.5, 7.0), 'RJB_km': (20.0, 150.0)})
+    assert_frames_match(result.to_frame(mask=mask), expected)
+
+
+def test_long_form_values_keep_scenario_order():
+    data_clean = make_events(n=7)
+    result = ScenarioResult(data_clean, TANAH_MAPPING)
+    long_form = np.arange(len(result), dtype=np.float64)
+    result['PGA_MC_Mean'] = long_form
+    np.testing.assert_array_equal(result.to_frame()['PGA_MC_Mean'].to_numpy(), long_form)
@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from Core.geodesy import EventVectors, haversine
+from Core.spatial_index import SpatialIndex
+
+
+# Target uji: Aceh, dekat antimeridian (dua sisi), dekat kutub dan tepat di kutub
+TARGETS = [
+    (5.55, 95.32, 200.0),
+    (0.0, 179.8, 200.0),
+    (-16.5, -179.9, 150.0),
+    (89.5, 10.0, 200.0),
+    (-90.0, 0.0, 300.0),
+    (70.0, 30.0, 2000.0),
+]
+
+
+def make_events(n=20000, seed=9):
+    """Event acak global ditambah klaster rapat di sekitar setiap target"""
+    rng = np.random.default_rng(seed)
+    lat = [np.degrees(np.arcsin(rng.uniform(-1.0, 1.0, n)))]
+    lon = [rng.uniform(-180.0, 180.0, n)]
+    for t_lat, t_lon, _ in TARGETS:
+        lat.append(np.clip(t_lat + rng.normal(0.0, 2.0, n // 10), -90.0, 90.0))
+        lon.append((t_lon + rng.normal(0.0, 4.0, n // 10) + 180.0) % 360.0 - 180.0)
+    return np.concatenate(lat), np.concatenate(lon)
+
+
+@pytest.mark.parametrize('target_lat, target_lon, radius_km', TARGETS)
+def test_query_radius_matches_brute_force(target_lat, target_lon, radius_km):
+    lat, lon = make_events()
+    idx, dist = SpatialIndex(lat, lon).query_radius(target_lat, target_lon, radius_km)
+
+    all_dist = EventVectors(lat, lon).distance_to(target_lat, target_lon)
+    expected = np.flatnonzero(all_dist <= radius_km)
+    assert expected.shape[0] > 0
+    np.testing.assert_array_equal(idx, expected)
+    np.testing.assert_array_equal(dist, all_dist[expected])
+    np.testing.assert_allclose(dist, haversine(lat[idx], lon[idx], target_lat, target_lon),
+                               rtol=0, atol=1e-7)
+
+
+def test_query_radius_float32_columns():
+    lat, lon = make_events()
+    lat32, lon32 = lat.astype(np.float32), lon.astype(np.float32)
+    idx, _ = SpatialIndex(lat32, lon32).query_radius(0.0, 179.8, 200.0)
+    all_dist = EventVectors(lat32, lon32).distance_to(0.0, 179.8)
+    np.testing.assert_array_equal(idx, np.flatnonzero(all_dist <= 200.0))
+
+
+def test_query_radius_empty():
+    idx, dist = SpatialIndex(np.array([10.0]), np.array([10.0])).query_radius(-40.0, -100.0, 50.0)
+    assert idx.shape == (0,) and dist.shape == (0,)
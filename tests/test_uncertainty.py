@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Core.uncertainty import monte_carlo_pga
+
+
+def make_medians(n=600, seed=2):
+    rng = np.random.default_rng(seed)
+    return rng.lognormal(np.log(0.05), 1.0, n)
+
+
+@pytest.mark.parametrize('n_workers', [2, 3])
+def test_workers_give_identical_results(n_workers):
+    median = make_medians()
+    # Blok kecil (~50 baris) agar pekerjaan terbagi ke beberapa worker
+    kwargs = dict(n_samples=500, thresholds=(0.05, 0.2), seed=42, block_bytes=50 * 4 * 500)
+    serial = monte_carlo_pga(median, 0.6, n_workers=1, **kwargs)
+    parallel = monte_carlo_pga(median, 0.6, n_workers=n_workers, **kwargs)
+    pd.testing.assert_frame_equal(serial, parallel, check_exact=True)
+
+
+def test_columns_and_percentiles():
+    median = make_medians(n=50)
+    result = monte_carlo_pga(median, 0.6, n_samples=20000, thresholds=(0.1,), seed=1)
+    assert list(result.columns) == ['PGA_MC_Mean', 'PGA_P16', 'PGA_P50', 'PGA_P84', 'Prob_PGA_gt_0.1g']
+    # Lognormal: P50 = median, P16/P84 = median * exp(-/+ sigma), mean = median * exp(sigma^2 / 2)
+    np.testing.assert_allclose(result['PGA_P50'], median, rtol=0.03)
+    np.testing.assert_allclose(result['PGA_P84'] / result['PGA_P16'], np.exp(1.2), rtol=0.05)
+    np.testing.assert_allclose(result['PGA_MC_Mean'], median * np.exp(0.18), rtol=0.03)
+    assert ((result['Prob_PGA_gt_0.1g'] >= 0) & (result['Prob_PGA_gt_0.1g'] <= 1)).all()
+
+
+def test_empty_input():
+    result = monte_carlo_pga(np.empty(0), 0.6, n_samples=10)
+    assert result.empty and 'PGA_MC_Mean' in result.columns